@@ -1,6 +1,7 @@
 """
 Script principal para iniciar el bot de Telegram.
 """
+import asyncio
 import os
 import logging
 import sys
@@ -21,8 +22,22 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def install_event_loop():
+    """Usa uvloop como bucle de eventos si está instalado."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Usando uvloop como bucle de eventos")
+
 def main():
     """Función principal para iniciar el bot."""
+    # Los modelos usan dataclasses con slots, disponibles desde Python 3.10
+    if sys.version_info < (3, 10):
+        logger.error("Se requiere Python 3.10 o superior.")
+        sys.exit(1)
+
     try:
         # Importar el setup_bot después de configurar logging
         from personal_automation_bot.bot.core import setup_bot
@@ -42,6 +57,7 @@ def main():
         logger.info("Bot configurado correctamente. Iniciando polling...")
 
         # Iniciar el bot
+        install_event_loop()
         app.run_polling()
 
     except ImportError as e:
@@ -81,14 +81,14 @@ class CalendarCommands:
                 # Next 7 days
                 start_date = datetime.now()
                 end_date = start_date + timedelta(days=7)
-                events = self.calendar_service.get_events(user_id, start_date, end_date, max_results=10)
+                events = await self.calendar_service.aget_events(user_id, start_date, end_date, max_results=10)
                 title = "📅 **Eventos próximos (7 días)**"
 
             elif data == "cal_view_today":
                 # Today only
                 start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
                 end_date = start_date + timedelta(days=1)
-                events = self.calendar_service.get_events(user_id, start_date, end_date)
+                events = await self.calendar_service.aget_events(user_id, start_date, end_date)
                 title = "📅 **Eventos de hoy**"
 
             elif data == "cal_view_week":
@@ -98,7 +98,7 @@ class CalendarCommands:
                 days_since_monday = start_date.weekday()
                 start_date = start_date - timedelta(days=days_since_monday)
                 end_date = start_date + timedelta(days=7)
-                events = self.calendar_service.get_events(user_id, start_date, end_date, max_results=15)
+                events = await self.calendar_service.aget_events(user_id, start_date, end_date, max_results=15)
                 title = "📅 **Eventos de esta semana**"
 
             if not events:
@@ -165,7 +165,7 @@ class CalendarCommands:
             return VIEW_EVENTS
 
         try:
-            events = self.calendar_service.search_events(user_id, search_query, max_results=10)
+            events = await self.calendar_service.asearch_events(user_id, search_query, max_results=10)
 
             if not events:
                 message = f"🔍 **Resultados de búsqueda: '{search_query}'**\n\n📭 No se encontraron eventos."
@@ -383,7 +383,7 @@ class CalendarCommands:
             )
 
             # Create event via service
-            created_event = self.calendar_service.create_event(user_id, event)
+            created_event = await self.calendar_service.acreate_event(user_id, event)
 
             # Format confirmation message
             message_parts = [
@@ -505,7 +505,7 @@ class CalendarCommands:
             # Get upcoming events for deletion
             start_date = datetime.now()
             end_date = start_date + timedelta(days=30)  # Next 30 days
-            events = self.calendar_service.get_events(user_id, start_date, end_date, max_results=10)
+            events = await self.calendar_service.aget_events(user_id, start_date, end_date, max_results=10)
 
             if not events:
                 await query.edit_message_text(
@@ -621,7 +621,7 @@ class CalendarCommands:
                     return ConversationHandler.END
 
                 # Delete the event
-                success = self.calendar_service.delete_event(user_id, event_to_delete.id)
+                success = await self.calendar_service.adelete_event(user_id, event_to_delete.id)
 
                 if success:
                     await query.edit_message_text(
@@ -662,7 +662,7 @@ class CalendarCommands:
             # Get upcoming events for updating
             start_date = datetime.now()
             end_date = start_date + timedelta(days=30)  # Next 30 days
-            events = self.calendar_service.get_events(user_id, start_date, end_date, max_results=10)
+            events = await self.calendar_service.aget_events(user_id, start_date, end_date, max_results=10)
 
             if not events:
                 await query.edit_message_text(
@@ -887,7 +887,7 @@ class CalendarCommands:
                     event.location = new_value if new_value else None
 
             # Update the event via service
-            updated_event = self.calendar_service.update_event(user_id, event)
+            updated_event = await self.calendar_service.aupdate_event(user_id, event)
 
             # Format confirmation message
             message_parts = [
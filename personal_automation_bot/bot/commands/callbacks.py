@@ -25,6 +25,14 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
     """
     Handle callback queries from inline keyboards.
     """
+    async with conversation_data.user_lock(update.effective_user.id):
+        await _handle_callback_query(update, context)
+
+async def _handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Dispatch a callback query on its data.
+    Called with the user's conversation lock held.
+    """
     query = update.callback_query
     user_id = update.effective_user.id
 
@@ -35,7 +43,7 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
     if query.data == "back_to_main":
         await show_main_menu(query)
         # Clear any ongoing conversation
-        conversation_data.clear_user_data(user_id)
+        await conversation_data.aclear_user_data(user_id)
 
     elif query.data == "menu_email":
         # Use the new email command handler
@@ -202,7 +210,7 @@ async def show_coming_soon(query, feature_name):
 
 async def start_email_conversation(query, user_id):
     """Start the email sending conversation."""
-    conversation_data.set_user_state(user_id, ConversationState.EMAIL_SEND_TO)
+    await conversation_data.aset_user_state(user_id, ConversationState.EMAIL_SEND_TO)
 
     text = (
         "📤 **Enviar Correo**\n\n"
@@ -217,7 +225,7 @@ async def start_email_conversation(query, user_id):
 
 async def start_calendar_conversation(query, user_id):
     """Start the calendar event creation conversation."""
-    conversation_data.set_user_state(user_id, ConversationState.CALENDAR_CREATE_TITLE)
+    await conversation_data.aset_user_state(user_id, ConversationState.CALENDAR_CREATE_TITLE)
 
     text = (
         "➕ **Crear Evento**\n\n"
@@ -232,7 +240,7 @@ async def start_calendar_conversation(query, user_id):
 
 async def start_text_generation_conversation(query, user_id):
     """Start the text generation conversation."""
-    conversation_data.set_user_state(user_id, ConversationState.CONTENT_TEXT_PROMPT)
+    await conversation_data.aset_user_state(user_id, ConversationState.CONTENT_TEXT_PROMPT)
 
     text = (
         "📝 **Generar Texto**\n\n"
@@ -247,7 +255,7 @@ async def start_text_generation_conversation(query, user_id):
 
 async def start_image_generation_conversation(query, user_id):
     """Start the image generation conversation."""
-    conversation_data.set_user_state(user_id, ConversationState.CONTENT_IMAGE_PROMPT)
+    await conversation_data.aset_user_state(user_id, ConversationState.CONTENT_IMAGE_PROMPT)
 
     text = (
         "🎨 **Generar Imagen**\n\n"
@@ -263,9 +271,9 @@ async def start_image_generation_conversation(query, user_id):
 async def handle_email_confirm_send(query, user_id):
     """Handle email send confirmation."""
     # Get email data from conversation
-    email_to = conversation_data.get_user_field(user_id, "email_to")
-    email_subject = conversation_data.get_user_field(user_id, "email_subject")
-    email_body = conversation_data.get_user_field(user_id, "email_body")
+    email_to = await conversation_data.aget_user_field(user_id, "email_to")
+    email_subject = await conversation_data.aget_user_field(user_id, "email_subject")
+    email_body = await conversation_data.aget_user_field(user_id, "email_body")
 
     if not all([email_to, email_subject, email_body]):
         await query.edit_message_text(
@@ -273,7 +281,7 @@ async def handle_email_confirm_send(query, user_id):
             reply_markup=get_main_menu_keyboard(),
             parse_mode='Markdown'
         )
-        conversation_data.clear_user_data(user_id)
+        await conversation_data.aclear_user_data(user_id)
         return
 
     # Show sending message
@@ -315,7 +323,7 @@ async def handle_email_confirm_send(query, user_id):
         )
 
     # Clear conversation data
-    conversation_data.clear_user_data(user_id)
+    await conversation_data.aclear_user_data(user_id)
 
 async def handle_email_cancel_send(query, user_id):
     """Handle email send cancellation."""
@@ -326,4 +334,4 @@ async def handle_email_cancel_send(query, user_id):
     )
 
     # Clear conversation data
-    conversation_data.clear_user_data(user_id)
+    await conversation_data.aclear_user_data(user_id)
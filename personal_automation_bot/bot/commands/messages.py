@@ -48,9 +48,17 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """
     Handle text messages based on conversation state.
     """
+    async with conversation_data.user_lock(update.effective_user.id):
+        await _handle_message(update, context)
+
+async def _handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Dispatch a text message on the user's conversation state.
+    Called with the user's conversation lock held.
+    """
     user_id = update.effective_user.id
     message_text = update.message.text
-    current_state = conversation_data.get_user_state(user_id)
+    current_state = await conversation_data.aget_user_state(user_id)
 
     if current_state is None:
         # Check if this might be an authorization code
@@ -115,11 +123,11 @@ async def handle_email_to(update: Update, user_id: int, message_text: str):
             "Por favor, usa /email y autentica tu cuenta primero.",
             reply_markup=get_main_menu_keyboard()
         )
-        conversation_data.clear_user_data(user_id)
+        await conversation_data.aclear_user_data(user_id)
         return
 
-    conversation_data.set_user_field(user_id, "email_to", email)
-    conversation_data.set_user_state(user_id, ConversationState.EMAIL_SEND_SUBJECT)
+    await conversation_data.aset_user_field(user_id, "email_to", email)
+    await conversation_data.aset_user_state(user_id, ConversationState.EMAIL_SEND_SUBJECT)
 
     await update.message.reply_text(
         f"✅ Destinatario: {email}\n\n"
@@ -139,8 +147,8 @@ async def handle_email_subject(update: Update, user_id: int, message_text: str):
         )
         return
 
-    conversation_data.set_user_field(user_id, "email_subject", subject)
-    conversation_data.set_user_state(user_id, ConversationState.EMAIL_SEND_BODY)
+    await conversation_data.aset_user_field(user_id, "email_subject", subject)
+    await conversation_data.aset_user_state(user_id, ConversationState.EMAIL_SEND_BODY)
 
     await update.message.reply_text(
         f"✅ Asunto: {subject}\n\n"
@@ -160,12 +168,12 @@ async def handle_email_body(update: Update, user_id: int, message_text: str):
         )
         return
 
-    conversation_data.set_user_field(user_id, "email_body", body)
-    conversation_data.set_user_state(user_id, ConversationState.EMAIL_SEND_CONFIRM)
+    await conversation_data.aset_user_field(user_id, "email_body", body)
+    await conversation_data.aset_user_state(user_id, ConversationState.EMAIL_SEND_CONFIRM)
 
     # Get all email data
-    email_to = conversation_data.get_user_field(user_id, "email_to")
-    email_subject = conversation_data.get_user_field(user_id, "email_subject")
+    email_to = await conversation_data.aget_user_field(user_id, "email_to")
+    email_subject = await conversation_data.aget_user_field(user_id, "email_subject")
 
     # Truncate long content for preview
     body_preview = body
@@ -196,8 +204,8 @@ async def handle_email_body(update: Update, user_id: int, message_text: str):
 
 async def handle_calendar_title(update: Update, user_id: int, message_text: str):
     """Handle calendar event title input."""
-    conversation_data.set_user_field(user_id, "calendar_title", message_text)
-    conversation_data.set_user_state(user_id, ConversationState.CALENDAR_CREATE_DATE)
+    await conversation_data.aset_user_field(user_id, "calendar_title", message_text)
+    await conversation_data.aset_user_state(user_id, ConversationState.CALENDAR_CREATE_DATE)
 
     await update.message.reply_text(
         f"✅ Título: {message_text}\n\n"
@@ -215,8 +223,8 @@ async def handle_calendar_date(update: Update, user_id: int, message_text: str):
         )
         return
 
-    conversation_data.set_user_field(user_id, "calendar_date", message_text)
-    conversation_data.set_user_state(user_id, ConversationState.CALENDAR_CREATE_TIME)
+    await conversation_data.aset_user_field(user_id, "calendar_date", message_text)
+    await conversation_data.aset_user_state(user_id, ConversationState.CALENDAR_CREATE_TIME)
 
     await update.message.reply_text(
         f"✅ Fecha: {message_text}\n\n"
@@ -234,11 +242,11 @@ async def handle_calendar_time(update: Update, user_id: int, message_text: str):
         )
         return
 
-    conversation_data.set_user_field(user_id, "calendar_time", message_text)
+    await conversation_data.aset_user_field(user_id, "calendar_time", message_text)
 
     # Get all calendar data
-    calendar_title = conversation_data.get_user_field(user_id, "calendar_title")
-    calendar_date = conversation_data.get_user_field(user_id, "calendar_date")
+    calendar_title = await conversation_data.aget_user_field(user_id, "calendar_title")
+    calendar_date = await conversation_data.aget_user_field(user_id, "calendar_date")
 
     confirmation_text = (
         "📅 **Resumen del evento:**\n\n"
@@ -256,7 +264,7 @@ async def handle_calendar_time(update: Update, user_id: int, message_text: str):
     )
 
     # Clear conversation data
-    conversation_data.clear_user_data(user_id)
+    await conversation_data.aclear_user_data(user_id)
 
 async def handle_text_generation(update: Update, user_id: int, message_text: str):
     """Handle text generation request."""
@@ -274,7 +282,7 @@ async def handle_text_generation(update: Update, user_id: int, message_text: str
     )
 
     # Clear conversation data
-    conversation_data.clear_user_data(user_id)
+    await conversation_data.aclear_user_data(user_id)
 
 async def handle_image_generation(update: Update, user_id: int, message_text: str):
     """Handle image generation request."""
@@ -292,4 +300,4 @@ async def handle_image_generation(update: Update, user_id: int, message_text: st
     )
 
     # Clear conversation data
-    conversation_data.clear_user_data(user_id)
+    await conversation_data.aclear_user_data(user_id)
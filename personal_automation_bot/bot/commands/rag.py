@@ -2,21 +2,20 @@
 RAG (Retrieval-Augmented Generation) commands for the Telegram bot.
 """
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext, ConversationHandler
 
-from personal_automation_bot.services.content import RAGGenerator
-from personal_automation_bot.services.rag import DocumentRetriever, get_vector_store
-from personal_automation_bot.bot.conversations.rag_conversation import RAG_CONVERSATION, RAG_STATES
+if TYPE_CHECKING:
+    from personal_automation_bot.services.content import RAGGenerator
 
 logger = logging.getLogger(__name__)
 
 # Global RAG generator instance
 _rag_generator = None
 
-def get_rag_generator() -> RAGGenerator:
+def get_rag_generator() -> "RAGGenerator":
     """
     Get or create RAG generator instance.
 
@@ -26,6 +25,10 @@ def get_rag_generator() -> RAGGenerator:
     global _rag_generator
 
     if _rag_generator is None:
+        # Imported on first use: the RAG stack loads FAISS and sentence-transformers
+        from personal_automation_bot.services.content import RAGGenerator
+        from personal_automation_bot.services.rag import DocumentRetriever, get_vector_store
+
         try:
             # Create vector store
             vector_store = get_vector_store("faiss")
@@ -75,6 +78,7 @@ async def rag_command(update: Update, context: CallbackContext) -> int:
         parse_mode="Markdown"
     )
 
+    from personal_automation_bot.bot.conversations.rag_conversation import RAG_STATES
     return RAG_STATES["MAIN_MENU"]
 
 async def rag_help(update: Update, context: CallbackContext) -> None:
@@ -97,6 +101,11 @@ async def rag_help(update: Update, context: CallbackContext) -> None:
 
     await update.message.reply_text(help_text, parse_mode="Markdown")
 
+def clear_rag_caches():
+    """Drop cached retrieval results after the document index changed."""
+    if _rag_generator is not None:
+        _rag_generator.clear_context_cache()
+
 def get_rag_conversation_handler() -> ConversationHandler:
     """
     Get RAG conversation handler.
@@ -104,4 +113,5 @@ def get_rag_conversation_handler() -> ConversationHandler:
     Returns:
         ConversationHandler for RAG conversation
     """
+    from personal_automation_bot.bot.conversations.rag_conversation import RAG_CONVERSATION
     return RAG_CONVERSATION
@@ -1,44 +1,97 @@
 """
 Base conversation system for multi-step interactions.
 """
-from enum import Enum
-from typing import Dict, Any
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Any, Optional
 
-class ConversationState(Enum):
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from personal_automation_bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ConversationState(IntEnum):
     """
     Enumeration of conversation states.
+
+    Integer-valued so states hash and compare as cheaply as the plain ints
+    used for ConversationHandler states (see RAG_STATES).
     """
     # Email conversation states
-    EMAIL_SEND_TO = "email_send_to"
-    EMAIL_SEND_SUBJECT = "email_send_subject"
-    EMAIL_SEND_BODY = "email_send_body"
-    EMAIL_SEND_CONFIRM = "email_send_confirm"
+    EMAIL_SEND_TO = 0
+    EMAIL_SEND_SUBJECT = 1
+    EMAIL_SEND_BODY = 2
+    EMAIL_SEND_CONFIRM = 3
 
     # Calendar conversation states
-    CALENDAR_CREATE_TITLE = "calendar_create_title"
-    CALENDAR_CREATE_DATE = "calendar_create_date"
-    CALENDAR_CREATE_TIME = "calendar_create_time"
-    CALENDAR_CREATE_DESCRIPTION = "calendar_create_description"
-    CALENDAR_CREATE_CONFIRM = "calendar_create_confirm"
+    CALENDAR_CREATE_TITLE = 4
+    CALENDAR_CREATE_DATE = 5
+    CALENDAR_CREATE_TIME = 6
+    CALENDAR_CREATE_DESCRIPTION = 7
+    CALENDAR_CREATE_CONFIRM = 8
 
     # Content generation conversation states
-    CONTENT_TEXT_PROMPT = "content_text_prompt"
-    CONTENT_TEXT_STYLE = "content_text_style"
-    CONTENT_IMAGE_PROMPT = "content_image_prompt"
-    CONTENT_IMAGE_STYLE = "content_image_style"
+    CONTENT_TEXT_PROMPT = 9
+    CONTENT_TEXT_STYLE = 10
+    CONTENT_IMAGE_PROMPT = 11
+    CONTENT_IMAGE_STYLE = 12
 
     # General states
-    WAITING_FOR_INPUT = "waiting_for_input"
-    CONFIRMING_ACTION = "confirming_action"
+    WAITING_FOR_INPUT = 13
+    CONFIRMING_ACTION = 14
+
+@dataclass(slots=True)
+class UserConversation:
+    """
+    Conversation record for a single user.
+    """
+    state: Optional[ConversationState] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
 
 class ConversationData:
     """
     Class to store conversation data for users.
     """
     def __init__(self):
-        self.user_data: Dict[int, Dict[str, Any]] = {}
+        self.user_data: Dict[int, UserConversation] = {}
+        # Dropped once no handler holds them, so idle users don't keep a lock
+        self._locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
 
-    def get_user_data(self, user_id: int) -> Dict[str, Any]:
+    def user_lock(self, user_id: int) -> asyncio.Lock:
+        """
+        Get the lock guarding a user's conversation data.
+
+        Handlers that read and then update a user's state should hold this
+        lock (``async with conversation_data.user_lock(user_id):``) so two
+        updates from the same user can't interleave. Each user has their
+        own lock, so different users are never serialized.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            asyncio.Lock: The user's lock.
+        """
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
+
+    def get_user_data(self, user_id: int) -> UserConversation:
         """
         Get conversation data for a specific user.
 
@@ -46,11 +99,24 @@ class ConversationData:
             user_id (int): The user ID.
 
         Returns:
-            Dict[str, Any]: The user's conversation data.
+            UserConversation: The user's conversation record.
+        """
+        user_data = self._find_user_data(user_id)
+        if user_data is None:
+            user_data = self.user_data[user_id] = UserConversation()
+        return user_data
+
+    def _find_user_data(self, user_id: int) -> Optional[UserConversation]:
+        """
+        Find a user's conversation record without creating one.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            Optional[UserConversation]: The record, or None if the user has none.
         """
-        if user_id not in self.user_data:
-            self.user_data[user_id] = {}
-        return self.user_data[user_id]
+        return self.user_data.get(user_id)
 
     def set_user_state(self, user_id: int, state: ConversationState):
         """
@@ -60,8 +126,7 @@ class ConversationData:
             user_id (int): The user ID.
             state (ConversationState): The conversation state.
         """
-        user_data = self.get_user_data(user_id)
-        user_data['state'] = state
+        self.get_user_data(user_id).state = state
 
     def get_user_state(self, user_id: int) -> ConversationState:
         """
@@ -73,8 +138,8 @@ class ConversationData:
         Returns:
             ConversationState: The user's conversation state, or None if not set.
         """
-        user_data = self.get_user_data(user_id)
-        return user_data.get('state')
+        user_data = self._find_user_data(user_id)
+        return user_data.state if user_data is not None else None
 
     def clear_user_data(self, user_id: int):
         """
@@ -95,8 +160,7 @@ class ConversationData:
             field (str): The field name.
             value (Any): The field value.
         """
-        user_data = self.get_user_data(user_id)
-        user_data[field] = value
+        self.get_user_data(user_id).fields[field] = value
 
     def get_user_field(self, user_id: int, field: str, default: Any = None) -> Any:
         """
@@ -110,8 +174,86 @@ class ConversationData:
         Returns:
             Any: The field value or default.
         """
-        user_data = self.get_user_data(user_id)
-        return user_data.get(field, default)
+        user_data = self._find_user_data(user_id)
+        return user_data.fields.get(field, default) if user_data is not None else default
+
+    # Async access, used by the bot's handlers. The in-memory store answers
+    # directly; RedisConversationData does network I/O here.
+
+    async def aget_user_state(self, user_id: int) -> Optional[ConversationState]:
+        """Async version of get_user_state."""
+        return self.get_user_state(user_id)
+
+    async def aset_user_state(self, user_id: int, state: ConversationState):
+        """Async version of set_user_state."""
+        self.set_user_state(user_id, state)
+
+    async def aget_user_field(self, user_id: int, field: str, default: Any = None) -> Any:
+        """Async version of get_user_field."""
+        return self.get_user_field(user_id, field, default)
+
+    async def aset_user_field(self, user_id: int, field: str, value: Any):
+        """Async version of set_user_field."""
+        self.set_user_field(user_id, field, value)
+
+    async def aclear_user_data(self, user_id: int):
+        """Async version of clear_user_data."""
+        self.clear_user_data(user_id)
+
+class RedisConversationData(ConversationData):
+    """
+    Conversation data shared through Redis.
+
+    Each user's record is the hash ``user:{id}``: the state (as its integer
+    value) in ``state`` and each field, JSON-encoded with orjson, in
+    ``f:{name}``. Every access reads Redis, so records written by other bot
+    processes are always seen. Field values must be JSON-serializable.
+
+    Only the async methods are supported, so Redis I/O never blocks the
+    event loop.
+    """
+    def __init__(self, redis_url: str):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis is not installed. Install it with 'pip install redis'")
+        if not ORJSON_AVAILABLE:
+            raise ImportError("orjson is not installed. Install it with 'pip install orjson'")
+
+        super().__init__()
+        self.redis = aioredis.Redis.from_url(redis_url)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def _find_user_data(self, user_id: int) -> Optional[UserConversation]:
+        raise TypeError("RedisConversationData only supports the async methods (aget_user_state, ...)")
+
+    def clear_user_data(self, user_id: int):
+        raise TypeError("RedisConversationData only supports the async methods (aclear_user_data)")
+
+    async def aget_user_state(self, user_id: int) -> Optional[ConversationState]:
+        state = await self.redis.hget(self._key(user_id), 'state')
+        return ConversationState(int(state)) if state is not None else None
+
+    async def aset_user_state(self, user_id: int, state: ConversationState):
+        await self.redis.hset(self._key(user_id), 'state', int(state))
+
+    async def aget_user_field(self, user_id: int, field: str, default: Any = None) -> Any:
+        value = await self.redis.hget(self._key(user_id), f"f:{field}")
+        return orjson.loads(value) if value is not None else default
+
+    async def aset_user_field(self, user_id: int, field: str, value: Any):
+        try:
+            encoded = orjson.dumps(value)
+        except TypeError as e:
+            raise TypeError(f"Conversation field '{field}' must be JSON-serializable: {e}") from e
+        await self.redis.hset(self._key(user_id), f"f:{field}", encoded)
+
+    async def aclear_user_data(self, user_id: int):
+        await self.redis.delete(self._key(user_id))
 
 # Global conversation data instance
-conversation_data = ConversationData()
+if settings.REDIS_URL:
+    conversation_data = RedisConversationData(settings.REDIS_URL)
+else:
+    conversation_data = ConversationData()
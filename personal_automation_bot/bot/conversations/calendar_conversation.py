@@ -1,14 +1,17 @@
 """
 Calendar conversation handler configuration.
 """
+import re
+from functools import lru_cache
+
 from telegram.ext import (
     ConversationHandler,
     CommandHandler,
     CallbackQueryHandler,
-    MessageHandler,
-    filters
+    MessageHandler
 )
 
+from personal_automation_bot.bot.filters import TEXT_ONLY
 from personal_automation_bot.bot.commands.calendar import (
     calendar_commands,
     CALENDAR_MAIN_MENU,
@@ -24,11 +27,27 @@ from personal_automation_bot.bot.commands.calendar import (
     UPDATE_EVENT_VALUE
 )
 
+# Callback data patterns, compiled once and handed to PTB as-is
+_VIEW_PATTERN = re.compile(r'^cal_view_(upcoming|today|week)$')
+_CREATE_PATTERN = re.compile(r'^cal_create$')
+_UPDATE_PATTERN = re.compile(r'^cal_update$')
+_DELETE_PATTERN = re.compile(r'^cal_delete$')
+_SEARCH_PATTERN = re.compile(r'^cal_search$')
+_BACK_TO_MENU_PATTERN = re.compile(r'^cal_back_to_menu$')
+_CANCEL_PATTERN = re.compile(r'^cancel$')
+_UPDATE_SELECT_PATTERN = re.compile(r'^upd_event_\d+$')
+_UPDATE_FIELD_PATTERN = re.compile(r'^update_(title|date|time|description|location)$')
+_DELETE_SELECT_PATTERN = re.compile(r'^del_event_\d+$')
+_DELETE_CONFIRM_PATTERN = re.compile(r'^(confirm_delete|cancel_delete)$')
+
 
+@lru_cache(maxsize=1)
 def get_calendar_conversation_handler() -> ConversationHandler:
     """
     Create and return the calendar conversation handler.
 
+    The handler is built once and reused on subsequent calls.
+
     Returns:
         ConversationHandler: Configured conversation handler for calendar operations
     """
@@ -41,127 +60,127 @@ def get_calendar_conversation_handler() -> ConversationHandler:
             CALENDAR_MAIN_MENU: [
                 CallbackQueryHandler(
                     calendar_commands.view_events_callback,
-                    pattern=r'^cal_view_(upcoming|today|week)$'
+                    pattern=_VIEW_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.create_event_callback,
-                    pattern=r'^cal_create$'
+                    pattern=_CREATE_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.update_event_callback,
-                    pattern=r'^cal_update$'
+                    pattern=_UPDATE_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.delete_event_callback,
-                    pattern=r'^cal_delete$'
+                    pattern=_DELETE_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.search_events_callback,
-                    pattern=r'^cal_search$'
+                    pattern=_SEARCH_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.back_to_menu_callback,
-                    pattern=r'^cal_back_to_menu$'
+                    pattern=_BACK_TO_MENU_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             VIEW_EVENTS: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_search_query
                 ),
                 CallbackQueryHandler(
                     calendar_commands.back_to_menu_callback,
-                    pattern=r'^cal_back_to_menu$'
+                    pattern=_BACK_TO_MENU_PATTERN
                 ),
             ],
             CREATE_EVENT_TITLE: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_event_title
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             CREATE_EVENT_DATE: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_event_date
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             CREATE_EVENT_TIME: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_event_time
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             CREATE_EVENT_DESCRIPTION: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_event_description
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             UPDATE_EVENT_SELECT: [
                 CallbackQueryHandler(
                     calendar_commands.handle_update_event_select,
-                    pattern=r'^upd_event_\d+$'
+                    pattern=_UPDATE_SELECT_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.back_to_menu_callback,
-                    pattern=r'^cal_back_to_menu$'
+                    pattern=_BACK_TO_MENU_PATTERN
                 ),
             ],
             UPDATE_EVENT_FIELD: [
                 CallbackQueryHandler(
                     calendar_commands.handle_update_field_select,
-                    pattern=r'^update_(title|date|time|description|location)$'
+                    pattern=_UPDATE_FIELD_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.back_to_menu_callback,
-                    pattern=r'^cal_back_to_menu$'
+                    pattern=_BACK_TO_MENU_PATTERN
                 ),
             ],
             UPDATE_EVENT_VALUE: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND,
+                    TEXT_ONLY,
                     calendar_commands.handle_update_value_input
                 ),
                 CallbackQueryHandler(
                     calendar_commands.cancel_callback,
-                    pattern=r'^cancel$'
+                    pattern=_CANCEL_PATTERN
                 ),
             ],
             DELETE_EVENT_SELECT: [
                 CallbackQueryHandler(
                     calendar_commands.handle_delete_event_select,
-                    pattern=r'^del_event_\d+$'
+                    pattern=_DELETE_SELECT_PATTERN
                 ),
                 CallbackQueryHandler(
                     calendar_commands.back_to_menu_callback,
-                    pattern=r'^cal_back_to_menu$'
+                    pattern=_BACK_TO_MENU_PATTERN
                 ),
             ],
             DELETE_EVENT_CONFIRM: [
                 CallbackQueryHandler(
                     calendar_commands.handle_delete_confirmation,
-                    pattern=r'^(confirm_delete|cancel_delete)$'
+                    pattern=_DELETE_CONFIRM_PATTERN
                 ),
             ],
         },
@@ -1,9 +1,12 @@
 """
 RAG (Retrieval-Augmented Generation) conversation for the Telegram bot.
 """
+import asyncio
+import io
 import logging
 import os
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple, TYPE_CHECKING
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -11,8 +14,11 @@ from telegram.ext import (
     ConversationHandler, CallbackContext
 )
 
-from personal_automation_bot.bot.commands.rag import get_rag_generator
-from personal_automation_bot.services.rag import DocumentIndexingService, get_vector_store, DocumentIndexer
+from personal_automation_bot.bot.commands.rag import clear_rag_caches, get_rag_generator
+from personal_automation_bot.bot.filters import TEXT_ONLY
+
+if TYPE_CHECKING:
+    from personal_automation_bot.services.rag import DocumentIndexingService, SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -27,139 +33,250 @@ RAG_STATES = {
     "PROCESSING_FILE": 6
 }
 
+# File extensions accepted for indexing
+_SUPPORTED_EXTENSIONS = frozenset({".txt", ".pdf", ".docx", ".doc", ".md", ".html"})
+
+# Message templates
+_MAIN_MENU_TPL = (
+    "🤖 *Sistema RAG (Retrieval-Augmented Generation)*\\n\\n"
+    "Este sistema te permite hacer preguntas sobre tus documentos personales. "
+    "El bot buscará información relevante en tus documentos y generará una respuesta "
+    "basada en esa información.\\n\\n"
+    "¿Qué te gustaría hacer?"
+)
+_DOCS_EMPTY_TPL = (
+    "📚 *Documentos indexados*\\n\\n"
+    "No hay documentos indexados. Puedes indexar un documento enviándolo al bot."
+)
+_DOCS_COUNT_TPL = (
+    "📚 *Documentos indexados*\\n\\n"
+    "Hay {n} documentos indexados en el sistema.\\n\\n"
+    "Puedes hacer preguntas sobre estos documentos usando el comando /rag."
+)
+_ANSWER_TPL = "*Respuesta:*\\n\\n{text}"
+_PROCESSING_FILE_TPL = "⏳ Procesando archivo {name}..."
+_FILE_INDEXED_TPL = (
+    "✅ Archivo {name} indexado correctamente.\\n\\n"
+    "Se crearon {chunks} fragmentos para búsqueda."
+)
+
+# Static keyboards, shared across updates instead of rebuilt per request
+_RAG_MAIN_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Hacer una pregunta", callback_data="rag_ask")],
+    [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
+    [InlineKeyboardButton("Cancelar", callback_data="rag_cancel")]
+])
+
+_RAG_DOCS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Indexar un documento", callback_data="rag_index")],
+    [InlineKeyboardButton("Volver al menú", callback_data="rag_menu")]
+])
+
+_RAG_POSTQ_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Hacer otra pregunta", callback_data="rag_ask")],
+    [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
+    [InlineKeyboardButton("Salir", callback_data="rag_cancel")]
+])
+
+_RAG_POSTFILE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Hacer una pregunta", callback_data="rag_ask")],
+    [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
+    [InlineKeyboardButton("Salir", callback_data="rag_cancel")]
+])
+
+# Answers to recent questions as (formatted text, response ID), keyed on
+# question embedding. An answer depends on the conversation it was chained
+# to, so there is one cache per (user ID, previous response ID), least
+# recently used first
+_RESPONSE_CACHE_SCOPES = 256
+_RESPONSE_CACHE_ENTRIES = 32
+_response_caches: "OrderedDict[Tuple[int, Optional[str]], SemanticCache]" = OrderedDict()
+
+def _get_response_cache(user_id: int, previous_response_id: Optional[str]) -> "SemanticCache":
+    """
+    Get or create the semantic cache of answers for one point of a conversation.
+
+    Args:
+        user_id: Telegram user ID
+        previous_response_id: ID of the answer the next one is chained to
+
+    Returns:
+        SemanticCache instance
+    """
+    scope = (user_id, previous_response_id)
+    cache = _response_caches.get(scope)
+
+    if cache is None:
+        from personal_automation_bot.services.rag import SemanticCache
+        cache = SemanticCache(threshold=0.9, max_entries=_RESPONSE_CACHE_ENTRIES)
+        _response_caches[scope] = cache
+        while len(_response_caches) > _RESPONSE_CACHE_SCOPES:
+            _response_caches.popitem(last=False)
+    else:
+        _response_caches.move_to_end(scope)
+
+    return cache
+
 # Global document indexing service
 _indexing_service = None
+_indexing_service_lock = asyncio.Lock()
 
-def get_indexing_service() -> DocumentIndexingService:
+def _build_indexing_service() -> "DocumentIndexingService":
     """
-    Get or create document indexing service.
+    Build the document indexing service.
+
+    Loads the FAISS index and embedding model, so it is run in a worker
+    thread to keep the event loop responsive. The RAG modules are imported
+    here rather than at module level so the bot starts without them.
 
     Returns:
         DocumentIndexingService instance
     """
-    global _indexing_service
+    from personal_automation_bot.services.rag import (
+        DocumentIndexingService, DocumentIndexer, get_vector_store
+    )
 
-    if _indexing_service is None:
-        try:
-            # Create vector store
-            vector_store = get_vector_store("faiss")
+    # Create vector store
+    vector_store = get_vector_store("faiss")
 
-            # Create indexer
-            indexer = DocumentIndexer(vector_store=vector_store)
+    # Create indexer
+    indexer = DocumentIndexer(vector_store=vector_store)
 
-            # Create indexing service
-            _indexing_service = DocumentIndexingService(indexer=indexer)
+    # Create indexing service
+    return DocumentIndexingService(indexer=indexer)
 
-            logger.info("Document indexing service initialized successfully")
-        except Exception as e:
-            logger.error(f"Error initializing document indexing service: {e}")
-            raise
+async def get_indexing_service() -> "DocumentIndexingService":
+    """
+    Get or create document indexing service.
 
-    return _indexing_service
+    Concurrent first calls are serialized on an asyncio lock so the service
+    is only built once.
 
-async def rag_button(update: Update, context: CallbackContext) -> int:
+    Returns:
+        DocumentIndexingService instance
     """
-    Handle button presses in RAG conversation.
+    global _indexing_service
 
-    Args:
-        update: Telegram update
-        context: Callback context
+    if _indexing_service is None:
+        async with _indexing_service_lock:
+            if _indexing_service is None:
+                try:
+                    _indexing_service = await asyncio.to_thread(_build_indexing_service)
+                    logger.info("Document indexing service initialized successfully")
+                except Exception as e:
+                    logger.error(f"Error initializing document indexing service: {e}")
+                    raise
+
+    return _indexing_service
+
+# Cached number of indexed documents, reset whenever a new file is indexed
+_indexed_document_count: Optional[int] = None
+
+async def get_indexed_document_count() -> int:
+    """
+    Get the number of documents in the indexing service's vector store.
 
     Returns:
-        Next conversation state
+        Number of indexed documents
     """
-    query = update.callback_query
-    await query.answer()
+    global _indexed_document_count
 
-    data = query.data
+    if _indexed_document_count is None:
+        indexing_service = await get_indexing_service()
+        vector_store = indexing_service.indexer.vector_store
+        _indexed_document_count = len(vector_store.doc_ids) if hasattr(vector_store, 'doc_ids') else 0
 
-    if data == "rag_ask":
-        await query.edit_message_text(
-            "📝 Por favor, escribe tu pregunta sobre tus documentos:",
-            parse_mode="Markdown"
-        )
-        return RAG_STATES["WAITING_FOR_QUESTION"]
-
-    elif data == "rag_docs":
-        # Show indexed documents
-        try:
-            # Get vector store info
-            vector_store = get_vector_store("faiss")
-            num_docs = len(vector_store.doc_ids) if hasattr(vector_store, 'doc_ids') else 0
-
-            if num_docs == 0:
-                keyboard = [
-                    [InlineKeyboardButton("Indexar un documento", callback_data="rag_index")],
-                    [InlineKeyboardButton("Volver al menú", callback_data="rag_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-
-                await query.edit_message_text(
-                    "📚 *Documentos indexados*\\n\\n"
-                    "No hay documentos indexados. Puedes indexar un documento enviándolo al bot.",
-                    reply_markup=reply_markup,
-                    parse_mode="Markdown"
-                )
-            else:
-                keyboard = [
-                    [InlineKeyboardButton("Indexar un documento", callback_data="rag_index")],
-                    [InlineKeyboardButton("Volver al menú", callback_data="rag_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-
-                await query.edit_message_text(
-                    f"📚 *Documentos indexados*\\n\\n"
-                    f"Hay {num_docs} documentos indexados en el sistema.\\n\\n"
-                    f"Puedes hacer preguntas sobre estos documentos usando el comando /rag.",
-                    reply_markup=reply_markup,
-                    parse_mode="Markdown"
-                )
-
-            return RAG_STATES["SHOWING_DOCUMENTS"]
-        except Exception as e:
-            logger.error(f"Error showing documents: {e}")
+    return _indexed_document_count
+
+async def _handle_rag_ask(query, context: CallbackContext) -> int:
+    """Ask the user for a question."""
+    await query.edit_message_text(
+        "📝 Por favor, escribe tu pregunta sobre tus documentos:",
+        parse_mode="Markdown"
+    )
+    return RAG_STATES["WAITING_FOR_QUESTION"]
+
+async def _handle_rag_docs(query, context: CallbackContext) -> int:
+    """Show indexed documents."""
+    try:
+        num_docs = await get_indexed_document_count()
+
+        if num_docs == 0:
+            await query.edit_message_text(
+                _DOCS_EMPTY_TPL,
+                reply_markup=_RAG_DOCS_KEYBOARD,
+                parse_mode="Markdown"
+            )
+        else:
             await query.edit_message_text(
-                "❌ Error al mostrar los documentos indexados. Por favor, intenta de nuevo más tarde.",
+                _DOCS_COUNT_TPL.format(n=num_docs),
+                reply_markup=_RAG_DOCS_KEYBOARD,
                 parse_mode="Markdown"
             )
-            return ConversationHandler.END
 
-    elif data == "rag_index":
+        return RAG_STATES["SHOWING_DOCUMENTS"]
+    except Exception as e:
+        logger.error(f"Error showing documents: {e}")
         await query.edit_message_text(
-            "📄 Por favor, envía un archivo de texto, PDF o Word para indexar:",
+            "❌ Error al mostrar los documentos indexados. Por favor, intenta de nuevo más tarde.",
             parse_mode="Markdown"
         )
-        return RAG_STATES["WAITING_FOR_FILE"]
+        return ConversationHandler.END
 
-    elif data == "rag_menu":
-        # Return to main menu
-        keyboard = [
-            [InlineKeyboardButton("Hacer una pregunta", callback_data="rag_ask")],
-            [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
-            [InlineKeyboardButton("Cancelar", callback_data="rag_cancel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+async def _handle_rag_index(query, context: CallbackContext) -> int:
+    """Ask the user for a file to index."""
+    await query.edit_message_text(
+        "📄 Por favor, envía un archivo de texto, PDF o Word para indexar:",
+        parse_mode="Markdown"
+    )
+    return RAG_STATES["WAITING_FOR_FILE"]
 
-        await query.edit_message_text(
-            "🤖 *Sistema RAG (Retrieval-Augmented Generation)*\\n\\n"
-            "Este sistema te permite hacer preguntas sobre tus documentos personales. "
-            "El bot buscará información relevante en tus documentos y generará una respuesta "
-            "basada en esa información.\\n\\n"
-            "¿Qué te gustaría hacer?",
-            reply_markup=reply_markup,
-            parse_mode="Markdown"
-        )
+async def _handle_rag_menu(query, context: CallbackContext) -> int:
+    """Return to the RAG main menu."""
+    await query.edit_message_text(
+        _MAIN_MENU_TPL,
+        reply_markup=_RAG_MAIN_KEYBOARD,
+        parse_mode="Markdown"
+    )
+    return RAG_STATES["MAIN_MENU"]
 
-        return RAG_STATES["MAIN_MENU"]
+async def _handle_rag_cancel(query, context: CallbackContext) -> int:
+    """Cancel the RAG conversation."""
+    context.user_data.pop("rag_last_response_id", None)
+    await query.edit_message_text(
+        "❌ Operación cancelada.",
+        parse_mode="Markdown"
+    )
+    return ConversationHandler.END
 
-    elif data == "rag_cancel":
-        await query.edit_message_text(
-            "❌ Operación cancelada.",
-            parse_mode="Markdown"
-        )
-        return ConversationHandler.END
+# Callback data -> button handler
+_RAG_DISPATCH: Dict[str, Callable[[Any, CallbackContext], Awaitable[int]]] = {
+    "rag_ask": _handle_rag_ask,
+    "rag_docs": _handle_rag_docs,
+    "rag_index": _handle_rag_index,
+    "rag_menu": _handle_rag_menu,
+    "rag_cancel": _handle_rag_cancel,
+}
 
-    return RAG_STATES["MAIN_MENU"]
+async def rag_button(update: Update, context: CallbackContext) -> int:
+    """
+    Handle button presses in RAG conversation.
+
+    Args:
+        update: Telegram update
+        context: Callback context
+
+    Returns:
+        Next conversation state
+    """
+    query = update.callback_query
+    await query.answer()
+
+    handler = _RAG_DISPATCH.get(query.data)
+    if handler is None:
+        return RAG_STATES["MAIN_MENU"]
+
+    return await handler(query, context)
 
 async def process_question(update: Update, context: CallbackContext) -> int:
     """
@@ -188,33 +305,43 @@ async def process_question(update: Update, context: CallbackContext) -> int:
         # Get RAG generator
         rag_generator = get_rag_generator()
 
-        # Generate response
-        response = rag_generator.generate(
-            query=question,
-            top_k=3,
-            max_tokens=500
-        )
+        # Reuse the answer to a near-identical question if there is one
+        question_embedding = (await asyncio.to_thread(
+            rag_generator.retriever.indexer.generate_embeddings, [question]
+        ))[0]
+        previous_response_id = context.user_data.get("rag_last_response_id")
+        response_cache = _get_response_cache(user_id, previous_response_id)
+        cached = response_cache.get(question_embedding)
+
+        if cached is not None:
+            formatted_text, response_id = cached
+        else:
+            # Generate response, chained to the user's previous answer
+            response = await rag_generator.agenerate(
+                query=question,
+                top_k=3,
+                max_tokens=500,
+                previous_response_id=previous_response_id,
+                query_embedding=question_embedding
+            )
+            response_id = response.response_id
 
-        # Format response with citations
-        formatted_text = response.get_formatted_text_with_citations()
+            # Format response with citations
+            formatted_text = response.get_formatted_text_with_citations()
+            response_cache.put(question_embedding, (formatted_text, response_id))
+
+        context.user_data["rag_last_response_id"] = response_id
 
         # Send response
         await update.message.reply_text(
-            f"*Respuesta:*\\n\\n{formatted_text}",
+            _ANSWER_TPL.format(text=formatted_text),
             parse_mode="Markdown"
         )
 
         # Return to main menu
-        keyboard = [
-            [InlineKeyboardButton("Hacer otra pregunta", callback_data="rag_ask")],
-            [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
-            [InlineKeyboardButton("Salir", callback_data="rag_cancel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await update.message.reply_text(
             "¿Qué más te gustaría hacer?",
-            reply_markup=reply_markup,
+            reply_markup=_RAG_POSTQ_KEYBOARD,
             parse_mode="Markdown"
         )
 
@@ -239,6 +366,8 @@ async def process_file(update: Update, context: CallbackContext) -> int:
     Returns:
         Next conversation state
     """
+    global _indexed_document_count
+
     # Check if message contains document
     if not update.message.document:
         await update.message.reply_text(
@@ -248,13 +377,13 @@ async def process_file(update: Update, context: CallbackContext) -> int:
         return RAG_STATES["WAITING_FOR_FILE"]
 
     document = update.message.document
-    file_name = document.file_name
+    # Drop any directory components from the client-supplied name
+    file_name = os.path.basename(document.file_name or "")
 
     # Check file extension
     _, ext = os.path.splitext(file_name.lower())
-    supported_extensions = [".txt", ".pdf", ".docx", ".doc", ".md", ".html"]
 
-    if ext not in supported_extensions:
+    if ext not in _SUPPORTED_EXTENSIONS:
         await update.message.reply_text(
             f"❌ Tipo de archivo no soportado. Por favor, envía un archivo de texto, PDF o Word.",
             parse_mode="Markdown"
@@ -263,47 +392,47 @@ async def process_file(update: Update, context: CallbackContext) -> int:
 
     # Send processing message
     await update.message.reply_text(
-        f"⏳ Procesando archivo {file_name}...",
+        _PROCESSING_FILE_TPL.format(name=file_name),
         parse_mode="Markdown"
     )
 
     try:
-        # Get file from Telegram
-        file = await context.bot.get_file(document.file_id)
-
-        # Create temporary file
-        temp_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "temp")
-        os.makedirs(temp_dir, exist_ok=True)
-
-        temp_file_path = os.path.join(temp_dir, file_name)
-
-        # Download file
-        await file.download_to_drive(temp_file_path)
+        # Get file from Telegram and the indexing service concurrently
+        file, indexing_service = await asyncio.gather(
+            context.bot.get_file(document.file_id),
+            get_indexing_service()
+        )
 
-        # Get indexing service
-        indexing_service = get_indexing_service()
+        # Download file into memory
+        content = await file.download_as_bytearray()
+
+        # Index file in a worker thread so parsing and embedding don't block the bot.
+        # Prefix the ID with the user ID so uploads with the same name from
+        # different users don't overwrite each other's cache entry; sources
+        # still show the plain file name.
+        chunk_ids = await asyncio.to_thread(
+            indexing_service.index_stream,
+            io.BytesIO(content),
+            file_name,
+            force=True,
+            doc_id=f"{update.effective_user.id}_{file_name}"
+        )
 
-        # Index file
-        chunk_ids = indexing_service.index_document(temp_file_path, force=True)
+        # Invalidate cached document count and answers based on the old index
+        _indexed_document_count = None
+        _response_caches.clear()
+        clear_rag_caches()
 
         # Send success message
         await update.message.reply_text(
-            f"✅ Archivo {file_name} indexado correctamente.\\n\\n"
-            f"Se crearon {len(chunk_ids)} fragmentos para búsqueda.",
+            _FILE_INDEXED_TPL.format(name=file_name, chunks=len(chunk_ids)),
             parse_mode="Markdown"
         )
 
         # Return to main menu
-        keyboard = [
-            [InlineKeyboardButton("Hacer una pregunta", callback_data="rag_ask")],
-            [InlineKeyboardButton("Ver documentos indexados", callback_data="rag_docs")],
-            [InlineKeyboardButton("Salir", callback_data="rag_cancel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await update.message.reply_text(
             "¿Qué te gustaría hacer ahora?",
-            reply_markup=reply_markup,
+            reply_markup=_RAG_POSTFILE_KEYBOARD,
             parse_mode="Markdown"
         )
 
@@ -328,6 +457,7 @@ async def cancel(update: Update, context: CallbackContext) -> int:
     Returns:
         ConversationHandler.END
     """
+    context.user_data.pop("rag_last_response_id", None)
     await update.message.reply_text(
         "❌ Operación cancelada.",
         parse_mode="Markdown"
@@ -342,7 +472,7 @@ RAG_CONVERSATION = ConversationHandler(
             CallbackQueryHandler(rag_button, pattern="^rag_")
         ],
         RAG_STATES["WAITING_FOR_QUESTION"]: [
-            MessageHandler(filters.TEXT & ~filters.COMMAND, process_question)
+            MessageHandler(TEXT_ONLY, process_question)
         ],
         RAG_STATES["SHOWING_DOCUMENTS"]: [
             CallbackQueryHandler(rag_button, pattern="^rag_")
@@ -11,6 +11,7 @@ from telegram.ext import (
     filters
 )
 from personal_automation_bot.config import settings
+from personal_automation_bot.bot.filters import TEXT_ONLY
 from personal_automation_bot.bot.commands.basic import (
     start_command,
     help_command,
@@ -21,7 +22,6 @@ from personal_automation_bot.bot.commands.email import email_command
 from personal_automation_bot.bot.commands.callbacks import handle_callback_query
 from personal_automation_bot.bot.commands.messages import handle_message
 from personal_automation_bot.bot.conversations.calendar_conversation import get_calendar_conversation_handler
-# from personal_automation_bot.bot.commands.rag import rag_command, rag_help, get_rag_conversation_handler
 
 logger = logging.getLogger(__name__)
 
@@ -88,26 +88,20 @@ def setup_bot(token=None):
     # Create the Application and pass it the bot's token
     application = Application.builder().token(token).build()
 
-    # Register command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("menu", menu_command))
-    application.add_handler(CommandHandler("auth", auth_command))
-    application.add_handler(CommandHandler("email", email_command))
-    # application.add_handler(CommandHandler("raghelp", rag_help))
+    # Register command and conversation handlers
+    application.add_handlers(_HANDLERS)
 
-    # Register conversation handlers
-    application.add_handler(get_calendar_conversation_handler())
-    # application.add_handler(get_rag_conversation_handler())
+    # Register RAG handlers ahead of the catch-all handlers. Imported lazily
+    # because the RAG stack loads FAISS, sentence-transformers and torch.
+    if settings.ENABLE_RAG:
+        from personal_automation_bot.bot.commands.rag import rag_help, get_rag_conversation_handler
+        application.add_handlers([
+            CommandHandler("raghelp", rag_help),
+            get_rag_conversation_handler()
+        ])
 
-    # Register callback query handler for inline keyboards
-    application.add_handler(CallbackQueryHandler(handle_callback_query))
-
-    # Register message handler for conversations
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-
-    # Register message handler for unknown commands
-    application.add_handler(MessageHandler(filters.COMMAND, unknown_command))
+    # Register callback and message handlers
+    application.add_handlers(_CATCH_ALL_HANDLERS)
 
     # Register error handler
     application.add_error_handler(error_handler)
@@ -137,3 +131,28 @@ async def error_handler(update, context):
             "Lo siento, ha ocurrido un error al procesar tu solicitud. "
             "Por favor, intenta de nuevo más tarde."
         )
+
+# Handlers registered by setup_bot, in dispatch order
+_HANDLERS = (
+    # Command handlers
+    CommandHandler("start", start_command),
+    CommandHandler("help", help_command),
+    CommandHandler("menu", menu_command),
+    CommandHandler("auth", auth_command),
+    CommandHandler("email", email_command),
+
+    # Conversation handlers
+    get_calendar_conversation_handler(),
+)
+
+# Handlers registered last so conversations get the first look at updates
+_CATCH_ALL_HANDLERS = (
+    # Callback query handler for inline keyboards
+    CallbackQueryHandler(handle_callback_query),
+
+    # Message handler for conversations
+    MessageHandler(TEXT_ONLY, handle_message),
+
+    # Message handler for unknown commands
+    MessageHandler(filters.COMMAND, unknown_command),
+)
@@ -0,0 +1,9 @@
+"""
+Shared message filters for the Telegram bot.
+"""
+from telegram.ext import filters
+
+# Plain text messages that are not commands
+TEXT_ONLY = filters.TEXT & ~filters.COMMAND
+
+__all__ = ['TEXT_ONLY']
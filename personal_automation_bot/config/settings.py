@@ -2,6 +2,7 @@
 Global settings for the Personal Automation Bot.
 """
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,14 +28,29 @@ BUFFER_API_KEY = os.getenv("BUFFER_API_KEY")
 # Metricool settings
 METRICOOL_API_KEY = os.getenv("METRICOOL_API_KEY")
 
+# Redis settings (optional, shares conversation state between bot processes)
+REDIS_URL = os.getenv("REDIS_URL")
+
+# RAG settings
+ENABLE_RAG = os.getenv("ENABLE_RAG", "False").lower() in ("true", "1", "t")
+
 # Development settings
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
 # Storage settings
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
-VECTOR_STORE_DIR = os.path.join(DATA_DIR, "vector_store")
+ROOT_PATH = Path(__file__).resolve().parents[2]
+DATA_PATH = ROOT_PATH / "data"
+VECTOR_STORE_PATH = DATA_PATH / "vector_store"
+DISCOVERY_CACHE_PATH = DATA_PATH / "discovery_cache"
+ONNX_CACHE_PATH = DATA_PATH / "onnx"
+DATA_DIR = str(DATA_PATH)
+VECTOR_STORE_DIR = str(VECTOR_STORE_PATH)
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory unless it already exists."""
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
 
 # Create directories if they don't exist
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
+_ensure_dir(VECTOR_STORE_PATH)
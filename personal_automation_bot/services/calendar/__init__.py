@@ -3,6 +3,6 @@ Calendar service module for Google Calendar integration.
 """
 
 from .calendar_service import CalendarService
-from .models import CalendarEvent
+from .models import CalendarEvent, CalendarEventBatch
 
-__all__ = ['CalendarService', 'CalendarEvent']
+__all__ = ['CalendarService', 'CalendarEvent', 'CalendarEventBatch']
@@ -1,33 +1,407 @@
 """
 Google Calendar service implementation.
 """
+import asyncio
+import copy
+import functools
+import hashlib
+import itertools
 import logging
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Union
 
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.discovery_cache.base import Cache
 from googleapiclient.errors import HttpError
 
+from personal_automation_bot.config import settings
 from personal_automation_bot.utils.auth import google_auth_manager
-from .models import CalendarEvent
+from personal_automation_bot.utils.google_api import API_MODEL, ThreadLocalHttp
+from .models import CalendarEvent, CalendarEventBatch
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of requests Google accepts in one batch
+BATCH_SIZE = 50
+
+# Socket timeout in seconds for Calendar API requests
+HTTP_TIMEOUT = 10
+
+# Rate-limit and server errors worth retrying, and how often to try in total
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 5
+# Upper bound in seconds for any single retry wait, including Retry-After
+MAX_RETRY_DELAY = 30
+
+# Event validation errors shown to the user
+_MSG_ID_REQUIRED = "El ID del evento es obligatorio para actualizar"
+_MSG_TITLE_REQUIRED = "El título del evento es obligatorio"
+_MSG_DATES_REQUIRED = "Las fechas de inicio y fin son obligatorias"
+_MSG_DATES_ORDER = "La fecha de inicio debe ser anterior a la fecha de fin"
+
+# Partial-response masks: only the fields CalendarEvent and list_calendars read
+EVENT_FIELDS = "id,summary,description,location,start,end,attendees(email)"
+EVENT_LIST_FIELDS = f"items({EVENT_FIELDS}),nextPageToken"
+EVENT_TIMES_LIST_FIELDS = "items(id,summary,start,end),nextPageToken"
+CALENDAR_LIST_FIELDS = "items(id,summary,description,primary,accessRole)"
+
+@functools.lru_cache(maxsize=1)
+def _calendar_discovery_doc() -> Optional[str]:
+    """Return the Calendar v3 discovery document bundled with googleapiclient."""
+    return get_static_doc('calendar', 'v3')
+
+
+def _validate_event(event: CalendarEvent, require_id: bool = False):
+    """
+    Check that an event can be sent to the API.
+
+    Raises:
+        ValueError: With the first problem found
+    """
+    if require_id and not event.id:
+        raise ValueError(_MSG_ID_REQUIRED)
+    if not event.title:
+        raise ValueError(_MSG_TITLE_REQUIRED)
+    start_time, end_time = event.start_time, event.end_time
+    if not (start_time and end_time):
+        raise ValueError(_MSG_DATES_REQUIRED)
+    if start_time >= end_time:
+        raise ValueError(_MSG_DATES_ORDER)
+
+
+def _is_retryable(error: Optional[Exception]) -> bool:
+    """Check whether an API error is transient."""
+    return isinstance(error, HttpError) and error.resp.status in RETRYABLE_STATUSES
+
+
+def _retry_delay(error: HttpError, attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After if given, else exponential backoff."""
+    retry_after = error.resp.get('retry-after')
+    if retry_after is not None:
+        try:
+            return min(MAX_RETRY_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(MAX_RETRY_DELAY, 2 ** attempt) + random.uniform(0, 0.5)
+
+
+def _new_event_id() -> str:
+    """
+    Generate a client-side event ID.
+
+    Inserts carry their own ID so a retried insert that already reached
+    Google fails with 409 instead of creating a duplicate. Hex digits are
+    valid in the base32hex alphabet the Calendar API requires.
+    """
+    return uuid.uuid4().hex
+
+
+def _execute_with_retry(request, max_attempts: int = MAX_ATTEMPTS):
+    """
+    Execute an API request, retrying rate-limit and server errors.
+
+    Only pass idempotent requests: reads, updates, deletes and inserts
+    carrying a client-side ID.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not _is_retryable(e) or attempt == max_attempts - 1:
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(f"Google Calendar API returned {e.resp.status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+class _DiskCache(Cache):
+    """Discovery document cache kept on disk so it survives restarts."""
+
+    def __init__(self, path: Path):
+        self._path = path
+
+    def _file(self, url: str) -> Path:
+        return self._path / hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        try:
+            return self._file(url).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def set(self, url, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        file = self._file(url)
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            tmp_file = file.with_suffix('.tmp')
+            tmp_file.write_text(content, encoding='utf-8')
+            tmp_file.replace(file)
+        except OSError as e:
+            logger.warning(f"Could not cache discovery document for {url}: {e}")
+
+
+# Transport shared by every user's client; credentials are added per user
+_SHARED_HTTP = ThreadLocalHttp(HTTP_TIMEOUT)
+
+# Used when the discovery document has to be fetched over the network
+_DISCOVERY_CACHE = _DiskCache(settings.DISCOVERY_CACHE_PATH)
+
 
 class CalendarService:
     """Service for interacting with Google Calendar API."""
 
-    def __init__(self):
-        """Initialize the Calendar service."""
+    # Seconds a built client is reused, and how many users' clients are kept
+    CLIENT_TTL = 300
+    CLIENT_CACHE_SIZE = 256
+
+    # Seconds a get_events/list_calendars/search_events result is reused
+    READ_CACHE_TTL = 60
+
+    def __init__(self, max_workers: int = 16):
+        """
+        Initialize the Calendar service.
+
+        Args:
+            max_workers (int): Threads used by the async methods to run
+                blocking API calls
+        """
         self.auth_manager = google_auth_manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcal")
+
+        # Built API clients per user: user_id -> (built at, client), oldest first
+        self._client_cache: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._client_cache_lock = threading.Lock()
+
+        # Read results: (kind, user_id, calendar_id, *args) -> (stored at, result)
+        self._read_cache: Dict[tuple, Tuple[float, list]] = {}
+        self._read_cache_lock = threading.Lock()
+
+    async def _arun(self, fn, *args, **kwargs):
+        """Run a blocking method in the service's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
 
     def _get_calendar_client(self, user_id: int):
-        """Get authenticated Google Calendar client for user."""
+        """
+        Get authenticated Google Calendar client for user.
+
+        Clients are cached per user for CLIENT_TTL seconds, keeping at most
+        CLIENT_CACHE_SIZE users (least recently used are evicted first).
+        """
+        now = time.monotonic()
+        with self._client_cache_lock:
+            cached = self._client_cache.get(user_id)
+            if cached is not None and now - cached[0] < self.CLIENT_TTL:
+                self._client_cache.move_to_end(user_id)
+                return cached[1]
+
         credentials = self.auth_manager.get_user_credentials(user_id)
         if not credentials:
             raise ValueError("User not authenticated with Google")
 
-        return build('calendar', 'v3', credentials=credentials)
+        http = AuthorizedHttp(credentials, http=_SHARED_HTTP)
+        discovery_doc = _calendar_discovery_doc()
+        if discovery_doc is not None:
+            service = build_from_document(discovery_doc, http=http, model=API_MODEL)
+        else:
+            service = build('calendar', 'v3', http=http, model=API_MODEL,
+                            cache=_DISCOVERY_CACHE, static_discovery=False)
+
+        with self._client_cache_lock:
+            self._client_cache[user_id] = (now, service)
+            self._client_cache.move_to_end(user_id)
+            while len(self._client_cache) > self.CLIENT_CACHE_SIZE:
+                self._client_cache.popitem(last=False)
+
+        return service
+
+    def _check_auth_error(self, user_id: int, error: Exception):
+        """Drop the user's cached client if the API rejected its credentials."""
+        if isinstance(error, HttpError) and error.resp.status in (401, 403):
+            with self._client_cache_lock:
+                self._client_cache.pop(user_id, None)
+
+    @staticmethod
+    def _events_cache_key(user_id: int, calendar_id: str, start_date: Optional[datetime],
+                          end_date: Optional[datetime], max_results: int) -> tuple:
+        """
+        Build the read cache key for an event range.
+
+        Callers pass ranges based on datetime.now(), so the bounds are
+        truncated to the minute; otherwise no two calls would share a key.
+        """
+        def minute(value: Optional[datetime]) -> Optional[datetime]:
+            return value.replace(second=0, microsecond=0) if value is not None else None
+
+        return ('events', user_id, calendar_id, minute(start_date), minute(end_date), max_results)
+
+    @staticmethod
+    def _read_expired(key: tuple, stored_at: float, now: float) -> bool:
+        """Check whether a cached read is too old or covers a range that has ended."""
+        if now - stored_at >= CalendarService.READ_CACHE_TTL:
+            return True
+        end_date = key[4] if key[0] == 'events' else None
+        return end_date is not None and end_date < datetime.now(end_date.tzinfo)
+
+    def _get_cached_read(self, key: tuple) -> Optional[list]:
+        """Return a copy of a cached read result, or None if missing or expired."""
+        with self._read_cache_lock:
+            cached = self._read_cache.get(key)
+            if cached is None:
+                return None
+            if self._read_expired(key, cached[0], time.monotonic()):
+                del self._read_cache[key]
+                return None
+            # Callers edit the returned events, so each gets its own copies
+            return [copy.copy(item) for item in cached[1]]
+
+    def _put_cached_read(self, key: tuple, result: list):
+        """Store a copy of a read result, dropping expired entries."""
+        now = time.monotonic()
+        with self._read_cache_lock:
+            expired = [k for k, (stored_at, _) in self._read_cache.items()
+                       if self._read_expired(k, stored_at, now)]
+            for k in expired:
+                del self._read_cache[k]
+            self._read_cache[key] = (now, [copy.copy(item) for item in result])
+
+    def _invalidate_reads(self, user_id: int, calendar_id: str):
+        """Drop cached event reads for a user's calendar after it changes."""
+        with self._read_cache_lock:
+            stale = [k for k in self._read_cache if k[1] == user_id and k[2] == calendar_id]
+            for k in stale:
+                del self._read_cache[k]
+
+    def _execute_batch(self, service, requests: List[Tuple[str, Any]]) -> Dict[str, Tuple[Any, Optional[Exception]]]:
+        """
+        Execute API requests as batch HTTP requests.
+
+        Requests are sent in chunks of BATCH_SIZE, Google's per-batch limit.
+        Requests that fail with a rate-limit or server error, on their own or
+        because the whole batch did, are sent again, up to MAX_ATTEMPTS times
+        in total. Only pass idempotent requests. A single request is executed
+        directly, skipping the multipart batch overhead.
+
+        Args:
+            service: Google Calendar client
+            requests (List[Tuple[str, Any]]): (request ID, request) pairs
+
+        Returns:
+            Dict[str, Tuple[Any, Optional[Exception]]]: Response and error for each request ID
+        """
+        if len(requests) == 1:
+            request_id, request = requests[0]
+            try:
+                return {request_id: (_execute_with_retry(request), None)}
+            except HttpError as e:
+                return {request_id: (None, e)}
+
+        results = {}
+
+        def callback(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        pending = requests
+        for attempt in range(MAX_ATTEMPTS):
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start:start + BATCH_SIZE]
+                batch = service.new_batch_http_request(callback=callback)
+                for request_id, request in chunk:
+                    batch.add(request, request_id=request_id)
+                try:
+                    batch.execute()
+                except HttpError as e:
+                    if not _is_retryable(e):
+                        raise
+                    for request_id, _ in chunk:
+                        results[request_id] = (None, e)
+
+            pending = [(request_id, request) for request_id, request in pending
+                       if _is_retryable(results[request_id][1])]
+            if not pending or attempt == MAX_ATTEMPTS - 1:
+                break
+
+            delay = max(_retry_delay(results[request_id][1], attempt) for request_id, _ in pending)
+            logger.warning(f"Retrying {len(pending)} Google Calendar requests in {delay:.1f}s")
+            time.sleep(delay)
+
+        return results
+
+    def iter_events(self, user_id: int, start_date: Optional[datetime] = None,
+                    end_date: Optional[datetime] = None, page_size: int = 250,
+                    calendar_id: str = 'primary') -> Iterator[CalendarEvent]:
+        """
+        Iterate over calendar events for a user, following result pages.
+
+        Pages are only requested as the caller consumes events, so breaking
+        out early avoids fetching the rest.
+
+        Args:
+            user_id (int): Telegram user ID
+            start_date (Optional[datetime]): Start date for events (default: now)
+            end_date (Optional[datetime]): End date for events (default: 7 days from now)
+            page_size (int): Number of events requested per page (API maximum: 2500)
+            calendar_id (str): Calendar ID to query (default: primary)
+
+        Yields:
+            CalendarEvent: Events in start time order
+
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If API call fails
+        """
+        service = self._get_calendar_client(user_id)
+
+        # Set default date range if not provided
+        if start_date is None:
+            start_date = datetime.now()
+        if end_date is None:
+            end_date = start_date + timedelta(days=7)
+
+        # Format dates for API
+        time_min = start_date.isoformat() + 'Z'
+        time_max = end_date.isoformat() + 'Z'
+
+        page_token = None
+        while True:
+            try:
+                events_result = _execute_with_retry(service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    maxResults=page_size,
+                    pageToken=page_token,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=EVENT_LIST_FIELDS
+                ))
+            except HttpError as e:
+                self._check_auth_error(user_id, e)
+                logger.error(f"Google Calendar API error for user {user_id}: {e}")
+                raise Exception(f"Error al acceder al calendario: {e}")
+
+            for event in events_result.get('items', []):
+                try:
+                    calendar_event = CalendarEvent.from_google_event(event)
+                except Exception as e:
+                    logger.warning(f"Failed to parse event {event.get('id', 'unknown')}: {e}")
+                    continue
+                yield calendar_event
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
 
     def get_events(self, user_id: int, start_date: Optional[datetime] = None,
                    end_date: Optional[datetime] = None, max_results: int = 10,
@@ -45,6 +419,49 @@ class CalendarService:
         Returns:
             List[CalendarEvent]: List of calendar events
 
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If API call fails
+        """
+        cache_key = self._events_cache_key(user_id, calendar_id, start_date, end_date, max_results)
+        cached = self._get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            calendar_events = list(itertools.islice(
+                self.iter_events(user_id, start_date, end_date,
+                                 page_size=min(max_results, 250), calendar_id=calendar_id),
+                max_results
+            ))
+
+            logger.info(f"Retrieved {len(calendar_events)} events for user {user_id}")
+            self._put_cached_read(cache_key, calendar_events)
+            return calendar_events
+
+        except Exception as e:
+            logger.error(f"Failed to get events for user {user_id}: {e}")
+            raise
+
+    def get_events_columnar(self, user_id: int, start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None, max_results: int = 250,
+                            calendar_id: str = 'primary') -> CalendarEventBatch:
+        """
+        Get calendar events for a user as a column-oriented batch.
+
+        Cheaper than get_events for large result sets that are only sorted,
+        filtered by time or listed, since no CalendarEvent is built per event.
+
+        Args:
+            user_id (int): Telegram user ID
+            start_date (Optional[datetime]): Start date for events (default: now)
+            end_date (Optional[datetime]): End date for events (default: 7 days from now)
+            max_results (int): Maximum number of events to return
+            calendar_id (str): Calendar ID to query (default: primary)
+
+        Returns:
+            CalendarEventBatch: Events sorted by start time
+
         Raises:
             ValueError: If user is not authenticated
             Exception: If API call fails
@@ -52,42 +469,27 @@ class CalendarService:
         try:
             service = self._get_calendar_client(user_id)
 
-            # Set default date range if not provided
             if start_date is None:
                 start_date = datetime.now()
             if end_date is None:
                 end_date = start_date + timedelta(days=7)
 
-            # Format dates for API
-            time_min = start_date.isoformat() + 'Z'
-            time_max = end_date.isoformat() + 'Z'
-
-            # Call the Calendar API
-            events_result = service.events().list(
+            events_result = _execute_with_retry(service.events().list(
                 calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
+                timeMin=start_date.isoformat() + 'Z',
+                timeMax=end_date.isoformat() + 'Z',
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=EVENT_TIMES_LIST_FIELDS
+            ))
 
-            events = events_result.get('items', [])
-
-            # Convert to CalendarEvent objects
-            calendar_events = []
-            for event in events:
-                try:
-                    calendar_event = CalendarEvent.from_google_event(event)
-                    calendar_events.append(calendar_event)
-                except Exception as e:
-                    logger.warning(f"Failed to parse event {event.get('id', 'unknown')}: {e}")
-                    continue
-
-            logger.info(f"Retrieved {len(calendar_events)} events for user {user_id}")
-            return calendar_events
+            batch = CalendarEventBatch.from_google_events(events_result.get('items', []))
+            logger.info(f"Retrieved {len(batch)} events for user {user_id}")
+            return batch
 
         except HttpError as e:
+            self._check_auth_error(user_id, e)
             logger.error(f"Google Calendar API error for user {user_id}: {e}")
             raise Exception(f"Error al acceder al calendario: {e}")
         except Exception as e:
@@ -111,40 +513,83 @@ class CalendarService:
             ValueError: If user is not authenticated or event data is invalid
             Exception: If API call fails
         """
-        try:
-            service = self._get_calendar_client(user_id)
+        result = self.create_events_batch(user_id, [event], calendar_id=calendar_id)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-            # Validate event data
-            if not event.title:
-                raise ValueError("El título del evento es obligatorio")
-            if not event.start_time or not event.end_time:
-                raise ValueError("Las fechas de inicio y fin son obligatorias")
-            if event.start_time >= event.end_time:
-                raise ValueError("La fecha de inicio debe ser anterior a la fecha de fin")
+    def create_events_batch(self, user_id: int, events: List[CalendarEvent],
+                            calendar_id: str = 'primary') -> List[Union[CalendarEvent, Exception]]:
+        """
+        Create several calendar events with batched API requests.
+
+        Args:
+            user_id (int): Telegram user ID
+            events (List[CalendarEvent]): Events to create
+            calendar_id (str): Calendar ID to create the events in
 
-            # Convert to Google Calendar format
-            google_event = event.to_google_event()
+        Returns:
+            List[Union[CalendarEvent, Exception]]: For each input event, in order,
+            the created event or the error that prevented its creation
 
-            # Create the event
-            created_event = service.events().insert(
-                calendarId=calendar_id,
-                body=google_event
-            ).execute()
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If the batch request itself fails
+        """
+        try:
+            service = self._get_calendar_client(user_id)
+            results: List[Union[CalendarEvent, Exception]] = [None] * len(events)
 
-            # Convert back to CalendarEvent
-            result_event = CalendarEvent.from_google_event(created_event)
+            requests = []
+            event_ids = {}
+            for i, event in enumerate(events):
+                try:
+                    _validate_event(event)
+                except ValueError as e:
+                    logger.warning(f"Invalid event data for user {user_id}: {e}")
+                    results[i] = e
+                    continue
 
-            logger.info(f"Created event {result_event.id} for user {user_id}")
-            return result_event
+                request_id = str(i)
+                event_ids[request_id] = _new_event_id()
+                requests.append((request_id, service.events().insert(
+                    calendarId=calendar_id,
+                    body={**event.to_google_event(), 'id': event_ids[request_id]}
+                )))
+
+            responses = self._execute_batch(service, requests)
+            if requests:
+                self._invalidate_reads(user_id, calendar_id)
+
+            # A 409 means an earlier attempt of the insert went through; read the event back
+            conflicts = [
+                (request_id, service.events().get(
+                    calendarId=calendar_id, eventId=event_ids[request_id], fields=EVENT_FIELDS
+                ))
+                for request_id, (_, error) in responses.items()
+                if isinstance(error, HttpError) and error.resp.status == 409
+            ]
+            if conflicts:
+                responses.update(self._execute_batch(service, conflicts))
+
+            for request_id, (response, error) in responses.items():
+                i = int(request_id)
+                self._check_auth_error(user_id, error)
+                if error is not None:
+                    logger.error(f"Google Calendar API error for user {user_id}: {error}")
+                    results[i] = Exception(f"Error al crear el evento: {error}")
+                else:
+                    results[i] = CalendarEvent.from_google_event(response)
+                    logger.info(f"Created event {results[i].id} for user {user_id}")
+
+            return results
 
         except HttpError as e:
+            self._check_auth_error(user_id, e)
             logger.error(f"Google Calendar API error for user {user_id}: {e}")
             raise Exception(f"Error al crear el evento: {e}")
-        except ValueError as e:
-            logger.warning(f"Invalid event data for user {user_id}: {e}")
-            raise
         except Exception as e:
-            logger.error(f"Failed to create event for user {user_id}: {e}")
+            logger.error(f"Failed to create events for user {user_id}: {e}")
             raise
 
     def delete_event(self, user_id: int, event_id: str,
@@ -164,27 +609,64 @@ class CalendarService:
             ValueError: If user is not authenticated
             Exception: If API call fails
         """
-        try:
-            service = self._get_calendar_client(user_id)
+        result = self.delete_events_batch(user_id, [event_id], calendar_id=calendar_id)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-            # Delete the event
-            service.events().delete(
-                calendarId=calendar_id,
-                eventId=event_id
-            ).execute()
+    def delete_events_batch(self, user_id: int, event_ids: List[str],
+                            calendar_id: str = 'primary') -> List[Union[bool, Exception]]:
+        """
+        Delete several calendar events with batched API requests.
 
-            logger.info(f"Deleted event {event_id} for user {user_id}")
-            return True
+        Args:
+            user_id (int): Telegram user ID
+            event_ids (List[str]): IDs of the events to delete
+            calendar_id (str): Calendar ID containing the events
+
+        Returns:
+            List[Union[bool, Exception]]: For each input ID, in order, True if
+            the event was deleted or the error that prevented it
+
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If the batch request itself fails
+        """
+        try:
+            service = self._get_calendar_client(user_id)
+            results: List[Union[bool, Exception]] = [None] * len(event_ids)
+
+            requests = [
+                (str(i), service.events().delete(calendarId=calendar_id, eventId=event_id))
+                for i, event_id in enumerate(event_ids)
+            ]
+
+            responses = self._execute_batch(service, requests)
+            if requests:
+                self._invalidate_reads(user_id, calendar_id)
+
+            for request_id, (response, error) in responses.items():
+                i = int(request_id)
+                self._check_auth_error(user_id, error)
+                event_id = event_ids[i]
+                if error is None:
+                    results[i] = True
+                    logger.info(f"Deleted event {event_id} for user {user_id}")
+                elif isinstance(error, HttpError) and error.resp.status == 404:
+                    logger.warning(f"Event {event_id} not found for user {user_id}")
+                    results[i] = Exception("El evento no existe o ya fue eliminado")
+                else:
+                    logger.error(f"Google Calendar API error for user {user_id}: {error}")
+                    results[i] = Exception(f"Error al eliminar el evento: {error}")
+
+            return results
 
         except HttpError as e:
-            if e.resp.status == 404:
-                logger.warning(f"Event {event_id} not found for user {user_id}")
-                raise Exception("El evento no existe o ya fue eliminado")
-            else:
-                logger.error(f"Google Calendar API error for user {user_id}: {e}")
-                raise Exception(f"Error al eliminar el evento: {e}")
+            self._check_auth_error(user_id, e)
+            logger.error(f"Google Calendar API error for user {user_id}: {e}")
+            raise Exception(f"Error al eliminar el evento: {e}")
         except Exception as e:
-            logger.error(f"Failed to delete event {event_id} for user {user_id}: {e}")
+            logger.error(f"Failed to delete events for user {user_id}: {e}")
             raise
 
     def get_event_by_id(self, user_id: int, event_id: str,
@@ -208,10 +690,11 @@ class CalendarService:
             service = self._get_calendar_client(user_id)
 
             # Get the event
-            google_event = service.events().get(
+            google_event = _execute_with_retry(service.events().get(
                 calendarId=calendar_id,
-                eventId=event_id
-            ).execute()
+                eventId=event_id,
+                fields=EVENT_FIELDS
+            ))
 
             # Convert to CalendarEvent
             event = CalendarEvent.from_google_event(google_event)
@@ -220,6 +703,7 @@ class CalendarService:
             return event
 
         except HttpError as e:
+            self._check_auth_error(user_id, e)
             if e.resp.status == 404:
                 logger.warning(f"Event {event_id} not found for user {user_id}")
                 return None
@@ -230,6 +714,62 @@ class CalendarService:
             logger.error(f"Failed to get event {event_id} for user {user_id}: {e}")
             raise
 
+    def get_events_by_ids(self, user_id: int, event_ids: List[str],
+                          calendar_id: str = 'primary') -> Dict[str, Union[Optional[CalendarEvent], Exception]]:
+        """
+        Get several events by ID with batched API requests.
+
+        Args:
+            user_id (int): Telegram user ID
+            event_ids (List[str]): IDs of the events to retrieve
+            calendar_id (str): Calendar ID containing the events
+
+        Returns:
+            Dict[str, Union[Optional[CalendarEvent], Exception]]: For each event ID,
+            the event, None if it does not exist, or the error that prevented
+            retrieving it
+
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If the batch request itself fails
+        """
+        try:
+            service = self._get_calendar_client(user_id)
+            unique_ids = list(dict.fromkeys(event_ids))
+
+            requests = [
+                (str(i), service.events().get(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    fields=EVENT_FIELDS
+                ))
+                for i, event_id in enumerate(unique_ids)
+            ]
+
+            results: Dict[str, Union[Optional[CalendarEvent], Exception]] = {}
+            for request_id, (response, error) in self._execute_batch(service, requests).items():
+                event_id = unique_ids[int(request_id)]
+                self._check_auth_error(user_id, error)
+                if error is None:
+                    results[event_id] = CalendarEvent.from_google_event(response)
+                elif isinstance(error, HttpError) and error.resp.status == 404:
+                    logger.warning(f"Event {event_id} not found for user {user_id}")
+                    results[event_id] = None
+                else:
+                    logger.error(f"Google Calendar API error for user {user_id}: {error}")
+                    results[event_id] = Exception(f"Error al obtener el evento: {error}")
+
+            logger.info(f"Retrieved {len(results)} events by ID for user {user_id}")
+            return results
+
+        except HttpError as e:
+            self._check_auth_error(user_id, e)
+            logger.error(f"Google Calendar API error for user {user_id}: {e}")
+            raise Exception(f"Error al obtener los eventos: {e}")
+        except Exception as e:
+            logger.error(f"Failed to get events by ID for user {user_id}: {e}")
+            raise
+
     def list_calendars(self, user_id: int) -> List[Dict[str, Any]]:
         """
         List available calendars for the user.
@@ -244,11 +784,16 @@ class CalendarService:
             ValueError: If user is not authenticated
             Exception: If API call fails
         """
+        cache_key = ('calendars', user_id, None)
+        cached = self._get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             service = self._get_calendar_client(user_id)
 
             # Get calendar list
-            calendar_list = service.calendarList().list().execute()
+            calendar_list = _execute_with_retry(service.calendarList().list(fields=CALENDAR_LIST_FIELDS))
 
             calendars = []
             for calendar_item in calendar_list.get('items', []):
@@ -261,9 +806,11 @@ class CalendarService:
                 })
 
             logger.info(f"Retrieved {len(calendars)} calendars for user {user_id}")
+            self._put_cached_read(cache_key, calendars)
             return calendars
 
         except HttpError as e:
+            self._check_auth_error(user_id, e)
             logger.error(f"Google Calendar API error for user {user_id}: {e}")
             raise Exception(f"Error al obtener la lista de calendarios: {e}")
         except Exception as e:
@@ -288,17 +835,23 @@ class CalendarService:
             ValueError: If user is not authenticated
             Exception: If API call fails
         """
+        cache_key = ('search', user_id, calendar_id, query, max_results)
+        cached = self._get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             service = self._get_calendar_client(user_id)
 
             # Search events
-            events_result = service.events().list(
+            events_result = _execute_with_retry(service.events().list(
                 calendarId=calendar_id,
                 q=query,
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=EVENT_LIST_FIELDS
+            ))
 
             events = events_result.get('items', [])
 
@@ -313,9 +866,11 @@ class CalendarService:
                     continue
 
             logger.info(f"Found {len(calendar_events)} events matching '{query}' for user {user_id}")
+            self._put_cached_read(cache_key, calendar_events)
             return calendar_events
 
         except HttpError as e:
+            self._check_auth_error(user_id, e)
             logger.error(f"Google Calendar API error for user {user_id}: {e}")
             raise Exception(f"Error al buscar eventos: {e}")
         except Exception as e:
@@ -339,45 +894,123 @@ class CalendarService:
             ValueError: If user is not authenticated or event data is invalid
             Exception: If API call fails
         """
+        result = self.update_events_batch(user_id, [event], calendar_id=calendar_id)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def update_events_batch(self, user_id: int, events: List[CalendarEvent],
+                            calendar_id: str = 'primary') -> List[Union[CalendarEvent, Exception]]:
+        """
+        Update several calendar events with batched API requests.
+
+        Args:
+            user_id (int): Telegram user ID
+            events (List[CalendarEvent]): Events to update (must have IDs)
+            calendar_id (str): Calendar ID containing the events
+
+        Returns:
+            List[Union[CalendarEvent, Exception]]: For each input event, in order,
+            the updated event or the error that prevented the update
+
+        Raises:
+            ValueError: If user is not authenticated
+            Exception: If the batch request itself fails
+        """
         try:
             service = self._get_calendar_client(user_id)
+            results: List[Union[CalendarEvent, Exception]] = [None] * len(events)
 
-            # Validate event data
-            if not event.id:
-                raise ValueError("El ID del evento es obligatorio para actualizar")
-            if not event.title:
-                raise ValueError("El título del evento es obligatorio")
-            if not event.start_time or not event.end_time:
-                raise ValueError("Las fechas de inicio y fin son obligatorias")
-            if event.start_time >= event.end_time:
-                raise ValueError("La fecha de inicio debe ser anterior a la fecha de fin")
-
-            # Convert to Google Calendar format
-            google_event = event.to_google_event()
-
-            # Update the event
-            updated_event = service.events().update(
-                calendarId=calendar_id,
-                eventId=event.id,
-                body=google_event
-            ).execute()
-
-            # Convert back to CalendarEvent
-            result_event = CalendarEvent.from_google_event(updated_event)
+            requests = []
+            for i, event in enumerate(events):
+                try:
+                    _validate_event(event, require_id=True)
+                except ValueError as e:
+                    logger.warning(f"Invalid event data for user {user_id}: {e}")
+                    results[i] = e
+                    continue
 
-            logger.info(f"Updated event {result_event.id} for user {user_id}")
-            return result_event
+                requests.append((str(i), service.events().update(
+                    calendarId=calendar_id,
+                    eventId=event.id,
+                    body=event.to_google_event()
+                )))
+
+            responses = self._execute_batch(service, requests)
+            if requests:
+                self._invalidate_reads(user_id, calendar_id)
+
+            for request_id, (response, error) in responses.items():
+                i = int(request_id)
+                self._check_auth_error(user_id, error)
+                if error is None:
+                    results[i] = CalendarEvent.from_google_event(response)
+                    logger.info(f"Updated event {results[i].id} for user {user_id}")
+                elif isinstance(error, HttpError) and error.resp.status == 404:
+                    logger.warning(f"Event {events[i].id} not found for user {user_id}")
+                    results[i] = Exception("El evento no existe o ya fue eliminado")
+                else:
+                    logger.error(f"Google Calendar API error for user {user_id}: {error}")
+                    results[i] = Exception(f"Error al actualizar el evento: {error}")
+
+            return results
 
         except HttpError as e:
-            if e.resp.status == 404:
-                logger.warning(f"Event {event.id} not found for user {user_id}")
-                raise Exception("El evento no existe o ya fue eliminado")
-            else:
-                logger.error(f"Google Calendar API error for user {user_id}: {e}")
-                raise Exception(f"Error al actualizar el evento: {e}")
-        except ValueError as e:
-            logger.warning(f"Invalid event data for user {user_id}: {e}")
-            raise
+            self._check_auth_error(user_id, e)
+            logger.error(f"Google Calendar API error for user {user_id}: {e}")
+            raise Exception(f"Error al actualizar el evento: {e}")
         except Exception as e:
-            logger.error(f"Failed to update event for user {user_id}: {e}")
+            logger.error(f"Failed to update events for user {user_id}: {e}")
             raise
+
+    # Async variants. Each runs its blocking counterpart in the service's
+    # thread pool so the bot's event loop keeps serving other users; use
+    # asyncio.gather() over several calls to fan out across users.
+
+    async def aget_events(self, *args, **kwargs) -> List[CalendarEvent]:
+        """Async variant of get_events."""
+        return await self._arun(self.get_events, *args, **kwargs)
+
+    async def aget_events_columnar(self, *args, **kwargs) -> CalendarEventBatch:
+        """Async variant of get_events_columnar."""
+        return await self._arun(self.get_events_columnar, *args, **kwargs)
+
+    async def acreate_event(self, *args, **kwargs) -> CalendarEvent:
+        """Async variant of create_event."""
+        return await self._arun(self.create_event, *args, **kwargs)
+
+    async def acreate_events_batch(self, *args, **kwargs) -> List[Union[CalendarEvent, Exception]]:
+        """Async variant of create_events_batch."""
+        return await self._arun(self.create_events_batch, *args, **kwargs)
+
+    async def adelete_event(self, *args, **kwargs) -> bool:
+        """Async variant of delete_event."""
+        return await self._arun(self.delete_event, *args, **kwargs)
+
+    async def adelete_events_batch(self, *args, **kwargs) -> List[Union[bool, Exception]]:
+        """Async variant of delete_events_batch."""
+        return await self._arun(self.delete_events_batch, *args, **kwargs)
+
+    async def aget_event_by_id(self, *args, **kwargs) -> Optional[CalendarEvent]:
+        """Async variant of get_event_by_id."""
+        return await self._arun(self.get_event_by_id, *args, **kwargs)
+
+    async def aget_events_by_ids(self, *args, **kwargs) -> Dict[str, Union[Optional[CalendarEvent], Exception]]:
+        """Async variant of get_events_by_ids."""
+        return await self._arun(self.get_events_by_ids, *args, **kwargs)
+
+    async def alist_calendars(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async variant of list_calendars."""
+        return await self._arun(self.list_calendars, *args, **kwargs)
+
+    async def asearch_events(self, *args, **kwargs) -> List[CalendarEvent]:
+        """Async variant of search_events."""
+        return await self._arun(self.search_events, *args, **kwargs)
+
+    async def aupdate_event(self, *args, **kwargs) -> CalendarEvent:
+        """Async variant of update_event."""
+        return await self._arun(self.update_event, *args, **kwargs)
+
+    async def aupdate_events_batch(self, *args, **kwargs) -> List[Union[CalendarEvent, Exception]]:
+        """Async variant of update_events_batch."""
+        return await self._arun(self.update_events_batch, *args, **kwargs)
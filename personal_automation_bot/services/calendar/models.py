@@ -2,11 +2,25 @@
 Data models for calendar events.
 """
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable
 
+import numpy as np
 
-@dataclass
+
+def _parse_gcal_dt(value: str) -> datetime:
+    """Parse a Google Calendar RFC 3339 timestamp, accepting a trailing 'Z'."""
+    return datetime.fromisoformat(value[:-1] + '+00:00' if value[-1] == 'Z' else value)
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; naive values are returned as is."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(slots=True)
 class CalendarEvent:
     """Represents a calendar event."""
 
@@ -57,16 +71,17 @@ class CalendarEvent:
     @classmethod
     def from_google_event(cls, google_event: Dict[str, Any]) -> 'CalendarEvent':
         """Create CalendarEvent from Google Calendar API event."""
-        event = cls()
-
-        event.id = google_event.get('id')
-        event.title = google_event.get('summary', 'Sin título')
-        event.description = google_event.get('description')
-        event.location = google_event.get('location')
+        get = google_event.get
+        event = cls(
+            id=get('id'),
+            title=get('summary', 'Sin título'),
+            description=get('description'),
+            location=get('location'),
+        )
 
         # Parse start and end times
-        start = google_event.get('start', {})
-        end = google_event.get('end', {})
+        start = get('start', {})
+        end = get('end', {})
 
         if 'date' in start:
             # All-day event
@@ -75,53 +90,115 @@ class CalendarEvent:
             event.end_time = datetime.fromisoformat(end['date'])
         else:
             # Timed event
-            event.all_day = False
             start_dt = start.get('dateTime')
             end_dt = end.get('dateTime')
-
             if start_dt:
-                # Remove timezone info for simplicity
-                if start_dt.endswith('Z'):
-                    start_dt = start_dt[:-1] + '+00:00'
-                event.start_time = datetime.fromisoformat(start_dt.replace('Z', '+00:00'))
-
+                event.start_time = _parse_gcal_dt(start_dt)
             if end_dt:
-                # Remove timezone info for simplicity
-                if end_dt.endswith('Z'):
-                    end_dt = end_dt[:-1] + '+00:00'
-                event.end_time = datetime.fromisoformat(end_dt.replace('Z', '+00:00'))
+                event.end_time = _parse_gcal_dt(end_dt)
 
         # Parse attendees
-        attendees = google_event.get('attendees', [])
+        attendees = get('attendees')
         if attendees:
-            event.attendees = [attendee.get('email') for attendee in attendees if attendee.get('email')]
+            event.attendees = [attendee['email'] for attendee in attendees if attendee.get('email')]
 
         return event
 
     def format_for_display(self) -> str:
         """Format event for display in Telegram."""
-        lines = [f"📅 **{self.title}**"]
-
-        if self.start_time and self.end_time:
-            if self.all_day:
-                lines.append(f"🕐 Todo el día - {self.start_time.strftime('%d/%m/%Y')}")
-            else:
-                start_str = self.start_time.strftime('%d/%m/%Y %H:%M')
-                end_str = self.end_time.strftime('%H:%M')
-                lines.append(f"🕐 {start_str} - {end_str}")
+        if not (self.start_time and self.end_time):
+            time_line = ""
+        elif self.all_day:
+            time_line = f"\n🕐 Todo el día - {self.start_time:%d/%m/%Y}"
+        else:
+            time_line = f"\n🕐 {self.start_time:%d/%m/%Y %H:%M} - {self.end_time:%H:%M}"
 
-        if self.location:
-            lines.append(f"📍 {self.location}")
+        location_line = f"\n📍 {self.location}" if self.location else ""
 
-        if self.description:
+        description = self.description
+        if description:
             # Truncate long descriptions
-            desc = self.description[:100] + "..." if len(self.description) > 100 else self.description
-            lines.append(f"📝 {desc}")
+            if len(description) > 100:
+                description = description[:100] + "..."
+            description_line = f"\n📝 {description}"
+        else:
+            description_line = ""
 
-        if self.attendees:
-            attendees_str = ", ".join(self.attendees[:3])
-            if len(self.attendees) > 3:
-                attendees_str += f" y {len(self.attendees) - 3} más"
-            lines.append(f"👥 {attendees_str}")
+        attendees = self.attendees
+        if attendees:
+            extra = len(attendees) - 3
+            more = f" y {extra} más" if extra > 0 else ""
+            attendees_line = f"\n👥 {', '.join(attendees[:3])}{more}"
+        else:
+            attendees_line = ""
+
+        return f"📅 **{self.title}**{time_line}{location_line}{description_line}{attendees_line}"
+
+
+@dataclass
+class CalendarEventBatch:
+    """
+    Column-oriented list of calendar events.
+
+    Start and end times are kept as naive UTC numpy datetime64 arrays, so a
+    list sorted by start time (as the API returns it with orderBy=startTime)
+    can be filtered with binary search instead of per-event comparisons.
+    """
+
+    ids: List[Optional[str]]
+    titles: List[str]
+    starts: np.ndarray
+    ends: np.ndarray
+    all_day: np.ndarray
 
-        return "\n".join(lines)
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_google_events(cls, items: Iterable[Dict[str, Any]]) -> 'CalendarEventBatch':
+        """Create a batch from Google Calendar API events in a single pass."""
+        ids, titles, starts, ends, all_day = [], [], [], [], []
+
+        for item in items:
+            get = item.get
+            start = get('start', {})
+            end = get('end', {})
+
+            ids.append(get('id'))
+            titles.append(get('summary', 'Sin título'))
+            if 'date' in start:
+                all_day.append(True)
+                starts.append(datetime.fromisoformat(start['date']))
+                ends.append(datetime.fromisoformat(end['date']))
+            else:
+                all_day.append(False)
+                start_dt = start.get('dateTime')
+                end_dt = end.get('dateTime')
+                starts.append(_to_utc_naive(_parse_gcal_dt(start_dt)) if start_dt else None)
+                ends.append(_to_utc_naive(_parse_gcal_dt(end_dt)) if end_dt else None)
+
+        return cls(
+            ids=ids,
+            titles=titles,
+            starts=np.array(starts, dtype='datetime64[us]'),
+            ends=np.array(ends, dtype='datetime64[us]'),
+            all_day=np.array(all_day, dtype=bool),
+        )
+
+    def filter_between(self, start: datetime, end: datetime) -> 'CalendarEventBatch':
+        """
+        Return the events starting in [start, end).
+
+        The batch must be sorted by start time.
+        """
+        lo, hi = np.searchsorted(
+            self.starts,
+            np.array([_to_utc_naive(start), _to_utc_naive(end)], dtype='datetime64[us]'),
+        )
+        return CalendarEventBatch(
+            ids=self.ids[lo:hi],
+            titles=self.titles[lo:hi],
+            starts=self.starts[lo:hi],
+            ends=self.ends[lo:hi],
+            all_day=self.all_day[lo:hi],
+        )
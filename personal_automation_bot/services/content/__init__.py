@@ -1,23 +1,38 @@
 """
 Content generation service.
 Provides functionality for generating text and images using various AI services.
-"""
 
-from personal_automation_bot.services.content.text_generator import (
-    TextGenerator,
-    HuggingFaceTextGenerator,
-    get_text_generator
-)
+Names are imported on first access, so importing a submodule such as
+generators does not load the RAG stack.
+"""
+import importlib
 
-from personal_automation_bot.services.content.rag_generator import (
-    RAGGenerator,
-    RAGResponse
-)
+# Public name -> module defining it
+_LAZY_IMPORTS = {
+    'TextGenerator': 'personal_automation_bot.services.content.text_generator',
+    'HuggingFaceTextGenerator': 'personal_automation_bot.services.content.text_generator',
+    'BatchingTextGenerator': 'personal_automation_bot.services.content.text_generator',
+    'get_text_generator': 'personal_automation_bot.services.content.text_generator',
+    'RAGGenerator': 'personal_automation_bot.services.content.rag_generator',
+    'RAGResponse': 'personal_automation_bot.services.content.rag_generator',
+}
 
 __all__ = [
     'TextGenerator',
     'HuggingFaceTextGenerator',
+    'BatchingTextGenerator',
     'get_text_generator',
     'RAGGenerator',
     'RAGResponse'
 ]
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
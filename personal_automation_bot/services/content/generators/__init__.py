@@ -1,11 +1,18 @@
 """
 Content generators for different AI services.
+
+Names are imported on first access, so importing the package does not load
+every backend.
 """
+import importlib
 
-from personal_automation_bot.services.content.generators.base import ContentGenerator
-from personal_automation_bot.services.content.generators.groq_generator import GroqGenerator
-from personal_automation_bot.services.content.generators.local_generator import LocalGenerator
-from personal_automation_bot.services.content.generators.factory import get_content_generator
+# Public name -> module defining it
+_LAZY_IMPORTS = {
+    'ContentGenerator': 'personal_automation_bot.services.content.generators.base',
+    'GroqGenerator': 'personal_automation_bot.services.content.generators.groq_generator',
+    'LocalGenerator': 'personal_automation_bot.services.content.generators.local_generator',
+    'get_content_generator': 'personal_automation_bot.services.content.generators.factory',
+}
 
 __all__ = [
     'ContentGenerator',
@@ -13,3 +20,14 @@ __all__ = [
     'LocalGenerator',
     'get_content_generator',
 ]
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,14 +1,52 @@
 """
 Base class for content generators.
 """
+import asyncio
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Default system prompt for RAG, and its chat message (shared, never modified)
+_DEFAULT_SYSTEM_PROMPT = """Eres un asistente útil que responde preguntas basándose en el contexto proporcionado.
+
+Instrucciones:
+1. Usa únicamente la información del contexto proporcionado para responder
+2. Si la información no está en el contexto, indica que no tienes suficiente información
+3. Cita las fuentes usando números entre corchetes [1], [2], etc.
+4. Sé preciso y conciso en tus respuestas
+5. Si hay múltiples fuentes que respaldan un punto, menciona todas las relevantes"""
+_DEFAULT_SYSTEM_MESSAGE = {"role": "system", "content": _DEFAULT_SYSTEM_PROMPT}
+
+# Citation markers such as "[2]" in generated content
+_CITATION_PATTERN = re.compile(r"\[(\d+)\]")
+
+def _source_line(index: int, path: str, title: Optional[str]) -> str:
+    """Format a source as "[index] path - title"."""
+    line = f"[{index}] {path}"
+    if title:
+        line += f" - {title}"
+    return line
+
+@lru_cache(maxsize=128)
+def _format_context(context: str, sources: Tuple[Tuple[str, Optional[str]], ...]) -> str:
+    """Build the prompt context block; follow-up turns usually resend the same one."""
+    formatted_parts = ["Contexto relevante:", context, "\\nFuentes:"]
+    formatted_parts.extend(
+        _source_line(i, path, title) for i, (path, title) in enumerate(sources, 1)
+    )
+    return "\\n".join(formatted_parts)
+
+@dataclass(slots=True)
 class GenerationRequest:
     """Request for content generation."""
     prompt: str
@@ -17,8 +55,10 @@ class GenerationRequest:
     temperature: Optional[float] = None
     system_prompt: Optional[str] = None
     sources: Optional[List[Dict[str, Any]]] = None
+    # Embedding of the prompt, enables similarity lookups in the response cache
+    query_embedding: Optional[List[float]] = None
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResponse:
     """Response from content generation."""
     content: str
@@ -26,6 +66,15 @@ class GenerationResponse:
     metadata: Dict[str, Any]
     citations: List[str]
 
+def _copy_response(response: GenerationResponse) -> GenerationResponse:
+    """Copy a cached response so callers can modify it without touching the cache."""
+    return replace(
+        response,
+        sources_used=[dict(source) for source in response.sources_used],
+        metadata=dict(response.metadata),
+        citations=list(response.citations)
+    )
+
 class ContentGenerator(ABC):
     """Base class for content generators."""
 
@@ -39,6 +88,19 @@ class ContentGenerator(ABC):
         self.config = config or {}
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        # Response cache: only requests at or below this temperature are cached
+        self.cache_temperature_max = self.config.get('cache_temperature_max', 0.0)
+        self.response_cache_ttl = self.config.get('response_cache_ttl', 3600)
+        self.response_cache_size = self.config.get('response_cache_size', 256)
+        self.response_cache_threshold = self.config.get('response_cache_threshold', 0.92)
+        self.response_cache_scopes = self.config.get('response_cache_scopes', 64)
+
+        # Exact key -> (stored at, response), oldest first
+        self._response_cache: "OrderedDict[str, Tuple[float, GenerationResponse]]" = OrderedDict()
+        # Scope key -> SemanticCache of (stored at, response), oldest first
+        self._semantic_caches: "OrderedDict[str, Any]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+
     @abstractmethod
     def generate(self, request: GenerationRequest) -> GenerationResponse:
         """
@@ -52,6 +114,37 @@ class ContentGenerator(ABC):
         """
         pass
 
+    async def agenerate(self, request: GenerationRequest) -> GenerationResponse:
+        """
+        Generate content without blocking the event loop.
+
+        Runs generate() in a worker thread; generators with an async client
+        override this.
+
+        Args:
+            request: Generation request
+
+        Returns:
+            Generation response
+        """
+        return await asyncio.to_thread(self.generate, request)
+
+    async def astream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """
+        Stream generated content as it becomes available.
+
+        Generators without streaming support yield the whole content at once.
+        Citations can be taken from the joined text with extract_citations().
+
+        Args:
+            request: Generation request
+
+        Yields:
+            Chunks of generated text
+        """
+        response = await self.agenerate(request)
+        yield response.content
+
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -62,6 +155,95 @@ class ContentGenerator(ABC):
         """
         pass
 
+    def _response_cache_keys(self, request: GenerationRequest) -> Optional[Tuple[str, str]]:
+        """
+        Get the cache keys for a request.
+
+        Returns:
+            (scope key, exact key), or None if the request is not cacheable.
+            The scope covers everything but the prompt; the exact key adds it.
+        """
+        temperature = request.temperature
+        if temperature is None:
+            temperature = getattr(self, 'temperature', 0.0)
+        if temperature > self.cache_temperature_max:
+            return None
+
+        scope = json.dumps(
+            [self.__class__.__name__, self.config.get('model'), request.system_prompt,
+             request.context, request.sources, request.max_tokens, temperature],
+            sort_keys=True,
+            default=str
+        )
+        scope_key = hashlib.sha256(scope.encode('utf-8')).hexdigest()
+        exact_key = hashlib.sha256(f"{scope_key}\0{request.prompt}".encode('utf-8')).hexdigest()
+        return scope_key, exact_key
+
+    def _get_cached_response(self, request: GenerationRequest) -> Optional[GenerationResponse]:
+        """
+        Look up a previous response for the same or a similar request.
+
+        Exact matches are checked first; if the request carries a query
+        embedding, a similar prompt with the same scope also counts.
+        """
+        keys = self._response_cache_keys(request)
+        if keys is None:
+            return None
+        scope_key, exact_key = keys
+        now = time.monotonic()
+
+        with self._response_cache_lock:
+            cached = self._response_cache.get(exact_key)
+            if cached is not None:
+                if now - cached[0] < self.response_cache_ttl:
+                    self._response_cache.move_to_end(exact_key)
+                    return _copy_response(cached[1])
+                del self._response_cache[exact_key]
+
+            semantic_cache = self._semantic_caches.get(scope_key)
+            if request.query_embedding is not None and semantic_cache is not None:
+                self._semantic_caches.move_to_end(scope_key)
+                # An expired entry is replaced when the fresh response is cached
+                entry = semantic_cache.get(request.query_embedding)
+                if entry is not None and now - entry[0] < self.response_cache_ttl:
+                    return _copy_response(entry[1])
+
+        return None
+
+    def _cache_response(self, request: GenerationRequest, response: GenerationResponse):
+        """Store a response for later identical or similar requests."""
+        keys = self._response_cache_keys(request)
+        if keys is None:
+            return
+        scope_key, exact_key = keys
+        now = time.monotonic()
+        response = _copy_response(response)
+
+        with self._response_cache_lock:
+            self._response_cache[exact_key] = (now, response)
+            self._response_cache.move_to_end(exact_key)
+            while len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+            if request.query_embedding is not None:
+                semantic_cache = self._semantic_caches.get(scope_key)
+                if semantic_cache is None:
+                    from personal_automation_bot.services.rag.semantic_cache import SemanticCache
+                    semantic_cache = SemanticCache(
+                        self.response_cache_threshold, self.response_cache_size
+                    )
+                    self._semantic_caches[scope_key] = semantic_cache
+                    while len(self._semantic_caches) > self.response_cache_scopes:
+                        self._semantic_caches.popitem(last=False)
+                else:
+                    self._semantic_caches.move_to_end(scope_key)
+                semantic_cache.put(request.query_embedding, (now, response))
+
+    @staticmethod
+    def _format_source_line(index: int, source: Dict[str, Any]) -> str:
+        """Format a source as "[index] source - title" for context and citations."""
+        return _source_line(index, source.get('source', 'Fuente desconocida'), source.get('title'))
+
     def format_context(self, context: str, sources: List[Dict[str, Any]]) -> str:
         """
         Format context with sources for the prompt.
@@ -76,18 +258,10 @@ class ContentGenerator(ABC):
         if not context or not sources:
             return context or ""
 
-        formatted_parts = []
-        formatted_parts.append("Contexto relevante:")
-        formatted_parts.append(context)
-        formatted_parts.append("\\nFuentes:")
-
-        for i, source in enumerate(sources, 1):
-            source_info = f"[{i}] {source.get('source', 'Fuente desconocida')}"
-            if source.get('title'):
-                source_info += f" - {source['title']}"
-            formatted_parts.append(source_info)
-
-        return "\\n".join(formatted_parts)
+        return _format_context(
+            context,
+            tuple((source.get('source', 'Fuente desconocida'), source.get('title')) for source in sources)
+        )
 
     def extract_citations(self, content: str, sources: List[Dict[str, Any]]) -> List[str]:
         """
@@ -100,13 +274,65 @@ class ContentGenerator(ABC):
         Returns:
             List of citations
         """
-        citations = []
-        for i, source in enumerate(sources, 1):
-            # Look for references to this source in the content
-            if f"[{i}]" in content or str(i) in content:
-                citation = f"[{i}] {source.get('source', 'Fuente desconocida')}"
-                if source.get('title'):
-                    citation += f" - {source['title']}"
-                citations.append(citation)
+        cited = {int(number) for number in _CITATION_PATTERN.findall(content)}
+
+        return [
+            self._format_source_line(i, sources[i - 1])
+            for i in sorted(cited)
+            if 1 <= i <= len(sources)
+        ]
+
+    def _get_default_system_prompt(self) -> str:
+        """Get default system prompt for RAG."""
+        return _DEFAULT_SYSTEM_PROMPT
+
+class ChatCompletionGenerator(ContentGenerator):
+    """
+    Base class for generators backed by an OpenAI-compatible chat completions API.
+
+    Subclasses set model, max_tokens and temperature.
+    """
+
+    def _completion_kwargs(self, request: GenerationRequest) -> Dict[str, Any]:
+        """Build the chat completion arguments for a request."""
+        # Format user prompt with context
+        user_prompt = request.prompt
+        if request.context and request.sources:
+            formatted_context = self.format_context(request.context, request.sources)
+            user_prompt = f"{formatted_context}\\n\\nPregunta: {request.prompt}"
+
+        system_message = (
+            {"role": "system", "content": request.system_prompt}
+            if request.system_prompt else _DEFAULT_SYSTEM_MESSAGE
+        )
+        messages = [system_message, {"role": "user", "content": user_prompt}]
+
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": request.max_tokens or self.max_tokens,
+            "temperature": self.temperature if request.temperature is None else request.temperature
+        }
+
+    def _build_response(self, request: GenerationRequest, response) -> GenerationResponse:
+        """Convert a chat completion into a generation response."""
+        # Extract content
+        content = response.choices[0].message.content
+
+        # Extract citations
+        sources_used = request.sources or []
+        citations = self.extract_citations(content, sources_used)
+
+        # Prepare metadata
+        metadata = {
+            "model": self.model,
+            "tokens_used": response.usage.total_tokens if response.usage else 0,
+            "finish_reason": response.choices[0].finish_reason
+        }
 
-        return citations
+        return GenerationResponse(
+            content=content,
+            sources_used=sources_used,
+            metadata=metadata,
+            citations=citations
+        )
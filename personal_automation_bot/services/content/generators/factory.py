@@ -1,16 +1,58 @@
 """
 Factory for content generators.
 """
+import importlib
 import os
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple, Type
 
 from personal_automation_bot.services.content.generators.base import ContentGenerator
-from personal_automation_bot.services.content.generators.groq_generator import GroqGenerator
-from personal_automation_bot.services.content.generators.local_generator import LocalGenerator
 
 logger = logging.getLogger(__name__)
 
+# Generator type -> (module, class name); a module is only imported when used
+_PROVIDERS = {
+    'groq': ('personal_automation_bot.services.content.generators.groq_generator', 'GroqGenerator'),
+    'openai': ('personal_automation_bot.services.content.generators.openai_generator', 'OpenAIGenerator'),
+    'local': ('personal_automation_bot.services.content.generators.local_generator', 'LocalGenerator'),
+}
+
+# API-backed generators tried by auto-detection, in priority order, with the
+# environment variable holding their API key
+_AUTO_DETECT_ORDER = (
+    ('groq', 'GROQ_API_KEY'),
+    ('openai', 'OPENAI_API_KEY'),
+)
+
+# Seconds get_available_generators() reuses its last result
+AVAILABILITY_TTL = 60
+
+# Generators already built, keyed by (generator_type, frozen config)
+_generator_cache: Dict[Tuple, ContentGenerator] = {}
+
+# (checked at, availability) from the last get_available_generators() call
+_availability_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+
+def _freeze(value: Any) -> Any:
+    """Convert a configuration value into a hashable equivalent."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _load_generator_class(generator_type: str) -> Type[ContentGenerator]:
+    """Import and return the generator class registered for a type."""
+    module_name, class_name = _PROVIDERS[generator_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def invalidate_generator_cache():
+    """Forget cached generators and availability, e.g. after changing API keys."""
+    global _availability_cache
+    _generator_cache.clear()
+    _availability_cache = None
+
 def get_content_generator(
     generator_type: Optional[str] = None,
     config: Optional[Dict[str, Any]] = None
@@ -18,46 +60,73 @@ def get_content_generator(
     """
     Get an appropriate content generator.
 
+    Generators are built once per (generator_type, config) and reused, so
+    clients and loaded models are shared across requests. A fallback built
+    because the requested type is unavailable is not reused.
+
     Args:
-        generator_type: Type of generator ('groq', 'local', or None for auto-detect)
+        generator_type: Type of generator ('groq', 'openai', 'local', or None for auto-detect)
         config: Configuration dictionary
 
     Returns:
         Content generator instance
     """
+    try:
+        cache_key = (generator_type, _freeze(config or {}))
+        hash(cache_key)
+    except TypeError:
+        # Unhashable config values: build a fresh generator every time
+        return _create_content_generator(generator_type, config)
+
+    generator = _generator_cache.get(cache_key)
+    if generator is None:
+        generator = _create_content_generator(generator_type, config)
+        # A fallback for an unavailable requested type is not kept, so the
+        # requested generator is picked up once it becomes available
+        if generator_type not in _PROVIDERS or type(generator).__name__ == _PROVIDERS[generator_type][1]:
+            _generator_cache[cache_key] = generator
+    return generator
+
+def _create_content_generator(
+    generator_type: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None
+) -> ContentGenerator:
+    """Build the content generator get_content_generator() returns."""
     config = config or {}
 
     # If type is specified, try to create that specific generator
-    if generator_type == 'groq':
-        generator = GroqGenerator(config)
+    if generator_type == 'local':
+        generator = _load_generator_class('local')(config)
+        logger.info("Using local generator")
+        return generator
+
+    elif generator_type in _PROVIDERS:
+        generator = _load_generator_class(generator_type)(config)
         if generator.is_available():
-            logger.info("Using Groq generator")
+            logger.info(f"Using {generator_type} generator")
             return generator
         else:
-            logger.warning("Groq generator requested but not available, falling back to local")
-
-    elif generator_type == 'local':
-        generator = LocalGenerator(config)
-        logger.info("Using local generator")
-        return generator
+            logger.warning(f"{generator_type} generator requested but not available, falling back to auto-detection")
 
     # Auto-detect best available generator
     logger.info("Auto-detecting best available content generator")
 
-    # Try Groq first (if API key is available)
-    if os.getenv('GROQ_API_KEY') or config.get('groq', {}).get('api_key'):
-        groq_config = config.get('groq', {})
-        if not groq_config.get('api_key'):
-            groq_config['api_key'] = os.getenv('GROQ_API_KEY')
+    # Try API-backed generators whose key is configured
+    for provider, api_key_env in _AUTO_DETECT_ORDER:
+        provider_config = dict(config.get(provider, {}))
+        if not provider_config.get('api_key'):
+            provider_config['api_key'] = os.getenv(api_key_env)
+        if not provider_config['api_key']:
+            continue
 
-        generator = GroqGenerator(groq_config)
+        generator = _load_generator_class(provider)(provider_config)
         if generator.is_available():
-            logger.info("Auto-selected Groq generator")
+            logger.info(f"Auto-selected {provider} generator")
             return generator
 
     # Fall back to local generator
     local_config = config.get('local', {})
-    generator = LocalGenerator(local_config)
+    generator = _load_generator_class('local')(local_config)
     logger.info("Auto-selected local generator")
     return generator
 
@@ -65,17 +134,20 @@ def get_available_generators() -> Dict[str, bool]:
     """
     Get information about available generators.
 
+    The result is reused for AVAILABILITY_TTL seconds.
+
     Returns:
         Dictionary with generator availability
     """
-    availability = {}
-
-    # Check Groq
-    groq_gen = GroqGenerator()
-    availability['groq'] = groq_gen.is_available()
-
-    # Check local
-    local_gen = LocalGenerator()
-    availability['local'] = local_gen.is_available()
-
-    return availability
+    global _availability_cache
+    now = time.monotonic()
+    if _availability_cache is not None and now - _availability_cache[0] < AVAILABILITY_TTL:
+        return dict(_availability_cache[1])
+
+    availability = {
+        generator_type: _load_generator_class(generator_type)({}).is_available()
+        for generator_type in _PROVIDERS
+    }
+
+    _availability_cache = (now, availability)
+    return dict(availability)
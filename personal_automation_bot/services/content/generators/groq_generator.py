@@ -3,17 +3,24 @@ Groq content generator.
 """
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+try:
+    import groq
+    import httpx
+    GROQ_AVAILABLE = True
+except ImportError:
+    GROQ_AVAILABLE = False
 
 from personal_automation_bot.services.content.generators.base import (
-    ContentGenerator,
+    ChatCompletionGenerator,
     GenerationRequest,
     GenerationResponse
 )
 
 logger = logging.getLogger(__name__)
 
-class GroqGenerator(ContentGenerator):
+class GroqGenerator(ChatCompletionGenerator):
     """Content generator using Groq API."""
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -24,6 +31,8 @@ class GroqGenerator(ContentGenerator):
             config: Configuration dictionary with API key and settings
         """
         super().__init__(config)
+        self.client = None
+        self.async_client = None
 
         # Check if Groq is available
         self.has_groq = self._check_groq()
@@ -33,6 +42,8 @@ class GroqGenerator(ContentGenerator):
             self.model = config.get('model', 'llama3-70b-8192')
             self.max_tokens = config.get('max_tokens', 1000)
             self.temperature = config.get('temperature', 0.7)
+            # The SDK retries 429/5xx responses itself, with exponential backoff
+            self.max_retries = config.get('max_retries', 5)
 
             if self.api_key:
                 self._initialize_client()
@@ -41,11 +52,7 @@ class GroqGenerator(ContentGenerator):
 
     def _check_groq(self) -> bool:
         """Check if Groq library is available."""
-        try:
-            import groq
-            return True
-        except ImportError:
-            return False
+        return GROQ_AVAILABLE
 
     def _initialize_client(self):
         """Initialize Groq client."""
@@ -53,19 +60,27 @@ class GroqGenerator(ContentGenerator):
             return
 
         try:
-            import groq
-            self.client = groq.Client(api_key=self.api_key)
+            self.client = groq.Client(api_key=self.api_key, max_retries=self.max_retries)
+            # Pooled keep-alive connections shared by concurrent agenerate() calls
+            self.async_client = groq.AsyncGroq(
+                api_key=self.api_key,
+                max_retries=self.max_retries,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                    timeout=30.0
+                )
+            )
             logger.info("Groq client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
             self.client = None
+            self.async_client = None
 
     def is_available(self) -> bool:
         """Check if Groq generator is available."""
         return (
             self.has_groq and
             self.api_key is not None and
-            hasattr(self, 'client') and
             self.client is not None
         )
 
@@ -82,62 +97,74 @@ class GroqGenerator(ContentGenerator):
         if not self.is_available():
             raise ValueError("Groq generator is not available")
 
-        # Prepare messages
-        messages = []
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
 
-        # Add system prompt
-        system_prompt = request.system_prompt or self._get_default_system_prompt()
-        messages.append({"role": "system", "content": system_prompt})
+        try:
+            response = self.client.chat.completions.create(**self._completion_kwargs(request))
+            generation_response = self._build_response(request, response)
+            self._cache_response(request, generation_response)
+            return generation_response
 
-        # Format user prompt with context
-        user_prompt = request.prompt
-        if request.context and request.sources:
-            formatted_context = self.format_context(request.context, request.sources)
-            user_prompt = f"{formatted_context}\\n\\nPregunta: {request.prompt}"
+        except Exception as e:
+            logger.error(f"Error generating content with Groq: {e}")
+            raise
 
-        messages.append({"role": "user", "content": user_prompt})
+    async def agenerate(self, request: GenerationRequest) -> GenerationResponse:
+        """
+        Generate content using Groq API without blocking the event loop.
 
-        try:
-            # Make API call
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=request.max_tokens or self.max_tokens,
-                temperature=request.temperature or self.temperature
-            )
+        Args:
+            request: Generation request
 
-            # Extract content
-            content = response.choices[0].message.content
-
-            # Extract citations
-            sources_used = request.sources or []
-            citations = self.extract_citations(content, sources_used)
-
-            # Prepare metadata
-            metadata = {
-                "model": self.model,
-                "tokens_used": response.usage.total_tokens if hasattr(response, 'usage') else 0,
-                "finish_reason": response.choices[0].finish_reason if hasattr(response.choices[0], 'finish_reason') else None
-            }
-
-            return GenerationResponse(
-                content=content,
-                sources_used=sources_used,
-                metadata=metadata,
-                citations=citations
-            )
+        Returns:
+            Generation response
+        """
+        if not self.is_available() or self.async_client is None:
+            raise ValueError("Groq generator is not available")
+
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.async_client.chat.completions.create(**self._completion_kwargs(request))
+            generation_response = self._build_response(request, response)
+            self._cache_response(request, generation_response)
+            return generation_response
 
         except Exception as e:
             logger.error(f"Error generating content with Groq: {e}")
             raise
 
-    def _get_default_system_prompt(self) -> str:
-        """Get default system prompt for RAG."""
-        return """Eres un asistente útil que responde preguntas basándose en el contexto proporcionado.
+    async def astream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """
+        Stream content from Groq API as it is generated.
 
-Instrucciones:
-1. Usa únicamente la información del contexto proporcionado para responder
-2. Si la información no está en el contexto, indica que no tienes suficiente información
-3. Cita las fuentes usando números entre corchetes [1], [2], etc.
-4. Sé preciso y conciso en tus respuestas
-5. Si hay múltiples fuentes que respaldan un punto, menciona todas las relevantes"""
+        Args:
+            request: Generation request
+
+        Yields:
+            Chunks of generated text
+        """
+        if not self.is_available() or self.async_client is None:
+            raise ValueError("Groq generator is not available")
+
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            yield cached.content
+            return
+
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **self._completion_kwargs(request),
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error(f"Error streaming content with Groq: {e}")
+            raise
@@ -1,10 +1,33 @@
 """
 Local content generator using free/local models.
 """
+import json
 import logging
 import re
 from typing import Dict, Any, List, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+try:
+    import bitsandbytes  # noqa: F401
+    BITSANDBYTES_AVAILABLE = True
+except ImportError:
+    BITSANDBYTES_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 from personal_automation_bot.services.content.generators.base import (
     ContentGenerator,
     GenerationRequest,
@@ -13,6 +36,29 @@ from personal_automation_bot.services.content.generators.base import (
 
 logger = logging.getLogger(__name__)
 
+OLLAMA_URL = 'http://localhost:11434'
+
+# Pooled keep-alive connections to the local Ollama server
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Async counterpart used by agenerate(), created on first use
+_ollama_async_client = None
+
+def _get_ollama_async_client():
+    """Get the shared async HTTP client for the Ollama server."""
+    global _ollama_async_client
+    if _ollama_async_client is None:
+        _ollama_async_client = httpx.AsyncClient(
+            base_url=OLLAMA_URL,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _ollama_async_client
+
+# Sentence delimiters used by the extractive summary
+_SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+
 class LocalGenerator(ContentGenerator):
     """Content generator using local/free models."""
 
@@ -24,6 +70,8 @@ class LocalGenerator(ContentGenerator):
             config: Configuration dictionary
         """
         super().__init__(config)
+        self.tokenizer = None
+        self.model = None
 
         # Check available local models
         self.has_transformers = self._check_transformers()
@@ -33,6 +81,16 @@ class LocalGenerator(ContentGenerator):
         self.model_name = config.get('model_name', 'microsoft/DialoGPT-medium')
         self.max_length = config.get('max_length', 500)
         self.temperature = config.get('temperature', 0.7)
+        # torch.compile the model; slow first generations, faster afterwards
+        self.compile_model = config.get('compile_model', False)
+        # Load weights quantized with bitsandbytes: '8bit', '4bit' or None
+        self.quantization = config.get('quantization')
+
+        if self.has_ollama:
+            logger.info(
+                "Ollama server found; set OLLAMA_NUM_PARALLEL (e.g. 4) and "
+                "OLLAMA_MAX_LOADED_MODELS on it to serve concurrent requests"
+            )
 
         # Initialize model if available
         if self.has_transformers:
@@ -40,19 +98,13 @@ class LocalGenerator(ContentGenerator):
 
     def _check_transformers(self) -> bool:
         """Check if transformers library is available."""
-        try:
-            import transformers
-            import torch
-            return True
-        except ImportError:
-            return False
+        return TRANSFORMERS_AVAILABLE
 
     def _check_ollama(self) -> bool:
         """Check if Ollama is available."""
         try:
-            import requests
             # Try to ping Ollama API
-            response = requests.get('http://localhost:11434/api/tags', timeout=2)
+            response = _OLLAMA_SESSION.get(f'{OLLAMA_URL}/api/tags', timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -63,30 +115,62 @@ class LocalGenerator(ContentGenerator):
             return
 
         try:
-            from transformers import AutoTokenizer, AutoModelForCausalLM
-            import torch
-
             # Use a smaller, free model for text generation
             model_name = "microsoft/DialoGPT-small"  # Smaller model for better performance
 
+            # Half precision on GPU; CPUs mostly lack fast fp16/bf16 kernels
+            self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            dtype = torch.float16 if self.device == 'cuda' else torch.float32
+
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(model_name)
+            quantization_config = self._get_quantization_config()
+            if quantization_config is not None:
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    model_name, quantization_config=quantization_config, device_map='auto'
+                )
+            else:
+                self.model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=dtype).to(self.device)
+            self.model.eval()
+            if self.compile_model:
+                self.model = torch.compile(self.model, mode='reduce-overhead')
 
             # Add padding token if not present
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
 
-            logger.info(f"Initialized local model: {model_name}")
+            logger.info(f"Initialized local model: {model_name} on {self.device}")
 
         except Exception as e:
             logger.error(f"Failed to initialize transformers model: {e}")
             self.tokenizer = None
             self.model = None
 
+    def _get_quantization_config(self) -> Optional['BitsAndBytesConfig']:
+        """Get the bitsandbytes config for the configured quantization, if usable."""
+        if not self.quantization:
+            return None
+        if self.device != 'cuda' or not BITSANDBYTES_AVAILABLE:
+            logger.warning(
+                f"Ignoring quantization={self.quantization!r}: it needs a CUDA device and bitsandbytes"
+            )
+            return None
+
+        if self.quantization == '4bit':
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type='nf4',
+                bnb_4bit_compute_dtype=torch.float16
+            )
+        if self.quantization == '8bit':
+            return BitsAndBytesConfig(load_in_8bit=True)
+
+        logger.warning(f"Unknown quantization {self.quantization!r}, loading unquantized model")
+        return None
+
     def is_available(self) -> bool:
         """Check if local generator is available."""
         return (
-            (self.has_transformers and hasattr(self, 'model') and self.model is not None) or
+            (self.has_transformers and self.model is not None) or
             self.has_ollama
         )
 
@@ -104,46 +188,111 @@ class LocalGenerator(ContentGenerator):
             # Fallback to template-based generation
             return self._generate_template_based(request)
 
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
+
         if self.has_ollama:
-            return self._generate_with_ollama(request)
-        elif self.has_transformers and hasattr(self, 'model') and self.model is not None:
-            return self._generate_with_transformers(request)
+            response = self._generate_with_ollama(request)
+        elif self.has_transformers and self.model is not None:
+            response = self._generate_with_transformers(request)
         else:
             return self._generate_template_based(request)
 
+        # Template answers are fallbacks after a model error; don't keep them
+        if response.metadata.get('model') != 'template-based':
+            self._cache_response(request, response)
+        return response
+
+    async def agenerate(self, request: GenerationRequest) -> GenerationResponse:
+        """
+        Generate content without blocking the event loop.
+
+        Ollama requests are sent with an async HTTP client, so concurrent
+        calls overlap; other backends run in a worker thread.
+
+        Args:
+            request: Generation request
+
+        Returns:
+            Generation response
+        """
+        if not (self.has_ollama and HTTPX_AVAILABLE):
+            return await super().agenerate(request)
+
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
+
+        response = await self._agenerate_with_ollama(request)
+        if response.metadata.get('model') != 'template-based':
+            self._cache_response(request, response)
+        return response
+
+    async def _agenerate_with_ollama(self, request: GenerationRequest) -> GenerationResponse:
+        """Generate content using Ollama without blocking."""
+        try:
+            response = await _get_ollama_async_client().post(
+                '/api/generate',
+                json={
+                    'model': 'llama2',  # Default model
+                    'prompt': self._prepare_prompt(request),
+                    'stream': False
+                }
+            )
+
+            if response.status_code == 200:
+                return self._ollama_response(request, response.json().get('response', ''))
+            else:
+                raise Exception(f"Ollama API error: {response.status_code}")
+
+        except Exception as e:
+            logger.error(f"Error with Ollama generation: {e}")
+            return self._generate_template_based(request)
+
+    def _ollama_response(self, request: GenerationRequest, content: str) -> GenerationResponse:
+        """Wrap Ollama output in a generation response."""
+        # Extract citations
+        sources_used = request.sources or []
+        citations = self.extract_citations(content, sources_used)
+
+        return GenerationResponse(
+            content=content,
+            sources_used=sources_used,
+            metadata={'model': 'ollama-llama2'},
+            citations=citations
+        )
+
     def _generate_with_ollama(self, request: GenerationRequest) -> GenerationResponse:
         """Generate content using Ollama."""
         try:
-            import requests
-
             # Prepare prompt
             prompt = self._prepare_prompt(request)
 
-            # Make request to Ollama
-            response = requests.post(
-                'http://localhost:11434/api/generate',
+            # Make request to Ollama; streamed, so the timeout applies between
+            # chunks rather than to the whole generation
+            response = _OLLAMA_SESSION.post(
+                f'{OLLAMA_URL}/api/generate',
                 json={
                     'model': 'llama2',  # Default model
                     'prompt': prompt,
-                    'stream': False
+                    'stream': True
                 },
-                timeout=30
+                timeout=30,
+                stream=True
             )
 
             if response.status_code == 200:
-                result = response.json()
-                content = result.get('response', '')
-
-                # Extract citations
-                sources_used = request.sources or []
-                citations = self.extract_citations(content, sources_used)
-
-                return GenerationResponse(
-                    content=content,
-                    sources_used=sources_used,
-                    metadata={'model': 'ollama-llama2'},
-                    citations=citations
-                )
+                chunks = []
+                with response:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        result = json.loads(line)
+                        chunks.append(result.get('response', ''))
+                        if result.get('done'):
+                            break
+                return self._ollama_response(request, ''.join(chunks))
             else:
                 raise Exception(f"Ollama API error: {response.status_code}")
 
@@ -154,29 +303,30 @@ class LocalGenerator(ContentGenerator):
     def _generate_with_transformers(self, request: GenerationRequest) -> GenerationResponse:
         """Generate content using transformers."""
         try:
-            import torch
-
             # Prepare prompt
             prompt = self._prepare_prompt(request)
 
             # Tokenize
-            inputs = self.tokenizer.encode(prompt, return_tensors='pt', max_length=512, truncation=True)
+            inputs = self.tokenizer.encode(
+                prompt, return_tensors='pt', max_length=512, truncation=True
+            ).to(self.device)
 
             # Generate
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.model.generate(
                     inputs,
                     max_length=inputs.shape[1] + self.max_length,
                     temperature=self.temperature,
                     do_sample=True,
+                    num_beams=1,
+                    use_cache=True,
                     pad_token_id=self.tokenizer.eos_token_id
                 )
 
-            # Decode
-            generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-
-            # Extract only the new content (remove the prompt)
-            content = generated_text[len(prompt):].strip()
+            # Decode only the newly generated tokens, not the prompt
+            content = self.tokenizer.decode(
+                outputs[0, inputs.shape[1]:], skip_special_tokens=True
+            ).strip()
 
             # Extract citations
             sources_used = request.sources or []
@@ -202,19 +352,24 @@ class LocalGenerator(ContentGenerator):
             # Extract key information from context
             context_summary = self._summarize_context(request.context)
 
-            content = f"Basándome en la información proporcionada:\\n\\n{context_summary}\\n\\n"
-            content += f"En respuesta a tu pregunta: {request.prompt}\\n\\n"
-            content += "La información disponible sugiere que este tema está relacionado con los documentos proporcionados. "
-            content += "Para obtener una respuesta más detallada, recomiendo revisar las fuentes citadas."
-
             # Add source references
-            if request.sources:
-                content += "\\n\\nFuentes consultadas:\\n"
-                for i, source in enumerate(request.sources, 1):
-                    content += f"[{i}] {source.get('source', 'Fuente desconocida')}\\n"
+            source_lines = "".join(
+                f"[{i}] {source.get('source', 'Fuente desconocida')}\\n"
+                for i, source in enumerate(request.sources, 1)
+            )
+
+            content = (
+                f"Basándome en la información proporcionada:\\n\\n{context_summary}\\n\\n"
+                f"En respuesta a tu pregunta: {request.prompt}\\n\\n"
+                "La información disponible sugiere que este tema está relacionado con los documentos proporcionados. "
+                "Para obtener una respuesta más detallada, recomiendo revisar las fuentes citadas."
+                f"\\n\\nFuentes consultadas:\\n{source_lines}"
+            )
         else:
-            content = f"Para responder a tu pregunta '{request.prompt}', necesitaría más contexto o información específica. "
-            content += "Por favor, proporciona más detalles o documentos relevantes."
+            content = (
+                f"Para responder a tu pregunta '{request.prompt}', necesitaría más contexto o información específica. "
+                "Por favor, proporciona más detalles o documentos relevantes."
+            )
 
         # Extract citations
         sources_used = request.sources or []
@@ -243,10 +398,20 @@ class LocalGenerator(ContentGenerator):
 
     def _summarize_context(self, context: str, max_sentences: int = 3) -> str:
         """Summarize context to key points."""
-        # Simple extractive summarization
-        sentences = re.split(r'[.!?]+', context)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Simple extractive summarization: take the first few sentences,
+        # scanning only as far into the context as needed
+        summary_sentences = []
+        start = 0
+        for match in _SENTENCE_END_PATTERN.finditer(context):
+            if len(summary_sentences) == max_sentences:
+                break
+            sentence = context[start:match.start()].strip()
+            if sentence:
+                summary_sentences.append(sentence)
+            start = match.end()
+        else:
+            sentence = context[start:].strip()
+            if sentence and len(summary_sentences) < max_sentences:
+                summary_sentences.append(sentence)
 
-        # Take first few sentences as summary
-        summary_sentences = sentences[:max_sentences]
         return '. '.join(summary_sentences) + '.' if summary_sentences else context[:200] + '...'
@@ -3,17 +3,24 @@ OpenAI content generator.
 """
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+try:
+    import openai
+    import httpx
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
 
 from personal_automation_bot.services.content.generators.base import (
-    ContentGenerator,
+    ChatCompletionGenerator,
     GenerationRequest,
     GenerationResponse
 )
 
 logger = logging.getLogger(__name__)
 
-class OpenAIGenerator(ContentGenerator):
+class OpenAIGenerator(ChatCompletionGenerator):
     """Content generator using OpenAI API."""
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -24,6 +31,8 @@ class OpenAIGenerator(ContentGenerator):
             config: Configuration dictionary with API key and settings
         """
         super().__init__(config)
+        self.client = None
+        self.async_client = None
 
         # Check if OpenAI is available
         self.has_openai = self._check_openai()
@@ -33,6 +42,8 @@ class OpenAIGenerator(ContentGenerator):
             self.model = config.get('model', 'gpt-3.5-turbo')
             self.max_tokens = config.get('max_tokens', 1000)
             self.temperature = config.get('temperature', 0.7)
+            # The SDK retries 429/5xx responses itself, with exponential backoff
+            self.max_retries = config.get('max_retries', 5)
 
             if self.api_key:
                 self._initialize_client()
@@ -41,11 +52,7 @@ class OpenAIGenerator(ContentGenerator):
 
     def _check_openai(self) -> bool:
         """Check if OpenAI library is available."""
-        try:
-            import openai
-            return True
-        except ImportError:
-            return False
+        return OPENAI_AVAILABLE
 
     def _initialize_client(self):
         """Initialize OpenAI client."""
@@ -53,19 +60,27 @@ class OpenAIGenerator(ContentGenerator):
             return
 
         try:
-            import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self.client = openai.OpenAI(api_key=self.api_key, max_retries=self.max_retries)
+            # Pooled keep-alive connections shared by concurrent agenerate() calls
+            self.async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=self.max_retries,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                    timeout=30.0
+                )
+            )
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             self.client = None
+            self.async_client = None
 
     def is_available(self) -> bool:
         """Check if OpenAI generator is available."""
         return (
             self.has_openai and
             self.api_key is not None and
-            hasattr(self, 'client') and
             self.client is not None
         )
 
@@ -82,62 +97,74 @@ class OpenAIGenerator(ContentGenerator):
         if not self.is_available():
             raise ValueError("OpenAI generator is not available")
 
-        # Prepare messages
-        messages = []
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
 
-        # Add system prompt
-        system_prompt = request.system_prompt or self._get_default_system_prompt()
-        messages.append({"role": "system", "content": system_prompt})
+        try:
+            response = self.client.chat.completions.create(**self._completion_kwargs(request))
+            generation_response = self._build_response(request, response)
+            self._cache_response(request, generation_response)
+            return generation_response
 
-        # Format user prompt with context
-        user_prompt = request.prompt
-        if request.context and request.sources:
-            formatted_context = self.format_context(request.context, request.sources)
-            user_prompt = f"{formatted_context}\\n\\nPregunta: {request.prompt}"
+        except Exception as e:
+            logger.error(f"Error generating content with OpenAI: {e}")
+            raise
 
-        messages.append({"role": "user", "content": user_prompt})
+    async def agenerate(self, request: GenerationRequest) -> GenerationResponse:
+        """
+        Generate content using OpenAI API without blocking the event loop.
 
-        try:
-            # Make API call
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=request.max_tokens or self.max_tokens,
-                temperature=request.temperature or self.temperature
-            )
+        Args:
+            request: Generation request
 
-            # Extract content
-            content = response.choices[0].message.content
-
-            # Extract citations
-            sources_used = request.sources or []
-            citations = self.extract_citations(content, sources_used)
-
-            # Prepare metadata
-            metadata = {
-                "model": self.model,
-                "tokens_used": response.usage.total_tokens if response.usage else 0,
-                "finish_reason": response.choices[0].finish_reason
-            }
-
-            return GenerationResponse(
-                content=content,
-                sources_used=sources_used,
-                metadata=metadata,
-                citations=citations
-            )
+        Returns:
+            Generation response
+        """
+        if not self.is_available() or self.async_client is None:
+            raise ValueError("OpenAI generator is not available")
+
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.async_client.chat.completions.create(**self._completion_kwargs(request))
+            generation_response = self._build_response(request, response)
+            self._cache_response(request, generation_response)
+            return generation_response
 
         except Exception as e:
             logger.error(f"Error generating content with OpenAI: {e}")
             raise
 
-    def _get_default_system_prompt(self) -> str:
-        """Get default system prompt for RAG."""
-        return """Eres un asistente útil que responde preguntas basándose en el contexto proporcionado.
+    async def astream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """
+        Stream content from OpenAI API as it is generated.
 
-Instrucciones:
-1. Usa únicamente la información del contexto proporcionado para responder
-2. Si la información no está en el contexto, indica que no tienes suficiente información
-3. Cita las fuentes usando números entre corchetes [1], [2], etc.
-4. Sé preciso y conciso en tus respuestas
-5. Si hay múltiples fuentes que respaldan un punto, menciona todas las relevantes"""
+        Args:
+            request: Generation request
+
+        Yields:
+            Chunks of generated text
+        """
+        if not self.is_available() or self.async_client is None:
+            raise ValueError("OpenAI generator is not available")
+
+        cached = self._get_cached_response(request)
+        if cached is not None:
+            yield cached.content
+            return
+
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **self._completion_kwargs(request),
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error(f"Error streaming content with OpenAI: {e}")
+            raise
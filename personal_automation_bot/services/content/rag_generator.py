@@ -2,18 +2,31 @@
 RAG (Retrieval-Augmented Generation) service.
 Combines document retrieval with text generation.
 """
+import asyncio
 import os
 import logging
 import json
+import threading
+import uuid
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from personal_automation_bot.services.content.text_generator import TextGenerator, get_text_generator
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from personal_automation_bot.services.content.text_generator import (
+    DEFAULT_MAX_BATCH_SIZE, TextGenerator, get_text_generator
+)
 from personal_automation_bot.services.rag.retriever import DocumentRetriever
+from personal_automation_bot.services.rag.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Citation:
     """Citation information for a source document."""
 
@@ -35,6 +48,12 @@ class Citation:
             "end_char": self.end_char
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict()).encode("utf-8")
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Citation':
         """Create from dictionary."""
@@ -53,7 +72,7 @@ class Citation:
         return f"[{title}]({self.source_path})"
 
 
-@dataclass
+@dataclass(slots=True)
 class RAGResponse:
     """Response from the RAG generator."""
 
@@ -61,6 +80,8 @@ class RAGResponse:
     citations: List[Citation]
     context_used: str
     prompt: str
+    response_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    previous_response_id: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -68,9 +89,23 @@ class RAGResponse:
             "text": self.text,
             "citations": [c.to_dict() for c in self.citations],
             "context_used": self.context_used,
-            "prompt": self.prompt
+            "prompt": self.prompt,
+            "response_id": self.response_id,
+            "previous_response_id": self.previous_response_id
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes."""
+        if ORJSON_AVAILABLE:
+            # orjson encodes dataclasses (including nested citations) natively
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict()).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> 'RAGResponse':
+        """Create from JSON produced by to_json."""
+        return cls.from_dict(orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RAGResponse':
         """Create from dictionary."""
@@ -78,7 +113,9 @@ class RAGResponse:
             text=data["text"],
             citations=[Citation.from_dict(c) for c in data["citations"]],
             context_used=data["context_used"],
-            prompt=data["prompt"]
+            prompt=data["prompt"],
+            response_id=data.get("response_id") or uuid.uuid4().hex,
+            previous_response_id=data.get("previous_response_id")
         )
 
     def get_formatted_text_with_citations(self) -> str:
@@ -104,7 +141,12 @@ class RAGGenerator:
         generator_provider: str = "openai",
         generator_model: Optional[str] = None,
         max_context_tokens: int = 2000,
-        citation_threshold: float = 0.6
+        citation_threshold: float = 0.6,
+        max_history_turns: int = 10,
+        max_stored_responses: int = 1000,
+        max_concurrency: int = DEFAULT_MAX_BATCH_SIZE,
+        context_cache_threshold: float = 0.9,
+        context_cache_size: int = 256
     ):
         """
         Initialize RAG generator.
@@ -116,6 +158,16 @@ class RAGGenerator:
             generator_model: Model for text generator if not provided
             max_context_tokens: Maximum number of tokens to use for context
             citation_threshold: Minimum relevance score for citations
+            max_history_turns: Number of previous turns included when a
+                previous_response_id is given
+            max_stored_responses: Number of responses kept for chaining
+            max_concurrency: Maximum number of agenerate() calls running at
+                once, to stay within the provider's rate limits; defaults to
+                the batching generator's batch size so its batches can fill
+            context_cache_threshold: Minimum cosine similarity between two
+                queries for the second to reuse the first one's retrieved context
+            context_cache_size: Number of retrieved contexts kept per
+                (top_k, filters) combination
         """
         self.retriever = retriever
         self.generator = generator or get_text_generator(
@@ -124,6 +176,92 @@ class RAGGenerator:
         )
         self.max_context_tokens = max_context_tokens
         self.citation_threshold = citation_threshold
+        self.max_history_turns = max_history_turns
+        self.max_stored_responses = max_stored_responses
+
+        # Recent responses by ID, used to chain follow-up questions
+        self._responses: "OrderedDict[str, RAGResponse]" = OrderedDict()
+
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._warmup: Optional[asyncio.Task] = None
+
+        # Retrieved (context, sources) per (top_k, filters), keyed by query embedding
+        self.context_cache_threshold = context_cache_threshold
+        self.context_cache_size = context_cache_size
+        self._context_caches: Dict[Tuple[int, str], SemanticCache] = {}
+        self._context_cache_lock = threading.Lock()
+
+    def get_response(self, response_id: str) -> Optional[RAGResponse]:
+        """
+        Get a previously generated response.
+
+        Args:
+            response_id: ID of the response
+
+        Returns:
+            The stored RAGResponse, or None if it is unknown or was evicted
+        """
+        return self._responses.get(response_id)
+
+    def _store_response(self, response: RAGResponse) -> None:
+        """Remember a response so later turns can chain from it."""
+        self._responses[response.response_id] = response
+
+        while len(self._responses) > self.max_stored_responses:
+            self._responses.popitem(last=False)
+
+    def _get_history(self, previous_response_id: Optional[str]) -> List[RAGResponse]:
+        """Get up to max_history_turns previous responses, oldest first."""
+        history = []
+        response_id = previous_response_id
+
+        while response_id and len(history) < self.max_history_turns:
+            response = self._responses.get(response_id)
+            if response is None:
+                break
+            history.append(response)
+            response_id = response.previous_response_id
+
+        history.reverse()
+        return history
+
+    def clear_context_cache(self) -> None:
+        """Forget retrieved contexts, e.g. after documents were indexed."""
+        with self._context_cache_lock:
+            self._context_caches.clear()
+
+    def _get_context(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        query_embedding: Optional[List[float]] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Retrieve context for a query, reusing the result of a similar earlier query."""
+        if query_embedding is None:
+            query_embedding = self.retriever.indexer.generate_embeddings([query])[0]
+
+        scope = (top_k, json.dumps(filters, sort_keys=True, default=str))
+        with self._context_cache_lock:
+            cache = self._context_caches.get(scope)
+            if cache is None:
+                cache = SemanticCache(self.context_cache_threshold, self.context_cache_size)
+                self._context_caches[scope] = cache
+            cached = cache.get(query_embedding)
+        if cached is not None:
+            return cached
+
+        result = self.retriever.get_relevant_context(
+            query=query,
+            top_k=top_k,
+            filters=filters,
+            max_tokens=self.max_context_tokens,
+            query_embedding=query_embedding
+        )
+        with self._context_cache_lock:
+            cache.put(query_embedding, result)
+        return result
 
     def generate(
         self,
@@ -132,6 +270,8 @@ class RAGGenerator:
         filters: Optional[Dict[str, Any]] = None,
         max_tokens: int = 500,
         temperature: float = 0.7,
+        previous_response_id: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
         **kwargs
     ) -> RAGResponse:
         """
@@ -143,53 +283,147 @@ class RAGGenerator:
             filters: Filters for document retrieval
             max_tokens: Maximum number of tokens to generate
             temperature: Temperature for generation
+            previous_response_id: ID of the previous response in the same
+                conversation; its turns are prepended to the context
+            query_embedding: Precomputed embedding of the query, if available
             **kwargs: Additional arguments for the generator
 
         Returns:
             RAGResponse with generated text and citations
         """
-        if not self.retriever:
-            raise ValueError("No retriever provided")
-
-        # Retrieve relevant context
-        context, sources = self.retriever.get_relevant_context(
-            query=query,
-            top_k=top_k,
-            filters=filters,
-            max_tokens=self.max_context_tokens
+        context, sources, history, generation_context = self._prepare_generation(
+            query, top_k, filters, previous_response_id, query_embedding
         )
 
         # Generate text with context
         generated_text = self.generator.generate_with_context(
             prompt=query,
-            context=context,
+            context=generation_context,
             max_tokens=max_tokens,
             temperature=temperature,
             **kwargs
         )
 
+        return self._build_response(query, generated_text, context, sources, history, previous_response_id)
+
+    def _prepare_generation(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        previous_response_id: Optional[str],
+        query_embedding: Optional[List[float]]
+    ) -> Tuple[str, List[Dict[str, Any]], List[RAGResponse], str]:
+        """
+        Retrieve context and prepend conversation history.
+
+        Returns:
+            Tuple of (context, sources, history, context passed to the generator)
+        """
+        if not self.retriever:
+            raise ValueError("No retriever provided")
+
+        # Retrieve relevant context, or reuse it from a near-identical query
+        context, sources = self._get_context(query, top_k, filters, query_embedding)
+
+        # Keep earlier turns first so the prompt prefix stays stable across a conversation
+        history = self._get_history(previous_response_id)
+        generation_context = context
+        if history:
+            turns = "\n".join(f"Q: {turn.prompt}\nA: {turn.text}" for turn in history)
+            generation_context = f"Previous conversation:\n{turns}\n\n{context}"
+
+        return context, sources, history, generation_context
+
+    def _build_response(
+        self,
+        query: str,
+        generated_text: str,
+        context: str,
+        sources: List[Dict[str, Any]],
+        history: List[RAGResponse],
+        previous_response_id: Optional[str]
+    ) -> RAGResponse:
+        """Attach citations to generated text and store the response."""
         # Create citations for relevant sources
-        citations = []
-        for source in sources:
-            if source.get("score", 0) >= self.citation_threshold:
-                citation = Citation(
-                    source_id=source.get("id", "unknown"),
-                    source_path=source.get("source", "unknown"),
-                    source_title=source.get("title", os.path.basename(source.get("source", ""))),
-                    relevance_score=source.get("score", 0.0)
-                )
-                citations.append(citation)
+        citation_threshold = self.citation_threshold
+        citations = [
+            Citation(
+                source_id=source.get("id", "unknown"),
+                source_path=source.get("source", "unknown"),
+                source_title=source.get("title") or os.path.basename(source.get("source", "")),
+                relevance_score=score
+            )
+            for source in sources
+            if (score := source.get("score", 0.0)) >= citation_threshold
+        ]
 
         # Create response
         response = RAGResponse(
             text=generated_text,
             citations=citations,
             context_used=context,
-            prompt=query
+            prompt=query,
+            previous_response_id=previous_response_id if history else None
         )
+        self._store_response(response)
 
         return response
 
+    async def agenerate(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        previous_response_id: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+        **kwargs
+    ) -> RAGResponse:
+        """
+        Async variant of generate.
+
+        Retrieval runs in a worker thread and generation goes through the
+        generator's agenerate_with_context, so a batching generator can combine
+        concurrent calls. At most max_concurrency calls run at the same time;
+        the rest wait. The first call warms up the generator's connection
+        while its retrieval runs.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self._warmup is None:
+            # Kept on the instance so the task isn't garbage-collected; never awaited
+            self._warmup = asyncio.create_task(asyncio.to_thread(self.generator.warmup))
+
+        async with self._semaphore:
+            context, sources, history, generation_context = await asyncio.to_thread(
+                self._prepare_generation, query, top_k, filters, previous_response_id, query_embedding
+            )
+            generated_text = await self.generator.agenerate_with_context(
+                prompt=query,
+                context=generation_context,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+
+        return self._build_response(query, generated_text, context, sources, history, previous_response_id)
+
+    async def agenerate_many(self, queries: List[str], **kwargs) -> List[RAGResponse]:
+        """
+        Answer several queries concurrently.
+
+        Args:
+            queries: Queries to answer
+            **kwargs: Arguments passed to generate() for every query
+
+        Returns:
+            Responses in the same order as the queries
+        """
+        return list(await asyncio.gather(*(self.agenerate(query, **kwargs) for query in queries)))
+
     def generate_with_explicit_context(
         self,
         query: str,
@@ -2,9 +2,14 @@
 RAG (Retrieval-Augmented Generation) service.
 Combines document retrieval with content generation.
 """
+import asyncio
+import itertools
+import json
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+import threading
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from dataclasses import dataclass, replace
+from functools import lru_cache
 
 from personal_automation_bot.services.content.generators.base import (
     ContentGenerator,
@@ -15,7 +20,44 @@ from personal_automation_bot.services.content.generators.factory import get_cont
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Characters of each document's text included in the context
+MAX_DOCUMENT_CHARS = 500
+
+@lru_cache(maxsize=1024)
+def _truncate_text(text: str) -> str:
+    """
+    Shorten a document's text to MAX_DOCUMENT_CHARS, marking the cut.
+
+    Memoized so a chunk retrieved again yields the same string object, which
+    cached responses then share instead of each holding a copy.
+    """
+    return text[:MAX_DOCUMENT_CHARS] + '...' if len(text) > MAX_DOCUMENT_CHARS else text
+
+# Context entry for a document, called with (index, text)
+_DOCUMENT_TEMPLATE = "Documento {}: {}".format
+
+_NO_CONTEXT_SYSTEM_PROMPT = "Responde de manera útil pero indica que no tienes información específica sobre el tema."
+
+# Document metadata copied into the formatted source when present
+_SOURCE_METADATA_KEYS = ('filename', 'file_type')
+
+def _make_source(index: int, doc: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Format a retrieved document as source information for the generator."""
+    get = doc.get
+    source_info = {
+        'id': get('id', f'doc_{index}'),
+        'source': get('source', 'Fuente desconocida'),
+        'title': get('title', ''),
+        'score': get('score', 0.0),
+        'text': text
+    }
+
+    metadata = get('metadata')
+    if metadata:
+        source_info.update({key: metadata[key] for key in _SOURCE_METADATA_KEYS if metadata.get(key)})
+    return source_info
+
+@dataclass(slots=True)
 class RAGRequest:
     """Request for RAG generation."""
     query: str
@@ -27,7 +69,7 @@ class RAGRequest:
     max_tokens: Optional[int] = None
     temperature: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class RAGResponse:
     """Response from RAG generation."""
     answer: str
@@ -62,6 +104,80 @@ class RAGService:
             generator_config = self.config.get('generator', {})
             self.content_generator = get_content_generator(config=generator_config)
 
+        # Proximity cache: answers for earlier queries whose embedding is within
+        # the threshold, one SemanticCache per combination of request options
+        proximity_config = self.config.get('proximity_cache', {})
+        self.proximity_cache_threshold = proximity_config.get('threshold', 0.97)
+        self.proximity_cache_size = proximity_config.get('max_entries', 256)
+        self.proximity_cache_quantize = proximity_config.get('quantize', False)
+        self._proximity_caches: Dict[str, Any] = {}
+
+        # Retrieval cache: search results for similar query embeddings, per top_k.
+        # Still useful when the answer cache misses (e.g. different generator options)
+        retrieval_config = self.config.get('retrieval_cache', {})
+        self.retrieval_cache_threshold = retrieval_config.get('threshold', 0.99)
+        self.retrieval_cache_size = retrieval_config.get('max_entries', 512)
+        self._retrieval_caches: Dict[int, Any] = {}
+        self._cache_lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop cached answers and search results, e.g. after the indexed documents changed."""
+        with self._cache_lock:
+            self._proximity_caches.clear()
+            self._retrieval_caches.clear()
+
+    @staticmethod
+    def _request_scope(request: RAGRequest) -> str:
+        """Key for every request option except the query itself."""
+        return json.dumps([
+            request.max_sources,
+            request.min_relevance_score,
+            request.generator_type,
+            request.generator_config,
+            request.system_prompt,
+            request.max_tokens,
+            request.temperature
+        ], sort_keys=True, default=str)
+
+    def _get_proximity_cache(self, request: RAGRequest):
+        """Get (creating if needed) the proximity cache for the request's options."""
+        from personal_automation_bot.services.rag.semantic_cache import SemanticCache
+
+        scope = self._request_scope(request)
+        cache = self._proximity_caches.get(scope)
+        if cache is None:
+            cache = SemanticCache(
+                self.proximity_cache_threshold, self.proximity_cache_size, self.proximity_cache_quantize
+            )
+            self._proximity_caches[scope] = cache
+        return cache
+
+    def _search(
+        self,
+        request: RAGRequest,
+        query_embedding: Optional[List[float]],
+        search_kwargs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Search the retriever, reusing results for a near-identical earlier query."""
+        if query_embedding is None or self.retrieval_cache_size <= 0:
+            return self.retriever.search(request.query, top_k=request.max_sources, **search_kwargs)
+
+        from personal_automation_bot.services.rag.semantic_cache import SemanticCache
+
+        with self._cache_lock:
+            cache = self._retrieval_caches.get(request.max_sources)
+            if cache is None:
+                cache = SemanticCache(self.retrieval_cache_threshold, self.retrieval_cache_size)
+                self._retrieval_caches[request.max_sources] = cache
+            cached = cache.get(query_embedding)
+        if cached is not None:
+            return cached
+
+        retrieved_docs = self.retriever.search(request.query, top_k=request.max_sources, **search_kwargs)
+        with self._cache_lock:
+            cache.put(query_embedding, retrieved_docs)
+        return retrieved_docs
+
     def generate(self, request: RAGRequest) -> RAGResponse:
         """
         Generate answer using RAG.
@@ -76,52 +192,189 @@ class RAGService:
             raise ValueError("No retriever provided")
 
         # Step 1: Retrieve relevant documents
-        logger.info(f"Retrieving documents for query: {request.query}")
-        retrieved_docs = self.retriever.search(
-            request.query,
-            top_k=request.max_sources
-        )
+        query_embedding, search_kwargs = self._embed_query(request)
 
-        # Filter by relevance score
-        relevant_docs = [
-            doc for doc in retrieved_docs
-            if doc.get('score', 0) >= request.min_relevance_score
-        ]
+        use_proximity_cache = query_embedding is not None and self.proximity_cache_size > 0
+        if use_proximity_cache:
+            with self._cache_lock:
+                cached = self._get_proximity_cache(request).get(query_embedding)
+            if cached is not None:
+                logger.info("Answering from the proximity cache")
+                return replace(cached, metadata={**cached.metadata, 'cache_hit': True})
 
-        if not relevant_docs:
+        response = self._generate(request, query_embedding, search_kwargs)
+
+        if use_proximity_cache:
+            with self._cache_lock:
+                self._get_proximity_cache(request).put(query_embedding, response)
+        return response
+
+    async def astream(self, request: RAGRequest) -> AsyncIterator[str]:
+        """
+        Stream the answer text as the generator produces it.
+
+        Retrieval runs in a worker thread; the answer is not stored in the
+        proximity cache, since sources and confidence are not returned.
+
+        Args:
+            request: RAG request
+
+        Yields:
+            Chunks of the answer
+        """
+        if not self.retriever:
+            raise ValueError("No retriever provided")
+
+        query_embedding, search_kwargs = await asyncio.to_thread(self._embed_query, request)
+        relevant_docs = await asyncio.to_thread(self._retrieve, request, query_embedding, search_kwargs)
+
+        if relevant_docs:
+            generation_request, _ = self._build_generation_request(request, relevant_docs, query_embedding)
+        else:
             logger.warning("No relevant documents found")
-            return self._generate_no_context_response(request)
+            generation_request = self._no_context_generation_request(request)
 
-        logger.info(f"Found {len(relevant_docs)} relevant documents")
+        async for chunk in self._select_generator(request).astream(generation_request):
+            yield chunk
 
-        # Step 2: Prepare context
-        context, formatted_sources = self._prepare_context(relevant_docs)
+    def _embed_query(self, request: RAGRequest) -> Tuple[Optional[List[float]], Dict[str, Any]]:
+        """Embed the query once; used for retrieval, caching and the generator's response cache."""
+        logger.info(f"Retrieving documents for query: {request.query}")
+        search_kwargs = {}
+        query_embedding = None
+        indexer = getattr(self.retriever, 'indexer', None)
+        if indexer is not None:
+            query_embedding = indexer.generate_embeddings([request.query])[0]
+            search_kwargs['query_embedding'] = query_embedding
+        return query_embedding, search_kwargs
+
+    def _retrieve(
+        self,
+        request: RAGRequest,
+        query_embedding: Optional[List[float]],
+        search_kwargs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Search for documents and keep those above the minimum relevance score."""
+        retrieved_docs = self._search(request, query_embedding, search_kwargs)
+        return [
+            doc for doc in retrieved_docs
+            if doc.get('score', 0) >= request.min_relevance_score
+        ]
 
-        # Step 3: Generate content
+    def _build_generation_request(
+        self,
+        request: RAGRequest,
+        relevant_docs: List[Dict[str, Any]],
+        query_embedding: Optional[List[float]]
+    ) -> Tuple[GenerationRequest, List[Dict[str, Any]]]:
+        """Build the generation request for the retrieved documents."""
+        context, formatted_sources = self._prepare_context(relevant_docs)
         generation_request = GenerationRequest(
             prompt=request.query,
             context=context,
             sources=formatted_sources,
             system_prompt=request.system_prompt,
             max_tokens=request.max_tokens,
-            temperature=request.temperature
+            temperature=request.temperature,
+            query_embedding=query_embedding
         )
+        return generation_request, formatted_sources
 
-        # Use specific generator if requested
+    def _select_generator(self, request: RAGRequest) -> ContentGenerator:
+        """Get the generator requested, or the service's default one."""
         if request.generator_type or request.generator_config:
-            generator = get_content_generator(
+            return get_content_generator(
                 generator_type=request.generator_type,
                 config=request.generator_config or {}
             )
-        else:
-            generator = self.content_generator
+        return self.content_generator
+
+    def _generate(
+        self,
+        request: RAGRequest,
+        query_embedding: Optional[List[float]],
+        search_kwargs: Dict[str, Any]
+    ) -> RAGResponse:
+        """Retrieve documents and generate an answer, bypassing the proximity cache."""
+        relevant_docs = self._retrieve(request, query_embedding, search_kwargs)
+
+        if not relevant_docs:
+            logger.warning("No relevant documents found")
+            return self._generate_no_context_response(request)
 
+        logger.info(f"Found {len(relevant_docs)} relevant documents")
+
+        # Step 2: Prepare context
+        generation_request, formatted_sources = self._build_generation_request(
+            request, relevant_docs, query_embedding
+        )
+
+        # Step 3: Generate content
+        generator = self._select_generator(request)
         logger.info(f"Generating content using {generator.__class__.__name__}")
         generation_response = generator.generate(generation_request)
 
+        return self._build_response(relevant_docs, formatted_sources, generator, generation_response)
+
+    async def agenerate(self, request: RAGRequest) -> RAGResponse:
+        """
+        Async variant of generate.
+
+        Embedding and retrieval run in worker threads and generation uses the
+        generator's agenerate, so the event loop keeps serving other users
+        (and their generator calls) while this query is retrieved.
+
+        Args:
+            request: RAG request
+
+        Returns:
+            RAG response
+        """
+        if not self.retriever:
+            raise ValueError("No retriever provided")
+
+        query_embedding, search_kwargs = await asyncio.to_thread(self._embed_query, request)
+
+        use_proximity_cache = query_embedding is not None and self.proximity_cache_size > 0
+        if use_proximity_cache:
+            with self._cache_lock:
+                cached = self._get_proximity_cache(request).get(query_embedding)
+            if cached is not None:
+                logger.info("Answering from the proximity cache")
+                return replace(cached, metadata={**cached.metadata, 'cache_hit': True})
+
+        relevant_docs = await asyncio.to_thread(self._retrieve, request, query_embedding, search_kwargs)
+        generator = self._select_generator(request)
+
+        if relevant_docs:
+            generation_request, formatted_sources = self._build_generation_request(
+                request, relevant_docs, query_embedding
+            )
+            generation_response = await generator.agenerate(generation_request)
+            response = self._build_response(relevant_docs, formatted_sources, generator, generation_response)
+        else:
+            logger.warning("No relevant documents found")
+            generation_response = await generator.agenerate(self._no_context_generation_request(request))
+            response = self._build_no_context_response(generator, generation_response)
+
+        if use_proximity_cache:
+            with self._cache_lock:
+                self._get_proximity_cache(request).put(query_embedding, response)
+        return response
+
+    def _build_response(
+        self,
+        relevant_docs: List[Dict[str, Any]],
+        formatted_sources: List[Dict[str, Any]],
+        generator: ContentGenerator,
+        generation_response: GenerationResponse
+    ) -> RAGResponse:
+        """Score the generated answer and wrap it in a RAG response."""
         # Step 4: Calculate confidence score
+        avg_relevance = sum(doc.get('score', 0) for doc in relevant_docs) / len(relevant_docs)
         confidence_score = self._calculate_confidence_score(
-            relevant_docs,
+            avg_relevance,
+            len(relevant_docs),
             generation_response
         )
 
@@ -132,7 +385,7 @@ class RAGService:
             citations=generation_response.citations,
             metadata={
                 'num_sources': len(relevant_docs),
-                'avg_relevance_score': sum(doc.get('score', 0) for doc in relevant_docs) / len(relevant_docs),
+                'avg_relevance_score': avg_relevance,
                 'generator_metadata': generation_response.metadata,
                 'generator_type': generator.__class__.__name__
             },
@@ -149,71 +402,65 @@ class RAGService:
         Returns:
             Tuple of (context_text, formatted_sources)
         """
-        context_parts = []
-        formatted_sources = []
-
-        for i, doc in enumerate(documents, 1):
-            # Extract text
-            text = doc.get('text', '')
-            if len(text) > 500:  # Truncate long texts
-                text = text[:500] + '...'
-
-            context_parts.append(f"Documento {i}: {text}")
-
-            # Format source information
-            source_info = {
-                'id': doc.get('id', f'doc_{i}'),
-                'source': doc.get('source', 'Fuente desconocida'),
-                'title': doc.get('title', ''),
-                'score': doc.get('score', 0.0),
-                'text': text
-            }
-
-            # Add metadata if available
-            if 'metadata' in doc:
-                metadata = doc['metadata']
-                if metadata.get('filename'):
-                    source_info['filename'] = metadata['filename']
-                if metadata.get('file_type'):
-                    source_info['file_type'] = metadata['file_type']
-
-            formatted_sources.append(source_info)
-
-        context_text = '\\n\\n'.join(context_parts)
+        if not documents:
+            return "", []
+        if len(documents) == 1:
+            doc = documents[0]
+            text = _truncate_text(doc.get('text', ''))
+            return _DOCUMENT_TEMPLATE(1, text), [_make_source(1, doc, text)]
+
+        # Truncate long texts
+        texts = [_truncate_text(doc.get('text', '')) for doc in documents]
+        context_text = '\\n\\n'.join(itertools.starmap(_DOCUMENT_TEMPLATE, enumerate(texts, 1)))
+
+        formatted_sources = [
+            _make_source(i, doc, text)
+            for i, (doc, text) in enumerate(zip(documents, texts), 1)
+        ]
+
         return context_text, formatted_sources
 
     def _calculate_confidence_score(
         self,
-        documents: List[Dict[str, Any]],
+        avg_relevance: float,
+        num_documents: int,
         generation_response: GenerationResponse
     ) -> float:
         """
         Calculate confidence score for the generated response.
 
         Args:
-            documents: Retrieved documents
+            avg_relevance: Average relevance score of the retrieved documents
+            num_documents: Number of retrieved documents
             generation_response: Generated response
 
         Returns:
             Confidence score between 0 and 1
         """
-        if not documents:
+        if not num_documents:
             return 0.0
 
-        # Base score from document relevance
-        avg_relevance = sum(doc.get('score', 0) for doc in documents) / len(documents)
-
         # Boost score if citations are present
         citation_boost = 0.1 if generation_response.citations else 0.0
 
         # Boost score based on number of sources
-        source_boost = min(len(documents) * 0.05, 0.2)
+        source_boost = min(num_documents * 0.05, 0.2)
 
         # Combine scores
         confidence = min(avg_relevance + citation_boost + source_boost, 1.0)
 
         return confidence
 
+    @staticmethod
+    def _no_context_generation_request(request: RAGRequest) -> GenerationRequest:
+        """Build the generation request used when no relevant documents were found."""
+        return GenerationRequest(
+            prompt=request.query,
+            system_prompt=_NO_CONTEXT_SYSTEM_PROMPT,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature
+        )
+
     def _generate_no_context_response(self, request: RAGRequest) -> RAGResponse:
         """
         Generate response when no relevant context is found.
@@ -225,22 +472,17 @@ class RAGService:
             RAG response
         """
         # Generate without context
-        generation_request = GenerationRequest(
-            prompt=request.query,
-            system_prompt="Responde de manera útil pero indica que no tienes información específica sobre el tema.",
-            max_tokens=request.max_tokens,
-            temperature=request.temperature
-        )
-
-        generator = self.content_generator
-        if request.generator_type or request.generator_config:
-            generator = get_content_generator(
-                generator_type=request.generator_type,
-                config=request.generator_config or {}
-            )
+        generator = self._select_generator(request)
+        generation_response = generator.generate(self._no_context_generation_request(request))
 
-        generation_response = generator.generate(generation_request)
+        return self._build_no_context_response(generator, generation_response)
 
+    @staticmethod
+    def _build_no_context_response(
+        generator: ContentGenerator,
+        generation_response: GenerationResponse
+    ) -> RAGResponse:
+        """Wrap an answer generated without context in a RAG response."""
         return RAGResponse(
             answer=generation_response.content,
             sources=[],
@@ -2,14 +2,44 @@
 Text generation service.
 Provides functionality for generating text using various AI services.
 """
+import asyncio
+import bisect
+import itertools
 import os
 import logging
 import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Hugging Face API responses worth retrying, and how many retries to make
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+API_RETRIES = 2
+
+# Prompt length boundaries (characters) for local batches; each bucket is padded separately
+LENGTH_BUCKETS = (128, 512)
+
+# Requests per BatchingTextGenerator batch; callers that cap their own
+# concurrency should allow at least this many so batches can fill
+DEFAULT_MAX_BATCH_SIZE = 8
+
+# Start of the Groq system message; the context is appended to it
+_CONTEXT_SYSTEM_PREFIX = "Use the following information to answer the user's question. If the information doesn't contain the answer, say you don't know.\\n\\nContext information:\\n"
+
+# Heavy backends are imported on first use, so a Groq-only bot never loads torch
+_torch = None
+
+def _get_torch():
+    """Import torch on first use and return the module."""
+    global _torch
+    if _torch is None:
+        import torch
+        _torch = torch
+    return _torch
+
 class TextGenerator(ABC):
     """Base class for text generators."""
 
@@ -59,6 +89,82 @@ class TextGenerator(ABC):
         """
         pass
 
+    def generate_batch(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[Optional[str]]] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts at once.
+
+        By default the prompts are sent concurrently from a thread pool of
+        up to DEFAULT_MAX_BATCH_SIZE workers; generators that can run a real
+        batch override this.
+
+        Args:
+            prompts: Prompts to generate text from
+            contexts: Context for each prompt, or None for prompts without context
+            max_tokens: Maximum number of tokens to generate
+            temperature: Temperature for generation (higher = more creative)
+            **kwargs: Additional arguments for the specific generator
+
+        Returns:
+            Generated texts, in the same order as the prompts
+        """
+        if not prompts:
+            return []
+        contexts = contexts or [None] * len(prompts)
+
+        def generate_one(item: Tuple[str, Optional[str]]) -> str:
+            prompt, context = item
+            if context is None:
+                return self.generate(prompt, max_tokens, temperature, **kwargs)
+            return self.generate_with_context(prompt, context, max_tokens, temperature, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=min(len(prompts), DEFAULT_MAX_BATCH_SIZE)) as executor:
+            return list(executor.map(generate_one, zip(prompts, contexts)))
+
+    def stream_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream text generated from a prompt and context as it arrives.
+
+        Generators without streaming support yield the whole text at once.
+
+        Yields:
+            Chunks of generated text
+        """
+        yield self.generate_with_context(prompt, context, max_tokens, temperature, **kwargs)
+
+    async def agenerate_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        """Async variant of generate_with_context; runs it in a worker thread."""
+        return await asyncio.to_thread(
+            self.generate_with_context, prompt, context, max_tokens, temperature, **kwargs
+        )
+
+    def warmup(self) -> None:
+        """
+        Prepare for upcoming requests, e.g. by opening a pooled connection.
+
+        Called once per caller before its first request; does nothing by default.
+        """
+
 
 class GroqTextGenerator(TextGenerator):
     """Text generator using Groq API."""
@@ -85,12 +191,19 @@ class GroqTextGenerator(TextGenerator):
             logger.warning("No Groq API key provided. Text generation will not work.")
 
         self.organization = organization
+        self._warmed_up = False
 
         # Initialize Groq client if available
         try:
             import groq
+            import httpx
             self.client = groq.Client(
-                api_key=self.api_key
+                api_key=self.api_key,
+                # Keep-alive pool shared by all requests from this generator
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+                    timeout=httpx.Timeout(30.0, connect=3.0)
+                )
             )
             self.available = True
         except ImportError:
@@ -137,16 +250,10 @@ class GroqTextGenerator(TextGenerator):
         if not self.available:
             raise RuntimeError("Groq client not available")
 
-        # Combine prompt and context
-        system_message = f"Use the following information to answer the user's question. If the information doesn't contain the answer, say you don't know.\\n\\nContext information:\\n{context}"
-
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._context_messages(prompt, context),
                 max_tokens=max_tokens,
                 temperature=temperature,
                 **kwargs
@@ -157,6 +264,58 @@ class GroqTextGenerator(TextGenerator):
             logger.error(f"Error generating text with Groq: {e}")
             raise
 
+    def stream_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Iterator[str]:
+        """Stream text with context from Groq API as tokens arrive."""
+        if not self.available:
+            raise RuntimeError("Groq client not available")
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._context_messages(prompt, context),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **kwargs
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"Error streaming text with Groq: {e}")
+            raise
+
+    @staticmethod
+    def _context_messages(prompt: str, context: str) -> List[Dict[str, str]]:
+        """Build chat messages that answer the prompt from the context."""
+        return [
+            {"role": "system", "content": _CONTEXT_SYSTEM_PREFIX + context},
+            {"role": "user", "content": prompt}
+        ]
+
+    def warmup(self) -> None:
+        """
+        Open a pooled connection to the Groq API so the first request skips the handshake.
+
+        Only the first successful call makes a request; the connection then
+        stays in the pool.
+        """
+        if not self.available or self._warmed_up:
+            return
+
+        try:
+            self.client.models.list()
+            self._warmed_up = True
+        except Exception as e:
+            logger.debug(f"Groq warmup failed: {e}")
+
 
 class HuggingFaceTextGenerator(TextGenerator):
     """Text generator using Hugging Face models."""
@@ -165,7 +324,9 @@ class HuggingFaceTextGenerator(TextGenerator):
         self,
         api_key: Optional[str] = None,
         model: str = "google/flan-t5-base",
-        local_model: bool = False
+        local_model: bool = False,
+        compile_model: bool = False,
+        use_onnx: bool = False
     ):
         """
         Initialize Hugging Face text generator.
@@ -174,9 +335,15 @@ class HuggingFaceTextGenerator(TextGenerator):
             api_key: Hugging Face API key (if None, will use HF_API_KEY env var)
             model: Model to use for generation
             local_model: Whether to use a local model (True) or the API (False)
+            compile_model: torch.compile the local model; slow first
+                generations, faster afterwards
+            use_onnx: Run the local model with ONNX Runtime through Optimum,
+                exporting it on first use
         """
         self.model_name = model
         self.local_model = local_model
+        self.compile_model = compile_model
+        self.use_onnx = use_onnx
 
         # Get API key from env var if not provided and using API
         self.api_key = None
@@ -194,13 +361,32 @@ class HuggingFaceTextGenerator(TextGenerator):
     def _init_local_model(self):
         """Initialize local Hugging Face model."""
         try:
-            from transformers import AutoModelForCausalLM, AutoTokenizer
+            torch = _get_torch()
+            from transformers import AutoConfig, AutoModelForCausalLM, AutoModelForSeq2SeqLM, AutoTokenizer
+
+            # Encoder-decoder models such as the default flan-t5 need the seq2seq head
+            is_encoder_decoder = AutoConfig.from_pretrained(self.model_name).is_encoder_decoder
 
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+            self.model = self._load_onnx_model(is_encoder_decoder) if self.use_onnx else None
+
+            if self.model is None:
+                # Half precision on GPU (bf16 where supported); CPUs mostly lack fast fp16/bf16 kernels
+                if torch.cuda.is_available():
+                    device = "cuda"
+                    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                else:
+                    device = "cpu"
+                    dtype = torch.float32
+
+                model_class = AutoModelForSeq2SeqLM if is_encoder_decoder else AutoModelForCausalLM
+                self.model = model_class.from_pretrained(self.model_name, torch_dtype=dtype).to(device)
+                self.model.eval()
+                if self.compile_model:
+                    self.model = torch.compile(self.model, mode="reduce-overhead")
             self.available = True
 
-            logger.info(f"Loaded local model: {self.model_name}")
+            logger.info(f"Loaded local model: {self.model_name} on {self.model.device}")
         except ImportError:
             logger.warning("Transformers package not installed. Install with 'pip install transformers'")
             self.available = False
@@ -208,17 +394,70 @@ class HuggingFaceTextGenerator(TextGenerator):
             logger.error(f"Error loading local model {self.model_name}: {e}")
             self.available = False
 
+    def _load_onnx_model(self, is_encoder_decoder: bool):
+        """
+        Load the model with ONNX Runtime, exporting it to ONNX_CACHE_PATH on first use.
+
+        Returns:
+            The ONNX Runtime model, or None if Optimum is not installed
+        """
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSeq2SeqLM
+        except ImportError:
+            logger.warning("Optimum ONNX Runtime not installed, using transformers. Install with 'pip install optimum[onnxruntime]'")
+            return None
+
+        from personal_automation_bot.config import settings
+
+        model_class = ORTModelForSeq2SeqLM if is_encoder_decoder else ORTModelForCausalLM
+        provider = (
+            "CUDAExecutionProvider"
+            if "CUDAExecutionProvider" in onnxruntime.get_available_providers()
+            else "CPUExecutionProvider"
+        )
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        export_dir = settings.ONNX_CACHE_PATH / self.model_name.replace("/", "--")
+        if export_dir.exists():
+            return model_class.from_pretrained(
+                export_dir, provider=provider, session_options=session_options, use_cache=True
+            )
+
+        logger.info(f"Exporting {self.model_name} to ONNX in {export_dir}")
+        model = model_class.from_pretrained(
+            self.model_name, export=True, provider=provider, session_options=session_options, use_cache=True
+        )
+        model.save_pretrained(export_dir)
+        return model
+
     def _init_api_client(self):
         """Initialize Hugging Face API client."""
         try:
-            import requests
+            import importlib.util
+            import httpx
+
             self.api_url = f"https://api-inference.huggingface.co/models/{self.model_name}"
             self.headers = {"Authorization": f"Bearer {self.api_key}"}
+
+            # Keep-alive client; HTTP/2 multiplexes concurrent batch requests
+            # over one connection when the h2 package is installed
+            limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            self.client = httpx.Client(
+                headers=self.headers,
+                timeout=httpx.Timeout(30.0, connect=3.0),
+                transport=httpx.HTTPTransport(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=limits,
+                    retries=2
+                )
+            )
             self.available = True
 
             logger.info(f"Using Hugging Face API with model: {self.model_name}")
         except ImportError:
-            logger.warning("Requests package not installed. Install with 'pip install requests'")
+            logger.warning("httpx package not installed. Install with 'pip install httpx'")
             self.available = False
         except Exception as e:
             logger.error(f"Error initializing Hugging Face API client: {e}")
@@ -249,18 +488,22 @@ class HuggingFaceTextGenerator(TextGenerator):
     ) -> str:
         """Generate text using local Hugging Face model."""
         try:
-            import torch
+            torch = _get_torch()
 
-            inputs = self.tokenizer(prompt, return_tensors="pt")
+            inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
 
             gen_kwargs = {
                 "max_length": max_tokens,
                 "temperature": temperature,
                 "do_sample": temperature > 0,
+                "use_cache": True,
+                "pad_token_id": self.tokenizer.pad_token_id,
                 **kwargs
             }
+            if gen_kwargs["pad_token_id"] is None:
+                gen_kwargs["pad_token_id"] = self.tokenizer.eos_token_id
 
-            with torch.no_grad():
+            with torch.inference_mode():
                 output = self.model.generate(**inputs, **gen_kwargs)
 
             return self.tokenizer.decode(output[0], skip_special_tokens=True)
@@ -276,8 +519,6 @@ class HuggingFaceTextGenerator(TextGenerator):
         **kwargs
     ) -> str:
         """Generate text using Hugging Face API."""
-        import requests
-
         payload = {
             "inputs": prompt,
             "parameters": {
@@ -288,7 +529,12 @@ class HuggingFaceTextGenerator(TextGenerator):
         }
 
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
+            for attempt in range(API_RETRIES + 1):
+                response = self.client.post(self.api_url, json=payload)
+                if response.status_code not in RETRYABLE_STATUSES or attempt == API_RETRIES:
+                    break
+                # Rate limited, or the model is still loading
+                time.sleep(0.2 * 2 ** attempt)
             response.raise_for_status()
 
             result = response.json()
@@ -307,6 +553,80 @@ class HuggingFaceTextGenerator(TextGenerator):
             logger.error(f"Error generating text with Hugging Face API: {e}")
             raise
 
+    def generate_batch(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[Optional[str]]] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts.
+
+        The local model runs one padded batch per prompt-length bucket (see
+        LENGTH_BUCKETS), so short prompts are not padded to the longest one.
+        """
+        if not self.local_model:
+            return super().generate_batch(prompts, contexts, max_tokens, temperature, **kwargs)
+        if not self.available:
+            raise RuntimeError("Hugging Face client not available")
+
+        contexts = contexts or [None] * len(prompts)
+        combined_prompts = [
+            prompt if context is None else self._combine_prompt(prompt, context)
+            for prompt, context in zip(prompts, contexts)
+        ]
+
+        try:
+            torch = _get_torch()
+
+            # Decoder-only models continue from the end of the input, so pad on the left
+            if not self.model.config.is_encoder_decoder:
+                self.tokenizer.padding_side = "left"
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+
+            gen_kwargs = {
+                "max_length": max_tokens,
+                "temperature": temperature,
+                "do_sample": temperature > 0,
+                "use_cache": True,
+                "pad_token_id": self.tokenizer.pad_token_id,
+                **kwargs
+            }
+
+            results: List[Optional[str]] = [None] * len(combined_prompts)
+            order = sorted(range(len(combined_prompts)), key=lambda i: len(combined_prompts[i]))
+            buckets = itertools.groupby(
+                order, key=lambda i: bisect.bisect(LENGTH_BUCKETS, len(combined_prompts[i]))
+            )
+
+            for _, bucket in buckets:
+                indices = list(bucket)
+                inputs = self.tokenizer(
+                    [combined_prompts[i] for i in indices],
+                    padding="longest",
+                    truncation=True,
+                    return_tensors="pt"
+                ).to(self.model.device)
+
+                with torch.inference_mode():
+                    outputs = self.model.generate(**inputs, **gen_kwargs)
+
+                for i, text in zip(indices, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    results[i] = text
+
+            return results
+        except Exception as e:
+            logger.error(f"Error generating text batch with local model: {e}")
+            raise
+
+    @staticmethod
+    def _combine_prompt(prompt: str, context: str) -> str:
+        """Combine a prompt and its context into a single model input."""
+        return f"Context: {context}\\n\\nQuestion: {prompt}\\n\\nAnswer:"
+
     def generate_with_context(
         self,
         prompt: str,
@@ -316,10 +636,150 @@ class HuggingFaceTextGenerator(TextGenerator):
         **kwargs
     ) -> str:
         """Generate text with context using Hugging Face."""
-        # Combine prompt and context
-        combined_prompt = f"Context: {context}\\n\\nQuestion: {prompt}\\n\\nAnswer:"
+        return self.generate(self._combine_prompt(prompt, context), max_tokens, temperature, **kwargs)
+
 
-        return self.generate(combined_prompt, max_tokens, temperature, **kwargs)
+class BatchingTextGenerator(TextGenerator):
+    """
+    Wraps a text generator and combines concurrent async requests into batches.
+
+    Requests made through agenerate_with_context within batch_window_ms of each
+    other (up to max_batch_size) are sent as one generate_batch call on the
+    wrapped generator. Synchronous calls go straight to the wrapped generator.
+    """
+
+    def __init__(
+        self,
+        generator: TextGenerator,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_window_ms: float = 20
+    ):
+        """
+        Initialize the batching wrapper.
+
+        Args:
+            generator: Generator that serves the batches
+            max_batch_size: Maximum number of requests per batch
+            batch_window_ms: How long to wait for more requests after the first one
+        """
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.batch_window_ms = batch_window_ms
+
+        # Created on first use, inside the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    def generate(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7, **kwargs) -> str:
+        """Generate text with the wrapped generator."""
+        return self.generator.generate(prompt, max_tokens, temperature, **kwargs)
+
+    def generate_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        """Generate text with context with the wrapped generator."""
+        return self.generator.generate_with_context(prompt, context, max_tokens, temperature, **kwargs)
+
+    def stream_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Iterator[str]:
+        """Stream text with context from the wrapped generator; streams are not batched."""
+        return self.generator.stream_with_context(prompt, context, max_tokens, temperature, **kwargs)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[Optional[str]]] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> List[str]:
+        """Generate a batch with the wrapped generator."""
+        return self.generator.generate_batch(prompts, contexts, max_tokens, temperature, **kwargs)
+
+    def warmup(self) -> None:
+        """Warm up the wrapped generator."""
+        self.generator.warmup()
+
+    async def agenerate_with_context(
+        self,
+        prompt: str,
+        context: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        """Queue the request for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect_batches())
+
+        future = loop.create_future()
+        await self._queue.put((prompt, context, max_tokens, temperature, kwargs, future))
+        return await future
+
+    async def _collect_batches(self) -> None:
+        """Pull queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Requests can only share a call if their generation options match
+            groups: Dict[str, List[tuple]] = {}
+            for item in batch:
+                options = json.dumps([item[2], item[3], item[4]], sort_keys=True, default=str)
+                groups.setdefault(options, []).append(item)
+
+            for items in groups.values():
+                # The loop only keeps weak references to tasks; hold on to each
+                # batch until it finishes so its callers' futures get resolved
+                task = loop.create_task(self._run_batch(items))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, items: List[tuple]) -> None:
+        """Run one batch in a worker thread and resolve its futures."""
+        _, _, max_tokens, temperature, kwargs, _ = items[0]
+        try:
+            results = await asyncio.to_thread(
+                self.generator.generate_batch,
+                [item[0] for item in items],
+                [item[1] for item in items],
+                max_tokens,
+                temperature,
+                **kwargs
+            )
+        except Exception as e:
+            for item in items:
+                if not item[5].done():
+                    item[5].set_exception(e)
+            return
+
+        for item, result in zip(items, results):
+            if not item[5].done():
+                item[5].set_result(result)
 
 
 def get_text_generator(
@@ -335,16 +795,25 @@ def get_text_generator(
         provider: Provider to use ('groq' or 'huggingface')
         api_key: API key for the provider
         model: Model to use
-        **kwargs: Additional arguments for the specific generator
+        **kwargs: Additional arguments for the specific generator; pass
+            max_batch_size (and optionally batch_window_ms) to wrap it in a
+            BatchingTextGenerator
 
     Returns:
         TextGenerator instance
     """
+    max_batch_size = kwargs.pop("max_batch_size", None)
+    batch_window_ms = kwargs.pop("batch_window_ms", 20)
+
     if provider.lower() == "groq":
         default_model = "llama3-70b-8192"
-        return GroqTextGenerator(api_key=api_key, model=model or default_model, **kwargs)
+        generator = GroqTextGenerator(api_key=api_key, model=model or default_model, **kwargs)
     elif provider.lower() in ["huggingface", "hf"]:
         default_model = "google/flan-t5-base"
-        return HuggingFaceTextGenerator(api_key=api_key, model=model or default_model, **kwargs)
+        generator = HuggingFaceTextGenerator(api_key=api_key, model=model or default_model, **kwargs)
     else:
         raise ValueError(f"Unsupported provider: {provider}")
+
+    if max_batch_size:
+        return BatchingTextGenerator(generator, max_batch_size, batch_window_ms)
+    return generator
@@ -2,8 +2,13 @@
 Document service for managing documents across different storage backends.
 """
 import logging
-import uuid
-from datetime import datetime
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Tuple
 
 from personal_automation_bot.services.documents.drive_client import GoogleDriveClient
@@ -18,33 +23,263 @@ from personal_automation_bot.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for bulk operations, and how many calls they may start per
+# second; Drive allows roughly 10 write requests per second per user
+BULK_MAX_WORKERS = 5
+BULK_REQUESTS_PER_SECOND = 10
+
+# Credentials this close to expiry are fetched again so they get refreshed
+CREDENTIALS_EXPIRY_MARGIN = timedelta(seconds=60)
+
+
+def _credentials_fresh(credentials) -> bool:
+    """Check that credentials are valid and not about to expire."""
+    if not credentials.valid:
+        return False
+    if credentials.expiry is None:
+        return True
+    # google-auth keeps expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now > CREDENTIALS_EXPIRY_MARGIN
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat understands the trailing 'Z' of RFC 3339 timestamps
+    _parse_rfc3339 = datetime.fromisoformat
+else:
+    def _parse_rfc3339(value: str) -> datetime:
+        """Parse an RFC 3339 timestamp as returned by the Drive and Notion APIs."""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
+
+def _document_id(backend: StorageBackend, external_id: str) -> str:
+    """Build the in-memory document ID; stable for the same external document."""
+    return f"{backend.value}:{external_id}"
+
+
+def _drive_file_to_metadata(file_data: Dict[str, Any], title: Optional[str] = None,
+                            tags: Optional[List[str]] = None) -> DocumentMetadata:
+    """
+    Build document metadata from a Drive file resource.
+
+    Args:
+        file_data (Dict[str, Any]): File resource with the drive_client.FILE_FIELDS fields.
+        title (Optional[str]): Title to use instead of the file name.
+        tags (Optional[List[str]]): Document tags.
+
+    Returns:
+        DocumentMetadata: Document metadata.
+    """
+    mime_type = file_data.get('mimeType')
+    return DocumentMetadata(
+        id=_document_id(StorageBackend.GOOGLE_DRIVE, file_data['id']),
+        title=title or file_data['name'],
+        content_type=get_document_type_from_mime(mime_type or ''),
+        storage_backend=StorageBackend.GOOGLE_DRIVE,
+        external_id=file_data['id'],
+        size=int(file_data.get('size', 0)),
+        created_at=_parse_rfc3339(file_data['createdTime']),
+        updated_at=_parse_rfc3339(file_data['modifiedTime']),
+        tags=tags or [],
+        parent_folder_id=file_data.get('parents', [None])[0],
+        mime_type=mime_type
+    )
+
+
+def _extract_notion_title_tags(properties: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """
+    Extract the title and tags from a Notion page's properties.
+
+    Args:
+        properties (Dict[str, Any]): The page's "properties" object.
+
+    Returns:
+        Tuple[str, List[str]]: (title, tags); empty when the page has none.
+    """
+    title = ""
+    title_property = properties.get('Title') or {}
+    if title_property.get('type') == 'title':
+        title_array = title_property.get('title')
+        if title_array:
+            title = title_array[0].get('text', {}).get('content', '')
+
+    tags = []
+    tags_property = properties.get('Tags') or {}
+    if tags_property.get('type') == 'multi_select':
+        tags = [tag['name'] for tag in tags_property.get('multi_select', ())]
+
+    return title, tags
+
+
+class _RateLimiter:
+    """Spaces out calls from several threads to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may start its next call."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class DocumentService:
     """
     Service for managing documents across different storage backends.
     """
 
+    # How many users' Drive clients are kept
+    DRIVE_CLIENT_CACHE_SIZE = 128
+
+    # Seconds loaded credentials are reused, and how many users' are kept
+    CREDENTIALS_CACHE_TTL = 300
+    CREDENTIALS_CACHE_SIZE = 1024
+
+    # Seconds a document is served from memory, and how many are kept
+    MEMORY_CACHE_TTL = 60
+    MEMORY_CACHE_SIZE = 256
+
     def __init__(self):
         """Initialize the document service."""
         self.auth_manager = google_auth_manager
         self._notion_clients = {}  # Cache for Notion clients per user
         self.storage_manager = StorageManager()  # Unified storage manager
 
+        # Drive clients per user, least recently used first
+        self._drive_clients: "OrderedDict[int, GoogleDriveClient]" = OrderedDict()
+        self._drive_clients_lock = threading.Lock()
+
+        # Google credentials per user: user_id -> (loaded at, credentials), oldest first
+        self._credentials_cache: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._credentials_cache_lock = threading.Lock()
+
+        # Recently read documents in front of the storage manager's disk cache:
+        # (external_id, backend) -> (stored at, document), least recently used first
+        self._memory_cache: "OrderedDict[Tuple[str, StorageBackend], Tuple[float, Document]]" = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
+
+        # Drive app folder ID per user, so it is looked up only once
+        self._app_folder_ids: Dict[int, str] = {}
+
+    def _get_memory_cached(self, document_id: str, backend: StorageBackend) -> Optional[Document]:
+        """Return a document from the in-memory cache, or None if missing or expired."""
+        key = (document_id, backend)
+        with self._memory_cache_lock:
+            cached = self._memory_cache.get(key)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] >= self.MEMORY_CACHE_TTL:
+                del self._memory_cache[key]
+                return None
+            self._memory_cache.move_to_end(key)
+            return cached[1]
+
+    def _put_memory_cached(self, document: Document):
+        """Store a document in the in-memory cache, evicting the least recently used."""
+        key = (document.metadata.external_id, document.metadata.storage_backend)
+        with self._memory_cache_lock:
+            self._memory_cache[key] = (time.monotonic(), document)
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    def _drop_memory_cached(self, document_id: str, backend: StorageBackend):
+        """Remove a document from the in-memory cache."""
+        with self._memory_cache_lock:
+            self._memory_cache.pop((document_id, backend), None)
+
+    def _cached_credentials(self, user_id: int):
+        """
+        Get a user's Google credentials, loading them at most once per CREDENTIALS_CACHE_TTL.
+
+        Credentials close to expiry are loaded again so the auth manager can
+        refresh them.
+
+        Args:
+            user_id (int): Telegram user ID.
+
+        Returns:
+            Optional[Credentials]: Credentials or None if not authenticated.
+        """
+        now = time.monotonic()
+        with self._credentials_cache_lock:
+            cached = self._credentials_cache.get(user_id)
+            if (cached is not None and now - cached[0] < self.CREDENTIALS_CACHE_TTL
+                    and _credentials_fresh(cached[1])):
+                self._credentials_cache.move_to_end(user_id)
+                return cached[1]
+
+        credentials = self.auth_manager.get_user_credentials(user_id)
+
+        with self._credentials_cache_lock:
+            if credentials is None:
+                self._credentials_cache.pop(user_id, None)
+                return None
+            self._credentials_cache[user_id] = (now, credentials)
+            self._credentials_cache.move_to_end(user_id)
+            while len(self._credentials_cache) > self.CREDENTIALS_CACHE_SIZE:
+                self._credentials_cache.popitem(last=False)
+
+        return credentials
+
+    def invalidate_user(self, user_id: int):
+        """
+        Forget a user's cached credentials, clients and app folder.
+
+        Call after the user logs out or their tokens change.
+
+        Args:
+            user_id (int): Telegram user ID.
+        """
+        with self._credentials_cache_lock:
+            self._credentials_cache.pop(user_id, None)
+        with self._drive_clients_lock:
+            self._drive_clients.pop(user_id, None)
+        self._app_folder_ids.pop(user_id, None)
+
     def _get_drive_client(self, user_id: int) -> Optional[GoogleDriveClient]:
         """
         Get Google Drive client for a user.
 
+        Clients are cached per user while their credentials stay valid,
+        keeping at most DRIVE_CLIENT_CACHE_SIZE users (least recently used
+        are evicted first).
+
         Args:
             user_id (int): Telegram user ID.
 
         Returns:
             Optional[GoogleDriveClient]: Drive client or None if not authenticated.
         """
-        credentials = self.auth_manager.get_user_credentials(user_id)
+        with self._drive_clients_lock:
+            drive_client = self._drive_clients.get(user_id)
+            if drive_client is not None and _credentials_fresh(drive_client.credentials):
+                self._drive_clients.move_to_end(user_id)
+                return drive_client
+
+        # Missing or expiring: the auth manager refreshes and stores the tokens
+        credentials = self._cached_credentials(user_id)
         if not credentials:
+            with self._drive_clients_lock:
+                self._drive_clients.pop(user_id, None)
             return None
 
-        return GoogleDriveClient(credentials)
+        drive_client = GoogleDriveClient(credentials)
+        with self._drive_clients_lock:
+            self._drive_clients[user_id] = drive_client
+            self._drive_clients.move_to_end(user_id)
+            while len(self._drive_clients) > self.DRIVE_CLIENT_CACHE_SIZE:
+                self._drive_clients.popitem(last=False)
+
+        return drive_client
 
     def _get_notion_client(self, user_id: int) -> Optional[NotionClient]:
         """
@@ -66,6 +301,24 @@ class DocumentService:
 
         return self._notion_clients[user_id]
 
+    def _get_app_folder_id(self, user_id: int, drive_client: GoogleDriveClient) -> Optional[str]:
+        """
+        Get the user's Drive app folder ID, looking it up in Drive only the first time.
+
+        Args:
+            user_id (int): Telegram user ID.
+            drive_client (GoogleDriveClient): The user's Drive client.
+
+        Returns:
+            Optional[str]: App folder ID or None if it couldn't be found or created.
+        """
+        folder_id = self._app_folder_ids.get(user_id)
+        if folder_id is None:
+            folder_id = drive_client.create_app_folder()
+            if folder_id:
+                self._app_folder_ids[user_id] = folder_id
+        return folder_id
+
     def is_user_authenticated(self, user_id: int, backend: StorageBackend) -> bool:
         """
         Check if user is authenticated for a storage backend.
@@ -78,7 +331,8 @@ class DocumentService:
             bool: True if authenticated, False otherwise.
         """
         if backend == StorageBackend.GOOGLE_DRIVE:
-            return self.auth_manager.is_user_authenticated(user_id)
+            credentials = self._cached_credentials(user_id)
+            return credentials is not None and credentials.valid
         elif backend == StorageBackend.NOTION:
             return self._get_notion_client(user_id) is not None
         else:
@@ -116,6 +370,54 @@ class DocumentService:
             logger.error(f"Failed to create document '{title}': {e}")
             return None
 
+    def _run_bulk(self, fn, items: List[tuple], max_workers: int) -> list:
+        """
+        Call fn(*item) for every item on a thread pool, rate limited.
+
+        Returns:
+            list: Results in the same order as items.
+        """
+        if not items:
+            return []
+
+        limiter = _RateLimiter(BULK_REQUESTS_PER_SECOND)
+
+        def call(args):
+            limiter.wait()
+            return fn(*args)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(call, items))
+
+    def bulk_create_documents(self, user_id: int,
+                              items: List[Tuple[str, str, Optional[List[str]], Optional[str]]],
+                              backend: StorageBackend = StorageBackend.GOOGLE_DRIVE,
+                              max_workers: int = BULK_MAX_WORKERS) -> List[Optional[DocumentMetadata]]:
+        """
+        Create several documents concurrently.
+
+        Args:
+            user_id (int): Telegram user ID.
+            items (List[Tuple[str, str, Optional[List[str]], Optional[str]]]):
+                (title, content, tags, folder_id) for each document.
+            backend (StorageBackend): Storage backend to use.
+            max_workers (int): Maximum number of concurrent uploads.
+
+        Returns:
+            List[Optional[DocumentMetadata]]: Created document metadata, or None
+                for documents that failed, in the order of items.
+        """
+        if backend == StorageBackend.GOOGLE_DRIVE and any(not folder_id for *_, folder_id in items):
+            # Resolve the app folder once so workers don't race to create it
+            drive_client = self._get_drive_client(user_id)
+            if drive_client:
+                self._get_app_folder_id(user_id, drive_client)
+
+        def create(title, content, tags, folder_id):
+            return self.create_document(user_id, title, content, backend, tags, folder_id)
+
+        return self._run_bulk(create, items, max_workers)
+
     def _create_drive_document(self, user_id: int, title: str, content: str,
                               tags: Optional[List[str]] = None,
                               folder_id: Optional[str] = None) -> Optional[DocumentMetadata]:
@@ -126,8 +428,9 @@ class DocumentService:
             return None
 
         # Ensure we have an app folder
-        if not folder_id:
-            folder_id = drive_client.create_app_folder()
+        use_app_folder = not folder_id
+        if use_app_folder:
+            folder_id = self._get_app_folder_id(user_id, drive_client)
             if not folder_id:
                 logger.error("Failed to create/get app folder")
                 return None
@@ -136,39 +439,21 @@ class DocumentService:
         filename = f"{title}.txt"
         file_content = content.encode('utf-8')
 
-        external_id = drive_client.upload_file(
+        # The upload response already carries the file metadata
+        file_metadata = drive_client.create_file(
             file_content=file_content,
             filename=filename,
             parent_id=folder_id,
             mime_type='text/plain'
         )
 
-        if not external_id:
-            return None
-
-        # Get file metadata from Drive
-        file_metadata = drive_client.get_file_metadata(external_id)
         if not file_metadata:
+            if use_app_folder:
+                # The cached app folder may have been deleted; look it up again next time
+                self._app_folder_ids.pop(user_id, None)
             return None
 
-        # Create document metadata
-        doc_id = str(uuid.uuid4())
-        created_time = datetime.fromisoformat(file_metadata['createdTime'].replace('Z', '+00:00'))
-        modified_time = datetime.fromisoformat(file_metadata['modifiedTime'].replace('Z', '+00:00'))
-
-        metadata = DocumentMetadata(
-            id=doc_id,
-            title=title,
-            content_type=DocumentType.TEXT,
-            storage_backend=StorageBackend.GOOGLE_DRIVE,
-            external_id=external_id,
-            size=int(file_metadata.get('size', 0)),
-            created_at=created_time,
-            updated_at=modified_time,
-            tags=tags or [],
-            parent_folder_id=folder_id,
-            mime_type=file_metadata.get('mimeType')
-        )
+        metadata = _drive_file_to_metadata(file_metadata, title=title, tags=tags)
 
         logger.info(f"Created document '{title}' in Google Drive")
         return metadata
@@ -206,9 +491,9 @@ class DocumentService:
             return None
 
         # Create document metadata
-        doc_id = str(uuid.uuid4())
-        created_time = datetime.fromisoformat(page_data['created_time'].replace('Z', '+00:00'))
-        modified_time = datetime.fromisoformat(page_data['last_edited_time'].replace('Z', '+00:00'))
+        doc_id = _document_id(StorageBackend.NOTION, external_id)
+        created_time = _parse_rfc3339(page_data['created_time'])
+        modified_time = _parse_rfc3339(page_data['last_edited_time'])
 
         metadata = DocumentMetadata(
             id=doc_id,
@@ -242,10 +527,9 @@ class DocumentService:
         """
         try:
             # Check cache first if enabled
-            if use_cache and self.storage_manager.is_cache_valid(document_id, backend):
-                cached_doc = self.storage_manager.get_cached_document(document_id, backend)
+            if use_cache:
+                cached_doc = self._get_cached_document(document_id, backend)
                 if cached_doc:
-                    logger.info(f"Retrieved document '{document_id}' from cache")
                     return cached_doc
 
             # Get from backend
@@ -262,6 +546,7 @@ class DocumentService:
             # Cache document if retrieved successfully
             if document:
                 self.storage_manager.cache_document(document)
+                self._put_memory_cached(document)
 
             return document
 
@@ -269,14 +554,95 @@ class DocumentService:
             logger.error(f"Failed to get document '{document_id}': {e}")
             return None
 
-    def _get_drive_document(self, user_id: int, external_id: str) -> Optional[Document]:
-        """Get a document from Google Drive."""
+    def _get_cached_document(self, document_id: str, backend: StorageBackend) -> Optional[Document]:
+        """Get a document from memory, then from the storage manager's disk cache."""
+        cached_doc = self._get_memory_cached(document_id, backend)
+        if cached_doc:
+            return cached_doc
+
+        if self.storage_manager.is_cache_valid(document_id, backend):
+            cached_doc = self.storage_manager.get_cached_document(document_id, backend)
+            if cached_doc:
+                logger.info(f"Retrieved document '{document_id}' from cache")
+                self._put_memory_cached(cached_doc)
+                return cached_doc
+
+        return None
+
+    def bulk_get_documents(self, user_id: int, document_ids: List[str],
+                           backend: StorageBackend, use_cache: bool = True,
+                           max_workers: int = BULK_MAX_WORKERS) -> List[Optional[Document]]:
+        """
+        Get several documents concurrently.
+
+        For Google Drive, the metadata of every uncached document is looked
+        up in batched requests first, so only the downloads are made one
+        request per document.
+
+        Args:
+            user_id (int): Telegram user ID.
+            document_ids (List[str]): Document IDs.
+            backend (StorageBackend): Storage backend.
+            use_cache (bool): Whether to use cached documents if available.
+            max_workers (int): Maximum number of concurrent downloads.
+
+        Returns:
+            List[Optional[Document]]: Documents, or None for documents that
+                were not found, in the order of document_ids.
+        """
+        if backend == StorageBackend.GOOGLE_DRIVE:
+            return self._bulk_get_drive_documents(user_id, document_ids, use_cache, max_workers)
+
+        def get(document_id):
+            return self.get_document(user_id, document_id, backend, use_cache)
+
+        return self._run_bulk(get, [(document_id,) for document_id in document_ids], max_workers)
+
+    def _bulk_get_drive_documents(self, user_id: int, document_ids: List[str],
+                                  use_cache: bool, max_workers: int) -> List[Optional[Document]]:
+        """Get several Google Drive documents, batching the metadata lookups."""
+        backend = StorageBackend.GOOGLE_DRIVE
+        documents = {}
+        if use_cache:
+            for document_id in document_ids:
+                cached_doc = self._get_cached_document(document_id, backend)
+                if cached_doc:
+                    documents[document_id] = cached_doc
+
+        missing = [document_id for document_id in dict.fromkeys(document_ids) if document_id not in documents]
+        drive_client = self._get_drive_client(user_id) if missing else None
+        if drive_client:
+            files_metadata = drive_client.batch_get_metadata(missing)
+
+            def get(document_id):
+                try:
+                    document = self._get_drive_document(user_id, document_id, files_metadata.get(document_id))
+                    if document:
+                        self.storage_manager.cache_document(document)
+                        self._put_memory_cached(document)
+                    return document
+                except Exception as e:
+                    logger.error(f"Failed to get document '{document_id}': {e}")
+                    return None
+
+            found = [document_id for document_id in missing if document_id in files_metadata]
+            fetched = self._run_bulk(get, [(document_id,) for document_id in found], max_workers)
+            documents.update(
+                (document_id, document) for document_id, document in zip(found, fetched) if document
+            )
+
+        return [documents.get(document_id) for document_id in document_ids]
+
+    def _get_drive_document(self, user_id: int, external_id: str,
+                            file_metadata: Optional[Dict[str, Any]] = None) -> Optional[Document]:
+        """Get a document from Google Drive; pass file_metadata if it was already fetched."""
         drive_client = self._get_drive_client(user_id)
         if not drive_client:
             return None
 
         # Get file metadata
-        file_metadata = drive_client.get_file_metadata(external_id)
+        if file_metadata is None:
+            file_metadata = drive_client.get_file_metadata(external_id)
         if not file_metadata:
             return None
 
@@ -285,23 +651,7 @@ class DocumentService:
         if file_content is None:
             return None
 
-        # Create document metadata
-        doc_id = str(uuid.uuid4())
-        created_time = datetime.fromisoformat(file_metadata['createdTime'].replace('Z', '+00:00'))
-        modified_time = datetime.fromisoformat(file_metadata['modifiedTime'].replace('Z', '+00:00'))
-
-        metadata = DocumentMetadata(
-            id=doc_id,
-            title=file_metadata['name'],
-            content_type=get_document_type_from_mime(file_metadata.get('mimeType', '')),
-            storage_backend=StorageBackend.GOOGLE_DRIVE,
-            external_id=external_id,
-            size=int(file_metadata.get('size', 0)),
-            created_at=created_time,
-            updated_at=modified_time,
-            parent_folder_id=file_metadata.get('parents', [None])[0],
-            mime_type=file_metadata.get('mimeType')
-        )
+        metadata = _drive_file_to_metadata(file_metadata)
 
         # Decode text content if it's a text file
         text_content = None
@@ -333,24 +683,12 @@ class DocumentService:
         if text_content is None:
             text_content = ""
 
-        # Extract title from properties
-        title_property = page_data.get('properties', {}).get('Title', {})
-        title = ""
-        if title_property.get('type') == 'title':
-            title_array = title_property.get('title', [])
-            if title_array:
-                title = title_array[0].get('text', {}).get('content', '')
-
-        # Extract tags from properties
-        tags = []
-        tags_property = page_data.get('properties', {}).get('Tags', {})
-        if tags_property.get('type') == 'multi_select':
-            tags = [tag['name'] for tag in tags_property.get('multi_select', [])]
+        title, tags = _extract_notion_title_tags(page_data.get('properties', {}))
 
         # Create document metadata
-        doc_id = str(uuid.uuid4())
-        created_time = datetime.fromisoformat(page_data['created_time'].replace('Z', '+00:00'))
-        modified_time = datetime.fromisoformat(page_data['last_edited_time'].replace('Z', '+00:00'))
+        doc_id = _document_id(StorageBackend.NOTION, external_id)
+        created_time = _parse_rfc3339(page_data['created_time'])
+        modified_time = _parse_rfc3339(page_data['last_edited_time'])
 
         metadata = DocumentMetadata(
             id=doc_id,
@@ -390,6 +728,11 @@ class DocumentService:
         try:
             success = False
 
+            # Fresh cached copy to apply the update to, so it needn't be fetched again
+            previous = self._get_memory_cached(document_id, backend)
+            if previous is None and self.storage_manager.is_cache_valid(document_id, backend):
+                previous = self.storage_manager.get_cached_document(document_id, backend)
+
             if backend == StorageBackend.GOOGLE_DRIVE:
                 success = self._update_drive_document(user_id, document_id, title, content)
             elif backend == StorageBackend.NOTION:
@@ -402,11 +745,15 @@ class DocumentService:
             # Invalidate cache if update was successful
             if success:
                 self.storage_manager.invalidate_cache(document_id, backend)
+                self._drop_memory_cached(document_id, backend)
 
-                # Re-cache the updated document
-                updated_doc = self.get_document(user_id, document_id, backend, use_cache=False)
-                if updated_doc:
+                # Re-cache the updated document; get_document caches what it fetches
+                if previous:
+                    updated_doc = self._apply_update(previous, title, content, tags)
                     self.storage_manager.cache_document(updated_doc)
+                    self._put_memory_cached(updated_doc)
+                else:
+                    self.get_document(user_id, document_id, backend, use_cache=False)
 
             return success
 
@@ -414,6 +761,50 @@ class DocumentService:
             logger.error(f"Failed to update document '{document_id}': {e}")
             return False
 
+    @staticmethod
+    def _apply_update(document: Document, title: Optional[str] = None,
+                      content: Optional[str] = None,
+                      tags: Optional[List[str]] = None) -> Document:
+        """
+        Build the updated version of a document the way the backend stores it.
+
+        Args:
+            document (Document): Document before the update.
+            title (Optional[str]): New title.
+            content (Optional[str]): New content.
+            tags (Optional[List[str]]): New tags.
+
+        Returns:
+            Document: Updated document.
+        """
+        metadata = document.metadata
+        is_drive = metadata.storage_backend == StorageBackend.GOOGLE_DRIVE
+        changes = {'updated_at': datetime.now(timezone.utc)}
+
+        if title:
+            # Drive documents are stored as "<title>.txt" files
+            changes['title'] = f"{title}.txt" if is_drive else title
+
+        if tags and not is_drive:
+            changes['tags'] = list(tags)
+
+        if not content:
+            return Document(
+                metadata=replace(metadata, **changes),
+                content=document.content,
+                text_content=document.text_content
+            )
+
+        file_content = content.encode('utf-8')
+        if metadata.size is not None:
+            changes['size'] = len(file_content)
+
+        return Document(
+            metadata=replace(metadata, **changes),
+            content=file_content,
+            text_content=content
+        )
+
     def _update_drive_document(self, user_id: int, external_id: str,
                               title: Optional[str] = None,
                               content: Optional[str] = None) -> bool:
@@ -481,6 +872,7 @@ class DocumentService:
             # Invalidate cache if deletion was successful
             if success:
                 self.storage_manager.invalidate_cache(document_id, backend)
+                self._drop_memory_cached(document_id, backend)
 
             return success
 
@@ -488,6 +880,47 @@ class DocumentService:
             logger.error(f"Failed to delete document '{document_id}': {e}")
             return False
 
+    def bulk_delete_documents(self, user_id: int, document_ids: List[str],
+                              backend: StorageBackend,
+                              max_workers: int = BULK_MAX_WORKERS) -> List[bool]:
+        """
+        Delete several documents.
+
+        Drive documents are deleted with batch requests; other backends
+        delete documents concurrently.
+
+        Args:
+            user_id (int): Telegram user ID.
+            document_ids (List[str]): Document IDs (external_id for Drive).
+            backend (StorageBackend): Storage backend.
+            max_workers (int): Maximum number of concurrent deletions.
+
+        Returns:
+            List[bool]: Whether each deletion succeeded, in the order of document_ids.
+        """
+        if backend != StorageBackend.GOOGLE_DRIVE:
+            def delete(document_id):
+                return self.delete_document(user_id, document_id, backend)
+
+            return self._run_bulk(delete, [(document_id,) for document_id in document_ids], max_workers)
+
+        drive_client = self._get_drive_client(user_id)
+        if not drive_client or not document_ids:
+            return [False] * len(document_ids)
+
+        try:
+            deleted = drive_client.batch_delete_files(document_ids)
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return [False] * len(document_ids)
+
+        for document_id, success in deleted.items():
+            if success:
+                self.storage_manager.invalidate_cache(document_id, backend)
+                self._drop_memory_cached(document_id, backend)
+
+        return [deleted[document_id] for document_id in document_ids]
+
     def _delete_drive_document(self, user_id: int, external_id: str) -> bool:
         """Delete a document from Google Drive."""
         drive_client = self._get_drive_client(user_id)
@@ -542,38 +975,13 @@ class DocumentService:
 
         # If no folder specified, use app folder
         if not folder_id:
-            folder_id = drive_client.create_app_folder()
+            folder_id = self._get_app_folder_id(user_id, drive_client)
             if not folder_id:
                 return []
 
-        files = drive_client.list_files(parent_id=folder_id, max_results=max_results)
-        documents = []
-
-        for file_data in files:
-            # Skip folders
-            if file_data.get('mimeType') == 'application/vnd.google-apps.folder':
-                continue
-
-            doc_id = str(uuid.uuid4())
-            created_time = datetime.fromisoformat(file_data['createdTime'].replace('Z', '+00:00'))
-            modified_time = datetime.fromisoformat(file_data['modifiedTime'].replace('Z', '+00:00'))
-
-            metadata = DocumentMetadata(
-                id=doc_id,
-                title=file_data['name'],
-                content_type=get_document_type_from_mime(file_data.get('mimeType', '')),
-                storage_backend=StorageBackend.GOOGLE_DRIVE,
-                external_id=file_data['id'],
-                size=int(file_data.get('size', 0)),
-                created_at=created_time,
-                updated_at=modified_time,
-                parent_folder_id=file_data.get('parents', [None])[0],
-                mime_type=file_data.get('mimeType')
-            )
-
-            documents.append(metadata)
-
-        return documents
+        files = drive_client.list_files(parent_id=folder_id, max_results=max_results,
+                                        exclude_folders=True)
+        return [_drive_file_to_metadata(file_data) for file_data in files]
 
     def search_documents(self, user_id: int, query: str,
                         backend: StorageBackend,
@@ -590,7 +998,7 @@ class DocumentService:
         Returns:
             SearchResult: Search results.
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
 
         try:
             if backend == StorageBackend.GOOGLE_DRIVE:
@@ -602,7 +1010,7 @@ class DocumentService:
                 logger.warning("Local backend not yet implemented")
                 documents = []
 
-            search_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            search_time = (time.perf_counter_ns() - start_time) // 1_000_000
 
             return SearchResult(
                 documents=documents,
@@ -614,7 +1022,7 @@ class DocumentService:
 
         except Exception as e:
             logger.error(f"Failed to search documents: {e}")
-            search_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            search_time = (time.perf_counter_ns() - start_time) // 1_000_000
             return SearchResult(
                 documents=[],
                 total_count=0,
@@ -630,33 +1038,7 @@ class DocumentService:
             return []
 
         files = drive_client.search_files(query, max_results)
-        documents = []
-
-        for file_data in files:
-            # Skip folders
-            if file_data.get('mimeType') == 'application/vnd.google-apps.folder':
-                continue
-
-            doc_id = str(uuid.uuid4())
-            created_time = datetime.fromisoformat(file_data['createdTime'].replace('Z', '+00:00'))
-            modified_time = datetime.fromisoformat(file_data['modifiedTime'].replace('Z', '+00:00'))
-
-            metadata = DocumentMetadata(
-                id=doc_id,
-                title=file_data['name'],
-                content_type=get_document_type_from_mime(file_data.get('mimeType', '')),
-                storage_backend=StorageBackend.GOOGLE_DRIVE,
-                external_id=file_data['id'],
-                size=int(file_data.get('size', 0)),
-                created_at=created_time,
-                updated_at=modified_time,
-                parent_folder_id=file_data.get('parents', [None])[0],
-                mime_type=file_data.get('mimeType')
-            )
-
-            documents.append(metadata)
-
-        return documents
+        return [_drive_file_to_metadata(file_data) for file_data in files]
 
     def get_storage_quota(self, user_id: int, backend: StorageBackend) -> Optional[StorageQuota]:
         """
@@ -725,23 +1107,11 @@ class DocumentService:
         documents = []
 
         for page_data in pages:
-            # Extract title from properties
-            title_property = page_data.get('properties', {}).get('Title', {})
-            title = ""
-            if title_property.get('type') == 'title':
-                title_array = title_property.get('title', [])
-                if title_array:
-                    title = title_array[0].get('text', {}).get('content', '')
-
-            # Extract tags from properties
-            tags = []
-            tags_property = page_data.get('properties', {}).get('Tags', {})
-            if tags_property.get('type') == 'multi_select':
-                tags = [tag['name'] for tag in tags_property.get('multi_select', [])]
-
-            doc_id = str(uuid.uuid4())
-            created_time = datetime.fromisoformat(page_data['created_time'].replace('Z', '+00:00'))
-            modified_time = datetime.fromisoformat(page_data['last_edited_time'].replace('Z', '+00:00'))
+            title, tags = _extract_notion_title_tags(page_data.get('properties', {}))
+
+            doc_id = _document_id(StorageBackend.NOTION, page_data['id'])
+            created_time = _parse_rfc3339(page_data['created_time'])
+            modified_time = _parse_rfc3339(page_data['last_edited_time'])
 
             metadata = DocumentMetadata(
                 id=doc_id,
@@ -775,23 +1145,11 @@ class DocumentService:
             if page_data.get('object') != 'page':
                 continue
 
-            # Extract title from properties
-            title_property = page_data.get('properties', {}).get('Title', {})
-            title = ""
-            if title_property.get('type') == 'title':
-                title_array = title_property.get('title', [])
-                if title_array:
-                    title = title_array[0].get('text', {}).get('content', '')
+            title, tags = _extract_notion_title_tags(page_data.get('properties', {}))
 
-            # Extract tags from properties
-            tags = []
-            tags_property = page_data.get('properties', {}).get('Tags', {})
-            if tags_property.get('type') == 'multi_select':
-                tags = [tag['name'] for tag in tags_property.get('multi_select', [])]
-
-            doc_id = str(uuid.uuid4())
-            created_time = datetime.fromisoformat(page_data['created_time'].replace('Z', '+00:00'))
-            modified_time = datetime.fromisoformat(page_data['last_edited_time'].replace('Z', '+00:00'))
+            doc_id = _document_id(StorageBackend.NOTION, page_data['id'])
+            created_time = _parse_rfc3339(page_data['created_time'])
+            modified_time = _parse_rfc3339(page_data['last_edited_time'])
 
             metadata = DocumentMetadata(
                 id=doc_id,
@@ -825,6 +1183,13 @@ class DocumentService:
             backend (Optional[StorageBackend]): Storage backend to clear cache for.
                 If None, clears cache for all backends.
         """
+        with self._memory_cache_lock:
+            if backend is None:
+                self._memory_cache.clear()
+            else:
+                for key in [key for key in self._memory_cache if key[1] == backend]:
+                    del self._memory_cache[key]
+
         self.storage_manager.clear_cache(backend)
 
     def sync_documents(self, user_id: int, backend: StorageBackend) -> Tuple[int, int, int]:
@@ -848,7 +1213,7 @@ class DocumentService:
                 # For Drive, we need to get app folder first
                 drive_client = self._get_drive_client(user_id)
                 if drive_client:
-                    folder_id = drive_client.create_app_folder()
+                    folder_id = self._get_app_folder_id(user_id, drive_client)
                     if folder_id:
                         remote_docs = self.list_documents(user_id, backend, folder_id)
             elif backend == StorageBackend.NOTION:
@@ -6,13 +6,33 @@ import mimetypes
 from typing import List, Dict, Any, Optional, BinaryIO
 from io import BytesIO
 
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
 from google.oauth2.credentials import Credentials
 
+from personal_automation_bot.utils.google_api import API_MODEL, ThreadLocalHttp
+
 logger = logging.getLogger(__name__)
 
+# Metadata fields needed to build a DocumentMetadata without a follow-up request
+FILE_FIELDS = "id, name, mimeType, size, createdTime, modifiedTime, parents"
+
+# Drive rejects batch requests with more than 100 calls; large delete batches
+# tend to fail with server errors, so those are sent in smaller ones
+MAX_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 25
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Socket timeout in seconds for Drive API requests; uploads can be slow
+HTTP_TIMEOUT = 60
+
+
+# Transport shared by every user's client; credentials are added per client
+_SHARED_HTTP = ThreadLocalHttp(HTTP_TIMEOUT)
+
 
 class GoogleDriveClient:
     """
@@ -23,11 +43,16 @@ class GoogleDriveClient:
         """
         Initialize the Google Drive client.
 
+        The client reuses keep-alive connections from a shared per-thread
+        transport, so it is cheap to keep around and safe to use from
+        several threads.
+
         Args:
             credentials (Credentials): Google OAuth2 credentials.
         """
         self.credentials = credentials
-        self.service = build('drive', 'v3', credentials=credentials)
+        self.service = build('drive', 'v3', http=AuthorizedHttp(credentials, http=_SHARED_HTTP),
+                             model=API_MODEL, cache_discovery=False)
 
     def create_folder(self, name: str, parent_id: Optional[str] = None) -> Optional[str]:
         """
@@ -43,7 +68,7 @@ class GoogleDriveClient:
         try:
             folder_metadata = {
                 'name': name,
-                'mimeType': 'application/vnd.google-apps.folder'
+                'mimeType': FOLDER_MIME_TYPE
             }
 
             if parent_id:
@@ -77,6 +102,27 @@ class GoogleDriveClient:
         Returns:
             Optional[str]: ID of the uploaded file, or None if upload failed.
         """
+        file = self.create_file(file_content, filename, parent_id, mime_type)
+        return file.get('id') if file else None
+
+    def create_file(self, file_content: bytes, filename: str,
+                    parent_id: Optional[str] = None,
+                    mime_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Upload a file to Google Drive and return its metadata.
+
+        The metadata comes back in the upload response itself, so callers
+        don't need a separate get_file_metadata round trip.
+
+        Args:
+            file_content (bytes): Content of the file to upload.
+            filename (str): Name of the file.
+            parent_id (Optional[str]): ID of the parent folder.
+            mime_type (Optional[str]): MIME type of the file. Auto-detected if None.
+
+        Returns:
+            Optional[Dict[str, Any]]: Metadata of the uploaded file, or None if upload failed.
+        """
         try:
             if mime_type is None:
                 mime_type, _ = mimetypes.guess_type(filename)
@@ -96,12 +142,11 @@ class GoogleDriveClient:
             file = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id'
+                fields=FILE_FIELDS
             ).execute()
 
-            file_id = file.get('id')
-            logger.info(f"Uploaded file '{filename}' with ID: {file_id}")
-            return file_id
+            logger.info(f"Uploaded file '{filename}' with ID: {file.get('id')}")
+            return file
 
         except HttpError as e:
             logger.error(f"Failed to upload file '{filename}': {e}")
@@ -136,7 +181,8 @@ class GoogleDriveClient:
 
     def list_files(self, parent_id: Optional[str] = None,
                    query: Optional[str] = None,
-                   max_results: int = 100) -> List[Dict[str, Any]]:
+                   max_results: int = 100,
+                   exclude_folders: bool = False) -> List[Dict[str, Any]]:
         """
         List files in Google Drive.
 
@@ -144,6 +190,7 @@ class GoogleDriveClient:
             parent_id (Optional[str]): ID of the parent folder. If None, lists from root.
             query (Optional[str]): Search query to filter files.
             max_results (int): Maximum number of results to return.
+            exclude_folders (bool): Leave folders out of the results.
 
         Returns:
             List[Dict[str, Any]]: List of file metadata.
@@ -156,7 +203,10 @@ class GoogleDriveClient:
                 query_parts.append(f"'{parent_id}' in parents")
 
             if query:
-                query_parts.append(query)
+                query_parts.append(f"({query})")
+
+            if exclude_folders:
+                query_parts.append(f"mimeType != '{FOLDER_MIME_TYPE}'")
 
             # Exclude trashed files
             query_parts.append("trashed=false")
@@ -166,7 +216,7 @@ class GoogleDriveClient:
             results = self.service.files().list(
                 q=full_query,
                 pageSize=max_results,
-                fields="nextPageToken, files(id, name, mimeType, size, createdTime, modifiedTime, parents)"
+                fields=f"nextPageToken, files({FILE_FIELDS})"
             ).execute()
 
             files = results.get('files', [])
@@ -179,7 +229,7 @@ class GoogleDriveClient:
 
     def search_files(self, search_term: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """
-        Search for files by name or content.
+        Search for files (not folders) by name or content.
 
         Args:
             search_term (str): Term to search for.
@@ -190,7 +240,7 @@ class GoogleDriveClient:
         """
         try:
             query = f"name contains '{search_term}' or fullText contains '{search_term}'"
-            return self.list_files(query=query, max_results=max_results)
+            return self.list_files(query=query, max_results=max_results, exclude_folders=True)
 
         except Exception as e:
             logger.error(f"Failed to search files for term '{search_term}': {e}")
@@ -209,7 +259,7 @@ class GoogleDriveClient:
         try:
             file = self.service.files().get(
                 fileId=file_id,
-                fields="id, name, mimeType, size, createdTime, modifiedTime, parents, description"
+                fields=f"{FILE_FIELDS}, description"
             ).execute()
 
             logger.info(f"Retrieved metadata for file: {file.get('name')}")
@@ -219,6 +269,48 @@ class GoogleDriveClient:
             logger.error(f"Failed to get metadata for file ID '{file_id}': {e}")
             return None
 
+    def batch_get_metadata(self, file_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for several files using Drive batch requests.
+
+        All lookups travel in one HTTP request per MAX_BATCH_SIZE files
+        instead of one request per file.
+
+        Args:
+            file_ids (List[str]): IDs of the files.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: File metadata keyed by file ID. Files
+                that could not be retrieved are left out.
+        """
+        metadata = {}
+
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Failed to get metadata for file ID '{request_id}': {exception}")
+            else:
+                metadata[request_id] = response
+
+        # Batch request IDs must be unique
+        unique_ids = list(dict.fromkeys(file_ids))
+
+        try:
+            for start in range(0, len(unique_ids), MAX_BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=_callback)
+                for file_id in unique_ids[start:start + MAX_BATCH_SIZE]:
+                    batch.add(
+                        self.service.files().get(fileId=file_id, fields=FILE_FIELDS),
+                        request_id=file_id
+                    )
+                batch.execute()
+
+            logger.info(f"Retrieved metadata for {len(metadata)} of {len(unique_ids)} files")
+
+        except HttpError as e:
+            logger.error(f"Failed to execute metadata batch request: {e}")
+
+        return metadata
+
     def update_file(self, file_id: str, file_content: Optional[bytes] = None,
                    metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -273,6 +365,38 @@ class GoogleDriveClient:
             logger.error(f"Failed to delete file with ID '{file_id}': {e}")
             return False
 
+    def batch_delete_files(self, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several files using Drive batch requests of DELETE_BATCH_SIZE files.
+
+        Args:
+            file_ids (List[str]): IDs of the files to delete.
+
+        Returns:
+            Dict[str, bool]: Whether each file was deleted, keyed by file ID.
+        """
+        # Batch request IDs must be unique
+        results = dict.fromkeys(file_ids, False)
+
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Failed to delete file with ID '{request_id}': {exception}")
+            else:
+                results[request_id] = True
+
+        unique_ids = list(results)
+        for start in range(0, len(unique_ids), DELETE_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=_callback)
+            for file_id in unique_ids[start:start + DELETE_BATCH_SIZE]:
+                batch.add(self.service.files().delete(fileId=file_id), request_id=file_id)
+            try:
+                batch.execute()
+            except HttpError as e:
+                logger.error(f"Failed to execute delete batch request: {e}")
+
+        logger.info(f"Deleted {sum(results.values())} of {len(unique_ids)} files")
+        return results
+
     def create_app_folder(self, app_name: str = "PersonalAutomationBot") -> Optional[str]:
         """
         Create or get the application folder in Google Drive.
@@ -286,7 +410,7 @@ class GoogleDriveClient:
         try:
             # Search for existing app folder
             existing_folders = self.list_files(
-                query=f"name='{app_name}' and mimeType='application/vnd.google-apps.folder'"
+                query=f"name='{app_name}' and mimeType='{FOLDER_MIME_TYPE}'"
             )
 
             if existing_folders:
@@ -4,6 +4,7 @@ Unified storage manager for document management across different backends.
 import logging
 import json
 import os
+import threading
 import time
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
@@ -51,6 +52,9 @@ class StorageManager:
         self.metadata_index_path = os.path.join(self.cache_dir, "metadata_index.json")
         self.metadata_index = self._load_metadata_index()
 
+        # Serializes index updates, which may come from several worker threads
+        self._lock = threading.RLock()
+
     def _load_metadata_index(self) -> Dict[str, Any]:
         """
         Load metadata index from disk.
@@ -98,38 +102,39 @@ class StorageManager:
         Args:
             document (Document): Document to cache.
         """
-        try:
-            # Cache document content
-            cache_path = self._get_cache_path(
-                document.metadata.external_id,
-                document.metadata.storage_backend
-            )
+        with self._lock:
+            try:
+                # Cache document content
+                cache_path = self._get_cache_path(
+                    document.metadata.external_id,
+                    document.metadata.storage_backend
+                )
 
-            # Save document content
-            with open(cache_path, 'wb') as f:
-                f.write(document.content or b'')
+                # Save document content
+                with open(cache_path, 'wb') as f:
+                    f.write(document.content or b'')
 
-            # Update metadata index
-            doc_id = document.metadata.external_id
-            backend = document.metadata.storage_backend.value
+                # Update metadata index
+                doc_id = document.metadata.external_id
+                backend = document.metadata.storage_backend.value
 
-            if backend not in self.metadata_index["documents"]:
-                self.metadata_index["documents"][backend] = {}
+                if backend not in self.metadata_index["documents"]:
+                    self.metadata_index["documents"][backend] = {}
 
-            self.metadata_index["documents"][backend][doc_id] = document.metadata.to_dict()
+                self.metadata_index["documents"][backend][doc_id] = document.metadata.to_dict()
 
-            if backend not in self.metadata_index["last_updated"]:
-                self.metadata_index["last_updated"][backend] = {}
+                if backend not in self.metadata_index["last_updated"]:
+                    self.metadata_index["last_updated"][backend] = {}
 
-            self.metadata_index["last_updated"][backend][doc_id] = datetime.now().isoformat()
+                self.metadata_index["last_updated"][backend][doc_id] = datetime.now().isoformat()
 
-            # Save metadata index
-            self._save_metadata_index()
+                # Save metadata index
+                self._save_metadata_index()
 
-            logger.info(f"Cached document {document.metadata.title} ({doc_id})")
+                logger.info(f"Cached document {document.metadata.title} ({doc_id})")
 
-        except Exception as e:
-            logger.error(f"Failed to cache document {document.metadata.title}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to cache document {document.metadata.title}: {e}")
 
     def get_cached_document(self, document_id: str,
                            backend: StorageBackend) -> Optional[Document]:
@@ -201,30 +206,31 @@ class StorageManager:
             document_id (str): Document ID.
             backend (StorageBackend): Storage backend.
         """
-        try:
-            backend_str = backend.value
+        with self._lock:
+            try:
+                backend_str = backend.value
 
-            # Remove from metadata index
-            if (backend_str in self.metadata_index["documents"] and
-                document_id in self.metadata_index["documents"][backend_str]):
-                del self.metadata_index["documents"][backend_str][document_id]
+                # Remove from metadata index
+                if (backend_str in self.metadata_index["documents"] and
+                    document_id in self.metadata_index["documents"][backend_str]):
+                    del self.metadata_index["documents"][backend_str][document_id]
 
-            if (backend_str in self.metadata_index["last_updated"] and
-                document_id in self.metadata_index["last_updated"][backend_str]):
-                del self.metadata_index["last_updated"][backend_str][document_id]
+                if (backend_str in self.metadata_index["last_updated"] and
+                    document_id in self.metadata_index["last_updated"][backend_str]):
+                    del self.metadata_index["last_updated"][backend_str][document_id]
 
-            # Remove cache file
-            cache_path = self._get_cache_path(document_id, backend)
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
+                # Remove cache file
+                cache_path = self._get_cache_path(document_id, backend)
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
 
-            # Save metadata index
-            self._save_metadata_index()
+                # Save metadata index
+                self._save_metadata_index()
 
-            logger.info(f"Invalidated cache for document {document_id}")
+                logger.info(f"Invalidated cache for document {document_id}")
 
-        except Exception as e:
-            logger.error(f"Failed to invalidate cache for document {document_id}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to invalidate cache for document {document_id}: {e}")
 
     def is_cache_valid(self, document_id: str, backend: StorageBackend) -> bool:
         """
@@ -302,42 +308,43 @@ class StorageManager:
             backend (Optional[StorageBackend]): Storage backend to clear cache for.
                 If None, clears cache for all backends.
         """
-        try:
-            if backend:
-                backend_str = backend.value
+        with self._lock:
+            try:
+                if backend:
+                    backend_str = backend.value
 
-                # Remove from metadata index
-                if backend_str in self.metadata_index["documents"]:
-                    del self.metadata_index["documents"][backend_str]
+                    # Remove from metadata index
+                    if backend_str in self.metadata_index["documents"]:
+                        del self.metadata_index["documents"][backend_str]
 
-                if backend_str in self.metadata_index["last_updated"]:
-                    del self.metadata_index["last_updated"][backend_str]
+                    if backend_str in self.metadata_index["last_updated"]:
+                        del self.metadata_index["last_updated"][backend_str]
 
-                # Remove cache files
-                backend_dir = os.path.join(self.cache_dir, backend_str)
-                if os.path.exists(backend_dir):
-                    for file in os.listdir(backend_dir):
-                        os.remove(os.path.join(backend_dir, file))
+                    # Remove cache files
+                    backend_dir = os.path.join(self.cache_dir, backend_str)
+                    if os.path.exists(backend_dir):
+                        for file in os.listdir(backend_dir):
+                            os.remove(os.path.join(backend_dir, file))
 
-                logger.info(f"Cleared cache for backend {backend}")
-            else:
-                # Clear all cache
-                self.metadata_index = {"documents": {}, "last_updated": {}}
+                    logger.info(f"Cleared cache for backend {backend}")
+                else:
+                    # Clear all cache
+                    self.metadata_index = {"documents": {}, "last_updated": {}}
 
-                # Remove all cache files
-                for item in os.listdir(self.cache_dir):
-                    item_path = os.path.join(self.cache_dir, item)
-                    if os.path.isdir(item_path):
-                        for file in os.listdir(item_path):
-                            os.remove(os.path.join(item_path, file))
+                    # Remove all cache files
+                    for item in os.listdir(self.cache_dir):
+                        item_path = os.path.join(self.cache_dir, item)
+                        if os.path.isdir(item_path):
+                            for file in os.listdir(item_path):
+                                os.remove(os.path.join(item_path, file))
 
-                logger.info("Cleared all cache")
+                    logger.info("Cleared all cache")
 
-            # Save metadata index
-            self._save_metadata_index()
+                # Save metadata index
+                self._save_metadata_index()
 
-        except Exception as e:
-            logger.error(f"Failed to clear cache: {e}")
+            except Exception as e:
+                logger.error(f"Failed to clear cache: {e}")
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
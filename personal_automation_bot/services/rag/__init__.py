@@ -24,6 +24,7 @@ try:
     from personal_automation_bot.services.rag.indexer import DocumentIndexer
     from personal_automation_bot.services.rag.retriever import DocumentRetriever
     from personal_automation_bot.services.rag.document_indexer import DocumentIndexingService
+    from personal_automation_bot.services.rag.semantic_cache import SemanticCache
 
     __all__ = [
         'VectorStore',
@@ -33,6 +34,7 @@ try:
         'DocumentIndexer',
         'DocumentRetriever',
         'DocumentIndexingService',
+        'SemanticCache',
         'DocumentProcessor',
         'TextProcessor',
         'PDFProcessor',
@@ -5,7 +5,8 @@ import os
 import logging
 import hashlib
 import json
-from typing import Dict, Any, List, Optional, Union, Tuple
+import threading
+from typing import Dict, Any, List, Optional, Union, Tuple, BinaryIO, Callable
 import time
 
 from personal_automation_bot.services.rag.indexer import DocumentIndexer
@@ -47,6 +48,10 @@ class DocumentIndexingService:
         self.document_cache_path = os.path.join(cache_dir, "document_cache.json")
         self.document_cache = self._load_document_cache()
 
+        # Indexing may run in worker threads; the document cache and the
+        # vector store are shared, so documents are indexed one at a time
+        self._lock = threading.RLock()
+
     def _load_document_cache(self) -> Dict[str, Dict[str, Any]]:
         """Load document cache from disk."""
         if os.path.exists(self.document_cache_path):
@@ -110,22 +115,69 @@ class DocumentIndexingService:
         if not self.is_supported_file(file_path):
             raise ValueError(f"Unsupported file type: {file_path}")
 
-        # Check cache
         doc_id = os.path.abspath(file_path)
         doc_hash = self._compute_document_hash(file_path)
 
-        if not force and doc_id in self.document_cache and self.document_cache[doc_id].get("hash") == doc_hash:
-            logger.info(f"Document {file_path} hasn't changed, using cached version")
-            return self.document_cache[doc_id]["document"]
+        return self._process(
+            doc_id, doc_hash, file_path,
+            lambda processor: processor.process_file(file_path),
+            force
+        )
+
+    def process_stream(self, stream: BinaryIO, file_name: str, force: bool = False,
+                       doc_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process an in-memory document and extract text and metadata.
+
+        Args:
+            stream: Binary stream with the document content
+            file_name: Name of the document, shown as its source and used to pick a processor
+            force: Force processing even if the document hasn't changed
+            doc_id: Document ID used as the cache key; defaults to file_name
+
+        Returns:
+            Processed document with text and metadata
+        """
+        if not self.is_supported_file(file_name):
+            raise ValueError(f"Unsupported file type: {file_name}")
+
+        content = stream.read()
+
+        return self._process(
+            doc_id or file_name, hashlib.md5(content).hexdigest(), file_name,
+            lambda processor: processor.process_binary(content, file_name),
+            force
+        )
+
+    def _process(self, doc_id: str, doc_hash: str, file_name: str,
+                 process: Callable[[Any], Dict[str, Any]], force: bool) -> Dict[str, Any]:
+        """
+        Process a document unless the cached version is still current.
+
+        Args:
+            doc_id: Document ID used as the cache key
+            doc_hash: Hash of the document content
+            file_name: Name or path of the document, used to pick a processor
+            process: Called with the processor to extract the document
+            force: Force processing even if the document hasn't changed
+
+        Returns:
+            Processed document with text and metadata
+        """
+        with self._lock:
+            cached = self.document_cache.get(doc_id)
+            if not force and cached and cached.get("hash") == doc_hash:
+                logger.info(f"Document {file_name} hasn't changed, using cached version")
+                return cached["document"]
 
         # Get appropriate processor
-        processor = get_document_processor(file_path)
+        processor = get_document_processor(file_name)
         if not processor:
-            raise ValueError(f"No processor available for {file_path}")
+            raise ValueError(f"No processor available for {file_name}")
 
         # Process document
         start_time = time.time()
-        document = processor.process_file(file_path)
+        document = process(processor)
         processing_time = time.time() - start_time
 
         # Add additional metadata
@@ -135,14 +187,15 @@ class DocumentIndexingService:
         document["indexed_at"] = time.time()
 
         # Update cache
-        self.document_cache[doc_id] = {
-            "hash": doc_hash,
-            "document": document,
-            "last_indexed": time.time()
-        }
-        self._save_document_cache()
-
-        logger.info(f"Processed document {file_path} in {processing_time:.2f}s")
+        with self._lock:
+            self.document_cache[doc_id] = {
+                "hash": doc_hash,
+                "document": document,
+                "last_indexed": time.time()
+            }
+            self._save_document_cache()
+
+        logger.info(f"Processed document {file_name} in {processing_time:.2f}s")
         return document
 
     def index_document(self, file_path: str, force: bool = False) -> List[str]:
@@ -159,15 +212,43 @@ class DocumentIndexingService:
         if not self.indexer:
             raise ValueError("No indexer provided")
 
-        # Process document
-        document = self.process_document(file_path, force=force)
+        with self._lock:
+            # Process document
+            document = self.process_document(file_path, force=force)
 
-        # Index document
-        chunk_ids = self.indexer.index_document(document)
+            # Index document
+            chunk_ids = self.indexer.index_document(document)
 
         logger.info(f"Indexed document {file_path} into {len(chunk_ids)} chunks")
         return chunk_ids
 
+    def index_stream(self, stream: BinaryIO, file_name: str, force: bool = False,
+                     doc_id: Optional[str] = None) -> List[str]:
+        """
+        Index an in-memory document, e.g. one downloaded from Telegram.
+
+        Args:
+            stream: Binary stream with the document content
+            file_name: Name of the document, shown as its source
+            force: Force indexing even if the document hasn't changed
+            doc_id: Document ID used as the cache key; defaults to file_name
+
+        Returns:
+            List of chunk IDs
+        """
+        if not self.indexer:
+            raise ValueError("No indexer provided")
+
+        with self._lock:
+            # Process document
+            document = self.process_stream(stream, file_name, force=force, doc_id=doc_id)
+
+            # Index document
+            chunk_ids = self.indexer.index_document(document)
+
+        logger.info(f"Indexed document {file_name} into {len(chunk_ids)} chunks")
+        return chunk_ids
+
     def index_directory(
         self,
         directory: str,
@@ -102,7 +102,9 @@ class DocumentProcessor(ABC):
         # Default implementation saves to a temporary file and processes it
         import tempfile
 
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        # Keep the extension so can_process() still recognizes the file
+        _, ext = os.path.splitext(file_name)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
             temp_file.write(file_content)
             temp_path = temp_file.name
 
@@ -4,6 +4,7 @@ Handles processing documents and creating embeddings.
 """
 import os
 import logging
+import threading
 from typing import List, Dict, Any, Optional, Union, Callable
 import hashlib
 import json
@@ -61,6 +62,10 @@ class DocumentIndexer:
         )
         self.document_cache = self._load_document_cache()
 
+        # Serializes changes to the vector store and the document cache,
+        # which callers may make from several worker threads
+        self._lock = threading.RLock()
+
     def _init_embedding_model(self, model_name: str) -> None:
         """Initialize the embedding model."""
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
@@ -177,12 +182,13 @@ class DocumentIndexer:
         texts = [chunk["text"] for chunk in chunks]
         embeddings = self.generate_embeddings(texts)
 
-        # Add to vector store
-        chunk_ids = self.vector_store.add_documents(chunks, embeddings)
+        with self._lock:
+            # Add to vector store
+            chunk_ids = self.vector_store.add_documents(chunks, embeddings)
 
-        # Update cache
-        self.document_cache[doc_id] = doc_hash
-        self._save_document_cache()
+            # Update cache
+            self.document_cache[doc_id] = doc_hash
+            self._save_document_cache()
 
         logger.info(f"Indexed document {doc_id} into {len(chunk_ids)} chunks")
         return chunk_ids
@@ -213,22 +219,24 @@ class DocumentIndexer:
         """
         # In a real implementation, we would need to track which chunks belong to which document
         # For simplicity, we'll just remove from the cache
-        if doc_id in self.document_cache:
-            del self.document_cache[doc_id]
-            self._save_document_cache()
-            logger.info(f"Removed document {doc_id} from cache")
+        with self._lock:
+            if doc_id in self.document_cache:
+                del self.document_cache[doc_id]
+                self._save_document_cache()
+                logger.info(f"Removed document {doc_id} from cache")
 
     def clear_index(self) -> None:
         """Clear the entire index."""
-        # Create a new vector store
-        store_type = self.vector_store.__class__.__name__
-        if "FAISS" in store_type:
-            self.vector_store = get_vector_store("faiss", self.vector_store.store_path)
-        elif "Chroma" in store_type:
-            self.vector_store = get_vector_store("chroma", self.vector_store.store_path)
-
-        # Clear cache
-        self.document_cache = {}
-        self._save_document_cache()
+        with self._lock:
+            # Create a new vector store
+            store_type = self.vector_store.__class__.__name__
+            if "FAISS" in store_type:
+                self.vector_store = get_vector_store("faiss", self.vector_store.store_path)
+            elif "Chroma" in store_type:
+                self.vector_store = get_vector_store("chroma", self.vector_store.store_path)
+
+            # Clear cache
+            self.document_cache = {}
+            self._save_document_cache()
 
         logger.info("Cleared document index")
@@ -43,7 +43,13 @@ class DocumentRetriever:
             embedding_model=embedding_model
         )
 
-    def search(self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search for documents relevant to a query.
 
@@ -51,12 +57,14 @@ class DocumentRetriever:
             query: Search query
             top_k: Number of results to return
             filters: Optional filters to apply to results
+            query_embedding: Precomputed embedding of the query, if available
 
         Returns:
             List of relevant documents with similarity scores
         """
         # Generate embedding for query
-        query_embedding = self.indexer.generate_embeddings([query])[0]
+        if query_embedding is None:
+            query_embedding = self.indexer.generate_embeddings([query])[0]
 
         # Search vector store
         results = self.vector_store.search(query_embedding, top_k=top_k)
@@ -91,7 +99,8 @@ class DocumentRetriever:
         query: str,
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Get relevant context for a query, formatted for use in RAG.
@@ -101,12 +110,13 @@ class DocumentRetriever:
             top_k: Number of results to return
             filters: Optional filters to apply to results
             max_tokens: Maximum number of tokens to include in context
+            query_embedding: Precomputed embedding of the query, if available
 
         Returns:
             Tuple of (formatted context string, list of source documents)
         """
         # Search for relevant documents
-        results = self.search(query, top_k=top_k, filters=filters)
+        results = self.search(query, top_k=top_k, filters=filters, query_embedding=query_embedding)
 
         # Format context
         context_parts = []
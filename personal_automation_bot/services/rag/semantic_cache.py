@@ -0,0 +1,154 @@
+"""
+Semantic cache for the RAG system.
+Maps query embeddings to previously computed values so that near-duplicate
+queries can skip retrieval and generation.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows allocated for keys on first insert; the matrix doubles up to max_entries
+_INITIAL_CAPACITY = 64
+
+class SemanticCache:
+    """LRU cache keyed on embedding similarity."""
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 1000, quantize: bool = False):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of entries kept before evicting the
+                least recently used one
+            quantize: Store keys as int8 with a per-key scale, a quarter of
+                the float32 memory; similarities become approximate
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.quantize = quantize
+
+        # Normalized keys as rows of one contiguous matrix; rows [0, _size) are in use
+        self._keys: Optional[np.ndarray] = None
+        # Per-row dequantization scales, only used when quantize is set
+        self._scales: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._size = 0
+        # Row indices ordered by recency, least recently used first
+        self._recency: "OrderedDict[int, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Return the embedding as an L2-normalized float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _quantize(vector: np.ndarray):
+        """Quantize a vector to int8 with a symmetric scale; returns (values, scale)."""
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+
+    def _best_row(self, query: np.ndarray) -> Optional[int]:
+        """Return the row most similar to a normalized query, or None if none reaches the threshold."""
+        if not self._size:
+            return None
+
+        if self.quantize:
+            query_q8, query_scale = self._quantize(query)
+            raw = self._keys[:self._size] @ query_q8.astype(np.int32)
+            similarities = raw * self._scales[:self._size] * query_scale
+        else:
+            similarities = self._keys[:self._size] @ query
+
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        logger.debug(f"Semantic cache match (similarity {similarities[best]:.3f})")
+        return best
+
+    def get(self, embedding: Sequence[float]) -> Optional[Any]:
+        """
+        Look up the value stored for the most similar embedding.
+
+        Args:
+            embedding: Query embedding
+
+        Returns:
+            Cached value, or None if no entry reaches the threshold
+        """
+        best = self._best_row(self._normalize(embedding))
+        if best is None:
+            return None
+
+        self._recency.move_to_end(best)
+        return self._values[best]
+
+    def put(self, embedding: Sequence[float], value: Any) -> None:
+        """
+        Store a value for an embedding.
+
+        Replaces the entry get() would return for the embedding, if any, so
+        a repeated query doesn't leave a stale row that keeps matching first.
+
+        Args:
+            embedding: Query embedding
+            value: Value to cache
+        """
+        if self.max_entries <= 0:
+            return
+
+        key = self._normalize(embedding)
+
+        row = self._best_row(key)
+        if row is not None:
+            self._values[row] = value
+            del self._recency[row]
+        elif self._size < self.max_entries:
+            row = self._size
+            self._reserve(row + 1, key.shape[0])
+            self._values.append(value)
+            self._size += 1
+        else:
+            # Reuse the least recently used row
+            row, _ = self._recency.popitem(last=False)
+            self._values[row] = value
+
+        if self.quantize:
+            self._keys[row], self._scales[row] = self._quantize(key)
+        else:
+            self._keys[row] = key
+        self._recency[row] = None
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        """Make sure the key matrix has room for at least the given number of rows."""
+        if self._keys is None:
+            capacity = max(min(self.max_entries, _INITIAL_CAPACITY), rows)
+        elif rows > self._keys.shape[0]:
+            capacity = max(min(self.max_entries, self._keys.shape[0] * 2), rows)
+        else:
+            return
+
+        keys = np.empty((capacity, dim), dtype=np.int8 if self.quantize else np.float32)
+        scales = np.empty(capacity, dtype=np.float32)
+        if self._keys is not None:
+            keys[:self._size] = self._keys[:self._size]
+            scales[:self._size] = self._scales[:self._size]
+        self._keys = keys
+        self._scales = scales
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._keys = None
+        self._scales = None
+        self._values = []
+        self._size = 0
+        self._recency.clear()
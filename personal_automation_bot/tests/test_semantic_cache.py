@@ -0,0 +1,145 @@
+"""
+Tests for the RAG semantic cache.
+"""
+import numpy as np
+import pytest
+
+from personal_automation_bot.services.rag.semantic_cache import SemanticCache, _INITIAL_CAPACITY
+
+
+def _unit(index: int, dim: int = 8) -> np.ndarray:
+    """Return the unit vector along one axis."""
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+def _at_similarity(similarity: float) -> np.ndarray:
+    """Return a unit vector whose cosine similarity with _unit(0) is the given value."""
+    return similarity * _unit(0) + np.sqrt(1 - similarity ** 2) * _unit(1)
+
+
+@pytest.fixture(params=[False, True], ids=["float32", "int8"])
+def quantize(request):
+    """Run a test against both key representations."""
+    return request.param
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_empty_cache_misses(self, quantize):
+        cache = SemanticCache(quantize=quantize)
+        assert cache.get(_unit(0)) is None
+        assert len(cache) == 0
+
+    def test_exact_match_hits(self, quantize):
+        cache = SemanticCache(quantize=quantize)
+        cache.put(_unit(0), "answer")
+        assert cache.get(_unit(0)) == "answer"
+
+    def test_hit_above_threshold(self, quantize):
+        cache = SemanticCache(threshold=0.9, quantize=quantize)
+        cache.put(_unit(0), "answer")
+        assert cache.get(_at_similarity(0.95)) == "answer"
+
+    def test_miss_below_threshold(self, quantize):
+        cache = SemanticCache(threshold=0.9, quantize=quantize)
+        cache.put(_unit(0), "answer")
+        assert cache.get(_at_similarity(0.85)) is None
+
+    def test_scale_does_not_matter(self, quantize):
+        cache = SemanticCache(quantize=quantize)
+        cache.put(3 * _unit(0), "answer")
+        assert cache.get(0.5 * _unit(0)) == "answer"
+
+    def test_returns_most_similar_entry(self, quantize):
+        cache = SemanticCache(threshold=0.5, quantize=quantize)
+        cache.put(_unit(0), "first")
+        cache.put(_unit(1), "second")
+        assert cache.get(0.8 * _unit(0) + 0.6 * _unit(1)) == "first"
+        assert cache.get(0.6 * _unit(0) + 0.8 * _unit(1)) == "second"
+
+    def test_put_replaces_matching_entry(self, quantize):
+        cache = SemanticCache(threshold=0.9, quantize=quantize)
+        cache.put(_unit(0), "old")
+        cache.put(_at_similarity(0.95), "new")
+
+        assert len(cache) == 1
+        assert cache.get(_unit(0)) == "new"
+
+    def test_evicts_least_recently_used(self, quantize):
+        cache = SemanticCache(max_entries=2, quantize=quantize)
+        cache.put(_unit(0), "a")
+        cache.put(_unit(1), "b")
+
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get(_unit(0)) == "a"
+        cache.put(_unit(2), "c")
+
+        assert len(cache) == 2
+        assert cache.get(_unit(0)) == "a"
+        assert cache.get(_unit(1)) is None
+        assert cache.get(_unit(2)) == "c"
+
+    def test_zero_max_entries_stores_nothing(self, quantize):
+        cache = SemanticCache(max_entries=0, quantize=quantize)
+        cache.put(_unit(0), "answer")
+        assert len(cache) == 0
+        assert cache.get(_unit(0)) is None
+
+    def test_grows_past_initial_capacity(self, quantize):
+        count = _INITIAL_CAPACITY * 2 + 1
+        dim = count + 1
+        cache = SemanticCache(max_entries=count + 10, quantize=quantize)
+
+        for i in range(count):
+            cache.put(_unit(i, dim), i)
+
+        assert len(cache) == count
+        assert cache._keys.shape[0] >= count
+        # Entries stored before each resize are still found
+        for i in (0, _INITIAL_CAPACITY - 1, _INITIAL_CAPACITY, count - 1):
+            assert cache.get(_unit(i, dim)) == i
+
+    def test_capacity_never_exceeds_max_entries(self, quantize):
+        max_entries = _INITIAL_CAPACITY + 1
+        dim = max_entries + 5
+        cache = SemanticCache(max_entries=max_entries, quantize=quantize)
+
+        for i in range(max_entries + 5):
+            cache.put(_unit(i, dim), i)
+
+        assert len(cache) == max_entries
+        assert cache._keys.shape[0] == max_entries
+
+    def test_clear(self, quantize):
+        cache = SemanticCache(quantize=quantize)
+        cache.put(_unit(0), "a")
+        cache.put(_unit(1), "b")
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get(_unit(0)) is None
+
+        # The cache is usable again after clearing
+        cache.put(_unit(1), "c")
+        assert cache.get(_unit(1)) == "c"
+
+    def test_quantized_matches_float32(self):
+        rng = np.random.default_rng(0)
+        keys = rng.normal(size=(50, 32)).astype(np.float32)
+        queries = np.concatenate([
+            keys + rng.normal(scale=0.05, size=keys.shape).astype(np.float32),
+            rng.normal(size=(50, 32)).astype(np.float32),
+        ])
+
+        exact = SemanticCache(threshold=0.8, max_entries=100)
+        quantized = SemanticCache(threshold=0.8, max_entries=100, quantize=True)
+        for i, key in enumerate(keys):
+            exact.put(key, i)
+            quantized.put(key, i)
+
+        for query in queries:
+            assert quantized.get(query) == exact.get(query)
@@ -0,0 +1,57 @@
+"""
+Transport helpers shared by the Google API clients.
+"""
+import threading
+
+import httplib2
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ThreadLocalHttp(threading.local):
+    """
+    httplib2.Http that keeps one instance per thread.
+
+    httplib2.Http is not thread-safe, so clients used from worker threads
+    can't share one; this still keeps each thread's connections to
+    googleapis.com open across users, clients and requests.
+    """
+
+    def __init__(self, timeout: int):
+        """
+        Initialize the transport for the current thread.
+
+        Args:
+            timeout (int): Socket timeout in seconds
+        """
+        self.http = httplib2.Http(timeout=timeout)
+
+    def request(self, *args, **kwargs):
+        return self.http.request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that encodes request bodies and parses responses with orjson."""
+
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return orjson.dumps(body_value).decode('utf-8')
+
+    def deserialize(self, content):
+        body = orjson.loads(content)
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
+# Request/response model for built clients; None keeps googleapiclient's default
+API_MODEL = OrjsonModel() if ORJSON_AVAILABLE else None
@@ -7,6 +7,8 @@ import sys
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
 
+from google_auth_httplib2 import AuthorizedHttp
+
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -31,7 +33,11 @@ def test_google_drive_client_initialization():
             # Verify initialization
             assert client.credentials == mock_credentials
             assert client.service == mock_service
-            mock_build.assert_called_once_with('drive', 'v3', credentials=mock_credentials)
+            mock_build.assert_called_once()
+            assert mock_build.call_args.args == ('drive', 'v3')
+            http = mock_build.call_args.kwargs['http']
+            assert isinstance(http, AuthorizedHttp)
+            assert http.credentials is mock_credentials
 
             print("✅ GoogleDriveClient initialization works")
             return True
@@ -196,7 +196,11 @@ class TestRAGService(unittest.TestCase):
             citations=['[1] source1', '[2] source2']
         )
 
-        confidence = self.rag_service._calculate_confidence_score(high_relevance_docs, mock_response)
+        confidence = self.rag_service._calculate_confidence_score(
+            sum(doc['score'] for doc in high_relevance_docs) / len(high_relevance_docs),
+            len(high_relevance_docs),
+            mock_response
+        )
         self.assertGreater(confidence, 0.8)  # Should be high
 
         # Test with low relevance documents
@@ -212,7 +216,11 @@ class TestRAGService(unittest.TestCase):
             citations=[]
         )
 
-        confidence = self.rag_service._calculate_confidence_score(low_relevance_docs, mock_response_no_citations)
+        confidence = self.rag_service._calculate_confidence_score(
+            sum(doc['score'] for doc in low_relevance_docs) / len(low_relevance_docs),
+            len(low_relevance_docs),
+            mock_response_no_citations
+        )
         self.assertLess(confidence, 0.5)  # Should be low
 
 